@@ -0,0 +1,91 @@
+# benchmarks/bench_bancache.py
+"""
+Benchmark do cache de bans globais: tempo de carga, memória e lookups.
+
+Compara o cache antigo (``set`` de ints montado a partir das strings do banco)
+com o BanSet carregado de um snapshot via mmap, com e sem Bloom filter.
+Cada variante roda num subprocesso para o RSS de uma não contaminar a outra.
+
+Uso:  python benchmarks/bench_bancache.py [n_ids ...]
+"""
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from utils.bancache import BanSet, load_snapshot, write_snapshot  # noqa: E402
+
+SIZES = [10_000, 100_000, 1_000_000]
+N_LOOKUPS = 200_000
+VARIANTS = ("set", "snapshot", "snapshot+bloom")
+
+
+def rss_kb() -> int:
+    """RSS atual (Linux); 0 onde /proc não existe."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError):
+        return 0
+
+
+def make_ids(n: int) -> list[int]:
+    # snowflakes realistas: 2015..hoje, 64 bits
+    rng = random.Random(n)
+    return [rng.randrange(80_000_000_000_000_000, 1_300_000_000_000_000_000) for _ in range(n)]
+
+
+def child(variant: str, n: int, path: str):
+    ids = make_ids(n)
+    rows = [str(i) for i in ids]                 # o que o banco devolve (String)
+    # metade acertos, metade IDs quaisquer (o caso comum em on_member_join)
+    probes = random.Random(1).choices(ids, k=N_LOOKUPS // 2) + make_ids(N_LOOKUPS // 2 + 1)
+    before = rss_kb()
+
+    start = time.perf_counter()
+    if variant == "set":
+        cache = {int(r) for r in rows}
+    else:
+        snap = load_snapshot(path)
+        cache = snap.ban_set
+    load = time.perf_counter() - start
+
+    start = time.perf_counter()
+    hits = sum(1 for uid in probes if uid in cache)
+    lookup = (time.perf_counter() - start) / len(probes) * 1e9
+    grown = rss_kb() - before                    # após os lookups (páginas do mmap tocadas)
+    assert hits >= N_LOOKUPS // 2
+    print(f"{load * 1000:.1f} {grown} {lookup:.0f}")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2], int(sys.argv[3]), sys.argv[4])
+        return
+
+    sizes = [int(a) for a in sys.argv[1:]] or SIZES
+    print(f"{'IDs':>9} | {'variante':<15} | {'carga ms':>9} | {'RSS +KiB':>9} | {'lookup ns':>9} | {'arquivo KiB':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            ids = BanSet.from_ids(make_ids(n)).compact()
+            for variant in VARIANTS:
+                path = os.path.join(tmp, f"{variant}.snap")
+                if variant != "set":
+                    write_snapshot(path, ids, n, n, bloom=variant.endswith("bloom"))
+                out = subprocess.run(
+                    [sys.executable, __file__, "--child", variant, str(n), path],
+                    check=True, capture_output=True, text=True,
+                ).stdout.split()
+                size = os.path.getsize(path) // 1024 if variant != "set" else 0
+                print(f"{n:>9,} | {variant:<15} | {float(out[0]):>9.1f} | {int(out[1]):>9,} | "
+                      f"{int(out[2]):>9} | {size:>11,}")
+
+
+if __name__ == "__main__":
+    main()
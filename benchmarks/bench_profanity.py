@@ -0,0 +1,99 @@
+# benchmarks/bench_profanity.py
+"""
+Microbenchmark do filtro de palavrões: mensagens/segundo x tamanho da lista.
+
+Compara o caminho antigo (uma regex ``\\b…\\b`` por palavra, testadas em
+sequência) com o WordMatcher (uma regex-trie, uma varredura), e o WordMatcher
+simples com o pipeline anti-evasão (fold() + modo fuzzy) usado pelo cog.
+
+Uso:  python benchmarks/bench_profanity.py
+"""
+import random
+import re
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.matcher import WordMatcher  # noqa: E402
+from utils.text import fold  # noqa: E402
+
+SIZES = [27, 100, 300, 1000]
+N_MESSAGES = 2000
+
+FILLER = (
+    "alguém vai na horda hoje a noite? preciso de ajuda pra montar a forja, "
+    "quem tiver ferro sobrando me chama no privado que eu troco por munição"
+).split()
+
+
+def make_words(n: int, rng: random.Random) -> list[str]:
+    words = set()
+    while len(words) < n:
+        words.add("".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))))
+    return sorted(words)
+
+
+def make_messages(words: list[str], rng: random.Random) -> list[str]:
+    msgs = []
+    for i in range(N_MESSAGES):
+        parts = rng.choices(FILLER, k=rng.randint(5, 25))
+        if i % 10 == 0:                              # ~10% das mensagens com palavrão
+            parts.insert(rng.randrange(len(parts)), rng.choice(words))
+        msgs.append(" ".join(parts))
+    return msgs
+
+
+def bench(fn, messages: list[str]) -> float:
+    start = time.perf_counter()
+    for m in messages:
+        fn(m)
+    return len(messages) / (time.perf_counter() - start)
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'palavras':>9} | {'loop msgs/s':>12} | {'trie msgs/s':>12} | {'ganho':>6}")
+    for size in SIZES:
+        words = make_words(size, rng)
+        messages = make_messages(words, rng)
+
+        patterns = [re.compile(rf"\b{re.escape(w)}\b", re.IGNORECASE) for w in words]
+
+        def legacy(text):
+            return [m for p in patterns if (m := p.search(text))]
+
+        matcher = WordMatcher(words)
+
+        def trie(text):
+            return list(matcher.finditer(text))
+
+        # sanidade: os dois caminhos encontram as mesmas palavras
+        for m in messages[:200]:
+            assert sorted(x.group(0) for x in legacy(m)) == sorted(x.text for x in trie(m))
+
+        old, new = bench(legacy, messages), bench(trie, messages)
+        print(f"{size:>9} | {old:>12,.0f} | {new:>12,.0f} | {new / old:>5.1f}x")
+
+    print()
+    print(f"{'palavras':>9} | {'trie msgs/s':>12} | {'fold+fuzzy':>12} | {'custo':>6}")
+    for size in SIZES:
+        words = make_words(size, rng)
+        messages = make_messages(words, rng)
+        plain = WordMatcher(words)
+        fuzzy = WordMatcher((fold(w) for w in words), fuzzy=True)
+
+        def current(text):
+            return list(plain.finditer(text))
+
+        def evasion(text):
+            return list(fuzzy.finditer(fold(text)))
+
+        old, new = bench(current, messages), bench(evasion, messages)
+        print(f"{size:>9} | {old:>12,.0f} | {new:>12,.0f} | {old / new:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
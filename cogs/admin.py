@@ -6,6 +6,8 @@ from discord.ext import commands, tasks
 from discord import app_commands
 from datetime import datetime, timedelta, timezone
 
+from db import db_metrics
+
 logger = logging.getLogger(__name__)
 
 class EmbedFactory:
@@ -190,6 +192,36 @@ class AdminCog(commands.Cog):
         embed = EmbedFactory.success(text)
         await interaction.response.send_message(embed=embed)
 
+    @app_commands.command(name="router_stats", description="📈 Tempo gasto por handler de mensagens.")
+    async def router_stats(self, interaction):
+        if not await self.check_permissions(interaction, "administrator"):
+            return
+        router = getattr(self.bot, "router", None)
+        stats = router.stats() if router else []
+        desc = "\n".join(
+            f"**{s['name']}** • {s['calls']} msgs • média {s['avg_ms']:.1f} ms • "
+            f"máx {s['max_time'] * 1000:.0f} ms • erros {s['errors']}"
+            for s in stats
+        ) or "Nenhum handler registrado."
+        embed = EmbedFactory.info(desc, title="📈 Roteador de Mensagens",
+                                  footer=f"{router.dispatched if router else 0} mensagens roteadas")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="db_stats", description="🗄️ Latência do banco e espera por conexão.")
+    async def db_stats(self, interaction):
+        if not await self.check_permissions(interaction, "administrator"):
+            return
+        m = db_metrics.snapshot()
+        desc = (
+            f"**Queries:** {m['queries']} • média {m['query_avg_ms']:.1f} ms • "
+            f"máx {m['query_max_ms']:.0f} ms • lentas {m['slow_queries']}\n"
+            f"**Espera por conexão:** {m['pool_waits']} checkouts • média {m['pool_wait_avg_ms']:.1f} ms • "
+            f"máx {m['pool_wait_max_ms']:.0f} ms"
+        )
+        embed = EmbedFactory.info(desc, title="🗄️ Banco de Dados",
+                                  footer=f"Lenta = acima de {db_metrics.SLOW_QUERY * 1000:.0f} ms")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
     # … (outros comandos como slowmode, lock, unlock, setnick, role, serverinfo, userinfo) …
 
 async def setup(bot: commands.Bot):
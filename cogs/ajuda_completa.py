@@ -1,450 +1,110 @@
+import json
+import logging
+import os
+import time
+from glob import glob
+from typing import Dict, Optional
+
 import discord
 from discord.ext import commands
-import asyncio
-
-# ===================================================
-# ================ 1) COMANDOS ======================
-# ===================================================
 
+from utils.cache import LRUCache
+from utils.matcher import TopicMatcher
+from utils.text import ACCENT_TABLE
 
+logger = logging.getLogger(__name__)
 
 # ===================================================
-# ================ 2) ARMADURAS =====================
+# ================  CONFIG  =========================
 # ===================================================
-
-KEYWORDS_ARMADURAS = [
-    "armadura",
-    "qual bonus da",
-    "qual armadura",
-    "qual set e"
-]
-
-def criar_embed_armaduras() -> discord.Embed:
-    """Embed completo para Armaduras, dividido em duas partes."""
-    embed = discord.Embed(
-        title="Guia de Armaduras",
-        description="Confira cada tipo de armadura, seus bônus e conjuntos.",
-        color=discord.Color.gold()
-    )
-
-    texto_armaduras_parte1 = (
-        "🪖 **Armadura Primitiva**\n"
-        "Não possui bônus de conjunto.\n"
-        "Geralmente é a primeira que você encontra ou fabrica.\n"
-        "Dá uma defesa inicial, mas não espere nada além do básico.\n\n"
-        "☀️ **Armaduras Leves**\n"
-        "Ideais para quem quer mobilidade e foco em habilidades específicas sem perder velocidade.\n\n"
-        "🪓 **1) Conjunto Lumberjack**\n"
-        "**Bônus Individuais**:\n"
-        "• Aumenta a quantidade de madeira coletada.\n"
-        "• Concede slots extras de inventário.\n"
-        "• Melhora o dano com machados.\n"
-        "• Reduz o consumo de estamina ao correr.\n"
-        "**Bônus de Conjunto**: +100% de madeira ao colher com machado e redução de 5% a 30% no custo de estamina ao golpear.\n\n"
-        "⛪ **2) Conjunto Preacher**\n"
-        "**Bônus Individuais**:\n"
-        "• Preços de compra mais baratos.\n"
-        "• Menos dano sofrido de zumbis.\n"
-        "• Maior dano causado a zumbis.\n"
-        "• Ferimentos curam mais rápido.\n"
-        "**Bônus de Conjunto**: Reduz a chance de ferimentos críticos e pode até zerar a chance de infecção em Tier máximo!\n\n"
-        "🕵️ **3) Conjunto Rogue**\n"
-        "**Bônus Individuais**:\n"
-        "• Saque (loot) mais rápido e com qualidade melhor.\n"
-        "• Furtividade aprimorada (dificulta ser detectado).\n"
-        "• Lockpicking mais eficaz (menos tempo e menos quebras de lockpick).\n"
-        "• Queda de alturas maiores sem receber dano.\n"
-        "**Bônus de Conjunto**: Até +30% de dinheiro e dukes encontrados em loot.\n\n"
-        "🏃 **4) Conjunto Athletic**\n"
-        "**Bônus Individuais**:\n"
-        "• Itens de alimentação (comida, bebida, drogas) ficam mais baratos.\n"
-        "• Aumento de vida máxima (HP).\n"
-        "• Aumento de estamina máxima.\n"
-        "• Velocidade de corrida melhorada.\n"
-        "**Bônus de Conjunto**: Regenerar saúde e estamina consome até 60% menos comida e água.\n\n"
-        "🔫 **5) Conjunto Enforcer**\n"
-        "**Bônus Individuais**:\n"
-        "• Melhores preços de compra e venda.\n"
-        "• Resistência a ferimentos críticos.\n"
-        "• Economia de combustível em veículos.\n"
-        "• Velocidade de corrida melhorada.\n"
-        "**Bônus de Conjunto**: Munição .44 causa até +50% de dano e as armas (Magnum/Desert Vulture) recarregam até +50% mais rápido.\n"
-    )
-
-    texto_armaduras_parte2 = (
-        "⚔️ **Armaduras Médias**\n"
-        "Equilibram defesa e mobilidade, boas para quem quer versatilidade.\n\n"
-        "🌱 **1) Conjunto Farmer**\n"
-        "**Bônus Individuais**:\n"
-        "• Chance maior de encontrar sementes em loot.\n"
-        "• Colheita de plantação com chance de itens extras.\n"
-        "• Rifles causam mais dano.\n"
-        "• Chance de ganhar sementes extras ao colher.\n"
-        "**Bônus de Conjunto**: Comida e bebida curam até +40% de vida adicional.\n\n"
-        "🏍️ **2) Conjunto Biker**\n"
-        "**Bônus Individuais**:\n"
-        "• Resistência a atordoamentos.\n"
-        "• Mais pontos de vida máxima.\n"
-        "• Dano corpo a corpo (melee) aumentado.\n"
-        "• Menos estamina gasta ao bater com arma branca.\n"
-        "**Bônus de Conjunto**: Garante pontos extras na armadura e reduz gasto de combustível em motos e minibikes.\n\n"
-        "🔧 **3) Conjunto Scavenger**\n"
-        "**Bônus Individuais**:\n"
-        "• Mais XP ao desmontar (salvaging).\n"
-        "• Mais slots de inventário.\n"
-        "• Chance de ganhar recursos extras ao desmontar.\n"
-        "• Menos estamina ao usar ferramentas de sucata.\n"
-        "**Bônus de Conjunto**: Aumenta a qualidade do loot encontrado (até +20%).\n\n"
-        "🏹 **4) Conjunto Ranger**\n"
-        "**Bônus Individuais**:\n"
-        "• Melhores preços em negociações.\n"
-        "• Mais pontos de vida máxima.\n"
-        "• Maior dano com rifles de ação por alavanca e revolveres.\n"
-        "• Mais estamina máxima.\n"
-        "**Bônus de Conjunto**: Recarregue rifles de ação por alavanca e revolveres até 50% mais rápido.\n\n"
-        "💣 **5) Conjunto Commando**\n"
-        "**Bônus Individuais**:\n"
-        "• Resistência a atordoamentos.\n"
-        "• Cura de ferimentos mais rápida.\n"
-        "• Armas de fogo causam dano extra.\n"
-        "• Corrida (sprint) mais veloz.\n"
-        "**Bônus de Conjunto**: Itens de cura funcionam até 50% mais rápido.\n\n"
-        "🗡️ **6) Conjunto Assassin**\n"
-        "**Bônus Individuais**:\n"
-        "• Dano de ataque furtivo (sneak) muito maior.\n"
-        "• Melhor furtividade e movimento ao se agachar.\n"
-        "• Mais velocidade de ataque com armas de agilidade (facas, arcos, etc.).\n"
-        "• Corrida silenciosa ao agachar (sem barulho adicional).\n"
-        "**Bônus de Conjunto**: Inimigos desistem de te procurar até 100% mais rápido depois que você some da visão deles.\n\n"
-        "🛡️ **Armaduras Pesadas**\n"
-        "Maior proteção, mas também mais peso e ruído. Boa para quem gosta de combate direto ou precisa de defesa sólida.\n\n"
-        "⛏️ **1) Conjunto Miner**\n"
-        "**Bônus Individuais**:\n"
-        "• Mais recursos ao minerar.\n"
-        "• Menos estamina para usar ferramentas de mineração.\n"
-        "• Quebra de blocos (minério) mais rápida.\n"
-        "• Queda de alturas maiores sem dano.\n"
-        "**Bônus de Conjunto**: Ferramentas de mineração desgastam até 35% menos.\n\n"
-        "🏜️ **2) Conjunto Nomad**\n"
-        "**Bônus Individuais**:\n"
-        "• Regenerar saúde/estamina consome menos comida e água.\n"
-        "• Mais slots de inventário.\n"
-        "• Dano extra contra zumbis irradiados.\n"
-        "• Corrida (sprint) mais rápida.\n"
-        "**Bônus de Conjunto**: Reduz ainda mais (até 30%) o custo de comida/água para regenerar.\n\n"
-        "🧠 **3) Conjunto Nerd**\n"
-        "**Bônus Individuais**:\n"
-        "• Ganha mais experiência (XP) em tudo.\n"
-        "• Chance de subir nível extra ao usar Revistas de Habilidade.\n"
-        "• Turrets e cacetes elétricos (batons) causam mais dano.\n"
-        "• Maior altura de queda segura.\n"
-        "**Bônus de Conjunto**: Todas as ferramentas e armas gastam até 35% menos durabilidade.\n\n"
-        "💀 **4) Conjunto Raider**\n"
-        "**Bônus Individuais**:\n"
-        "• Resistência máxima a atordoamentos.\n"
-        "• Ferimentos críticos se curam mais rápido.\n"
-        "• Dano corpo a corpo muito mais alto.\n"
-        "• Maior altura de queda segura.\n"
-        "**Bônus de Conjunto**: Até 45% de resistência a ferimentos críticos.\n"
-    )
-
-    embed.add_field(name="Armaduras - Parte 1", value=texto_armaduras_parte1, inline=False)
-    embed.add_field(name="Armaduras - Parte 2", value=texto_armaduras_parte2, inline=False)
-
-    embed.set_footer(text="Armaduras de 7 Days to Die • Exemplo de Servidor")
-    return embed
+# um arquivo por tópico: data/ajuda/<tópico>.json com "pergunta", "palavras" e
+# "embed" (formato do Discord; "description"/"value" aceitam lista de linhas)
+AJUDA_DIR = os.getenv("AJUDA_DIR", "data/ajuda")
+RELOAD_INTERVAL = 5        # s: de quanto em quanto tempo olhar o mtime dos arquivos
+PERGUNTA_TIMEOUT = 1800    # s: pergunta sem resposta é apagada (via bot.deleter)
+EMBED_DURACAO = 60         # s: embed enviado pelo "Sim" é apagado depois disso
+COOLDOWN_CANAL = 120       # s: mesmo tópico não é oferecido de novo no mesmo canal
+COOLDOWN_USUARIO = 600     # s: nem para o mesmo usuário
+COOLDOWN_MAX = 5000        # entradas guardadas por tipo de cooldown (LRU)
 
 
 # ===================================================
-# ================ 3) VEÍCULOS ======================
+# ================  BASE DE CONHECIMENTO  ===========
 # ===================================================
-KEYWORDS_VEICULOS = [
-    "como fabrica carro",
-    "aonde acho veiculo",
-    "como fabrico minha moto",
-    "veiculo"
-]
-
-def criar_embed_veiculos() -> discord.Embed:
-    """Embed completo de Veículos, usando texto integral fornecido."""
-    embed = discord.Embed(
-        title="🚗 Guia de Veículos",
-        description=(
-            "Veículos são essenciais na nossa jornada pela sobrevivência, eles nos levam a novos lugares, "
-            "novas cidades, novos mercadores, novos horizontes a serem explorados..."
-        ),
-        color=discord.Color.blue()
-    )
-    embed.set_image(url="https://imgur.com/zPqLmH8.jpg")  # Imagem ilustrativa
-
-    texto_introducao = (
-        "**Introdução**\n"
-        "Quem disse que sobreviver seria fácil? Precisamos nos esforçar para nos mantermos vivos, explorar, fazer nossas "
-        "próprias armas, itens e o possível, mas nem tudo pode ser feito apenas com nossas próprias mãos... "
-        "precisamos de estações de trabalho e **veículos** que ajudem nessa jornada.\n"
-        "Podemos trazer com segurança nossos recursos para a base. "
-        "Nesse guia, estarão as diferenças entre cada veículo, como construí-los e seus usos mais comuns!"
-    )
-    embed.add_field(name="Introdução", value=texto_introducao, inline=False)
-
-    texto_quais = (
-        "**Quais nossos veículos?**\n"
-        "Temos 5 veículos diferentes (Bicicleta, Minimoto, Moto, Jipe 4x4 e Girocóptero). "
-        "A construção e obtenção de materiais podem parecer difíceis no início, mas com as ferramentas certas "
-        "e sabendo onde procurar, você poderá se aventurar facilmente."
-    )
-    embed.add_field(name="Veículos Disponíveis", value=texto_quais, inline=False)
-
-    texto_bicicleta = (
-        "**Bicicleta**\n\n"
-        "A bicicleta é o nosso primeiro meio de transporte, podemos consegui-la já na primeira semana "
-        "(recompensa de missões Tier 1 do mercador) ou fabricar com chassi e guidão. "
-        "Usa estamina para pedalar (Shift), mas ajuda muito a explorar no começo."
-    )
-    embed.add_field(name="🚲 Bicicleta", value=texto_bicicleta, inline=False)
+def _juntar_linhas(valor):
+    return "\n".join(valor) if isinstance(valor, list) else valor
 
-    texto_minimoto = (
-        "**Minimoto**\n\n"
-        "Após alguns dias conseguimos fazer a minimoto, feita com chassi, guidão, rodas, motor e bateria. "
-        "Precisa de barras de ferro, peças mecânicas/elétricas, motores e baterias (obtidas ao desmontar veículos). "
-        "É ideal até a segunda semana (dia 8-14)."
-    )
-    embed.add_field(name="🏍️ Minimoto", value=texto_minimoto, inline=False)
 
-    texto_moto = (
-        "**Moto**\n\n"
-        "Favorita de muitos, ágil, bom armazenamento, não consome tanto combustível. "
-        "Feita com chassi, guidão (ambos de aço), rodas, motor e bateria. "
-        "Ótima para exploração urbana."
-    )
-    embed.add_field(name="🏍️ Moto", value=texto_moto, inline=False)
-
-    texto_jipe = (
-        "**Jipe 4x4**\n\n"
-        "Melhor para transporte de cargas, com 81 slots de armazenamento e até 4 assentos. "
-        "Exige barras de aço, 4 rodas, acessórios veiculares, motor e bateria. "
-        "Consome muito combustível, mas leva toneladas de itens."
-    )
-    embed.add_field(name="🚙 Jipe 4x4", value=texto_jipe, inline=False)
-
-    texto_giro = (
-        "**Girocóptero**\n\n"
-        "O mais rápido dos veículos, pois voa (15 m/s). "
-        "Porém, é frágil e exige prática para pilotar. "
-        "Ótimo para viagens longas, como buscar xisto no deserto ou visitar vários mercadores."
-    )
-    embed.add_field(name="✈️ Girocóptero", value=texto_giro, inline=False)
-
-    texto_tabela = (
-        "**Informações Detalhadas:**\n\n"
-        "Bicicleta: Durabilidade 1500, Veloc. 8 m/s, Armaz. 9, Comb. 0, Assentos 1\n"
-        "Minimoto: Durabilidade 2000, Veloc. 9 m/s, Armaz. 27, Comb. 1000, Assentos 1\n"
-        "Moto: Durabilidade 4000, Veloc. 14 m/s, Armaz. 36, Comb. 3000, Assentos 1\n"
-        "4x4: Durabilidade 8000, Veloc. 14 m/s, Armaz. 81, Comb. 10000, Assentos 4\n"
-        "Giro: Durabilidade 3500, Veloc. 15 m/s, Armaz. 45, Comb. 2000, Assentos 2\n\n"
-        "Comparando, o 4x4 se destaca em durabilidade, armazenamento e assentos, mas consome mais combustível. "
-        "A moto é excelente no mid-game, equilibrando consumo e agilidade. "
-        "O girocóptero é muito rápido, mas requer cuidado para decolar e pousar."
-    )
-    embed.add_field(name="Tabela Resumida", value=texto_tabela, inline=False)
-
-    texto_mods = (
-        "**Modificações**\n\n"
-        "Podem reduzir consumo de combustível, aumentar velocidade, adicionar blindagem ou assentos extras. "
-        "Cada veículo tem um número definido de slots para modificadores (bicicleta 2, minimoto 3, moto 4, 4x4 5, giro 4)."
-    )
-    embed.add_field(name="Modificações", value=texto_mods, inline=False)
-
-    texto_sendo_mecanico = (
-        "**Sendo um bom mecânico**\n\n"
-        "Habilidades e revistas permitem fabricar chassi, guidões, combustível em pilhas (economizam 60% de xisto), etc. "
-        "Baterias de nível baixo podem ser usadas nos veículos; as de nível alto, em instalações elétricas. "
-        "Kits de reparo consertam qualquer veículo/ferramenta/arma."
-    )
-    embed.add_field(name="Habilidades e Manutenção", value=texto_sendo_mecanico, inline=False)
-
-    texto_trajes = (
-        "**Trajes para condução**\n\n"
-        "• Traje de motoqueiro: usando o conjunto completo, reduz consumo de combustível em minimoto/moto. "
-        "• Traje de executor: basta as luvas para reduzir consumo em todos os veículos. "
-        "Varia de -2% até -20%, conforme o nível do traje."
-    )
-    embed.add_field(name="Trajes de Motoqueiro/Executor", value=texto_trajes, inline=False)
-
-    texto_mercador = (
-        "**Mercador 'Bob'**\n\n"
-        "Geralmente o terceiro mercador desbloqueado. "
-        "Especializado em itens mecânicos e peças de veículos. "
-        "Pode vender peças, acessórios e até veículos completos."
-    )
-    embed.add_field(name="Mercador Bob", value=texto_mercador, inline=False)
-
-    embed.set_footer(text="Veículos em 7 Days to Die • Exemplo de Servidor")
-    return embed
-
-
-# ===================================================
-# ========== 4) ESTAÇÕES DE TRABALHO =================
-# ===================================================
-KEYWORDS_ESTACOES = [
-    "estação de trabalhado",
-    "estacao de trabalho",
-    "forja"
-]
-
-def criar_embed_estacoes() -> discord.Embed:
-    """Embed COMPLETO de Estações de Trabalho e Forja."""
-    embed = discord.Embed(
-        title="⚙️ Estações de Trabalho e Forja",
-        description=(
-            "Quem disse que sobreviver seria fácil? Precisamos de fogueiras, forjas, bancadas, etc. "
-            "para produzir nossos itens, comida, munições e muito mais!"
-        ),
-        color=discord.Color.orange()
-    )
-
-    texto_intro = (
-        "**Introdução**\n"
-        "Quem disse que sobreviver seria fácil? Precisamos nos esforçar para nos manter vivos, explorar, "
-        "fazer nossas próprias armas e itens. Nem tudo pode ser feito somente com as mãos...\n"
-        "Precisamos de estações de trabalho para cozinhar alimentos, produzir armas, pólvora, ferro, concreto, "
-        "e até mesmo obter água.\n\n"
-        "Se estava buscando alguém para te ajudar... vamos começar!"
-    )
-    embed.add_field(name="Introdução", value=texto_intro, inline=False)
-
-    texto_fogueira = (
-        "**Fogueira**\n"
-        "Iniciando pela estação mais básica, montada apenas com algumas pedras. "
-        "Usada principalmente para alimentação, é preciso ter ao menos uma.\n\n"
-        "Nela se faz comidas, bebidas e alguns itens de química (como cola e antibióticos).\n"
-        "• Receitas simples não precisam de utensílios.\n"
-        "• Receitas avançadas pedem panela ou grelha (encontre em cozinhas).\n"
-        "• Gera calor (atrai zumbis) e pode te queimar se passar por cima!\n"
-    )
-    embed.add_field(name="Fogueira", value=texto_fogueira, inline=False)
-
-    texto_coletor = (
-        "**Coletor de orvalho**\n"
-        "Responsável por coletar água automaticamente (até 3 garrafas). "
-        "Certifique-se de esvaziá-lo para ele continuar coletando.\n\n"
-        "• A água coletada vem turva; ferva antes de usar.\n"
-        "• Pode ser melhorado com modificadores (coletor, lona e filtro). "
-        "Ex.: aumentar velocidade, capacidade e purificar a água.\n"
-        "• Necessita fita adesiva, canos e polímero de sucata para construir."
-    )
-    embed.add_field(name="Coletor de orvalho", value=texto_coletor, inline=False)
-
-    texto_forja = (
-        "**Forja**\n"
-        "Essencial para construirmos itens intermediários e avançados (ferro, aço, cimento, munição...).\n\n"
-        "• Precisamos \"derreter\" minérios antes de produzir barras ou pontas.\n"
-        "• Recomenda-se ter 3 forjas dedicadas (ferro, munição e cimento).\n"
-        "• Usa fole, bigorna e cadinho como modificadores.\n"
-        "• O cadinho libera produção de aço e vidro blindado."
-    )
-    embed.add_field(name="Forja", value=texto_forja, inline=False)
-
-    texto_bancada = (
-        "**Bancada**\n"
-        "Usada para montagem de armas, armaduras, ferramentas, veículos, modificações, etc.\n\n"
-        "• Feita com ferro fundido, peças mecânicas, fita adesiva, pregos e madeira.\n"
-        "• Ter ao menos duas ajuda a produzir itens em paralelo (economiza tempo)."
-    )
-    embed.add_field(name="Bancada", value=texto_bancada, inline=False)
-
-    texto_betoneira = (
-        "**Betoneira**\n"
-        "Responsável pela produção de concreto.\n\n"
-        "• Feita principalmente com peças mecânicas, barras de ferro, motor e molas.\n"
-        "• Duas betoneiras ajudam, pois concreto leva tempo.\n"
-        "• Pode transformar pedras em areia se estiver longe do deserto."
-    )
-    embed.add_field(name="Betoneira", value=texto_betoneira, inline=False)
-
-    texto_quimica = (
-        "**Estação de química**\n"
-        "Produz principalmente combustível, pólvora e medicamentos.\n\n"
-        "• Necessita proveta (Becker), barras de ferro, panelas, canos e garrafas de ácido.\n"
-        "• Receitas químicas ficam mais baratas que na fogueira.\n"
-        "• Ideal ter 1 ou 2 para produções em larga escala."
-    )
-    embed.add_field(name="Estação de química", value=texto_quimica, inline=False)
-
-    texto_revistas = (
-        "**Revistas e desbloqueio**\n"
-        "\"Forja e Cia\" aumenta nível de fabricação de estações.\n\n"
-        "• 05/75: Podemos produzir ferro na forja.\n"
-        "• 10/75: Liberamos bancada, fole, bigorna e gázuas.\n"
-        "• 30/75: Produzimos concreto (betoneira).\n"
-        "• 50/75: Liberamos estação de química.\n"
-        "• 75/75: Liberamos cadinho (produzir aço)."
-    )
-    embed.add_field(name="Revistas e desbloqueio", value=texto_revistas, inline=False)
-
-    texto_otimizando = (
-        "**Otimizando nossa produção**\n\n"
-        "Precisamos de habilidades para cozinhar mais rápido, produzir ferro/aço e munição com menos recursos, etc.\n\n"
-        "• **Mestre Cuca (Força)**: +velocidade ao cozinhar e -ingredientes necessários.\n"
-        "• **Engenharia Avançada (Intelecto)**: +velocidade em forjas/bancadas, economia de materiais, "
-        "e XP ao matar zumbis com armadilhas elétricas."
-    )
-    embed.add_field(name="Otimizando a Produção", value=texto_otimizando, inline=False)
-
-    embed.set_footer(text="Estações de Trabalho • 7 Days to Die")
-    return embed
+def carregar_topico(caminho: str) -> dict:
+    """Lê um arquivo de tópico e já monta o embed (uma vez por carga, não por mensagem)."""
+    with open(caminho, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    embed = dict(data["embed"])
+    if "description" in embed:
+        embed["description"] = _juntar_linhas(embed["description"])
+    embed["fields"] = [{**campo, "value": _juntar_linhas(campo["value"])} for campo in embed.get("fields", [])]
+    return {
+        "pergunta": data["pergunta"],
+        "palavras": [p.translate(ACCENT_TABLE) for p in data["palavras"]],
+        "embed": discord.Embed.from_dict(embed),
+    }
 
 
 # ===================================================
 # ==============  VIEW DE BOTÕES  ===================
 # ===================================================
-class PerguntaView(discord.ui.View):
+class TopicoView(discord.ui.View):
     """
-    View genérica: exibe botões "Sim" e "Não".
-    - Se clicar em "Sim": envia o embed e apaga a mensagem de pergunta; 1 min depois, apaga o embed.
-    - Se clicar em "Não" ou se der timeout (30 min), apaga a mensagem de pergunta e não faz mais nada.
+    View persistente de um tópico, com botões "Sim" e "Não".
+    - "Sim": envia o embed do tópico, apaga a pergunta e agenda a exclusão do embed.
+    - "Não": apaga a pergunta.
+    Uma instância por tópico, registrada com ``bot.add_view``: o ``custom_id``
+    (``ajuda_completa:sim:<tópico>``) identifica o tópico, então os botões funcionam
+    após reiniciar. As perguntas são enviadas com ``molde`` (só os botões, já parado),
+    porque o ``send`` do discord.py registra de novo, por mensagem, qualquer view
+    ainda ativa — e esse registro nunca sai do ``ViewStore``.
     """
-    def __init__(self, embed: discord.Embed, timeout: float = 1800.0, remover_msg_depois: float = 60.0):
-        super().__init__(timeout=timeout)
-        self.message = None  # Referência à mensagem de pergunta
-        self.embed = embed   # Embed que será enviado se clicar em "Sim"
-        self.remover_msg_depois = remover_msg_depois
-
-    @discord.ui.button(label="Sim", style=discord.ButtonStyle.success)
-    async def botao_sim(self, interaction: discord.Interaction, button: discord.ui.Button):
+    def __init__(self, topico: str, embed: discord.Embed):
+        super().__init__(timeout=None)
+        self.topico = topico
+        self.embed = embed   # montado na carga do arquivo do tópico, não por clique
+
+        sim = discord.ui.Button(label="Sim", style=discord.ButtonStyle.success,
+                                custom_id=f"ajuda_completa:sim:{topico}")
+        sim.callback = self.botao_sim
+        nao = discord.ui.Button(label="Não", style=discord.ButtonStyle.danger,
+                                custom_id=f"ajuda_completa:nao:{topico}")
+        nao.callback = self.botao_nao
+        self.add_item(sim)
+        self.add_item(nao)
+        self.molde = self._molde()
+
+    def _molde(self) -> discord.ui.View:
+        """Mesmos botões, sem callbacks e com ``is_finished()``: o ``send`` não o registra."""
+        molde = discord.ui.View(timeout=None)
+        for item in self.children:
+            molde.add_item(discord.ui.Button(label=item.label, style=item.style, custom_id=item.custom_id))
+        molde.stop()
+        return molde
+
+    async def botao_sim(self, interaction: discord.Interaction):
         # Responde imediatamente com o embed e deleta a mensagem de pergunta
         await interaction.response.send_message(embed=self.embed)
-        if self.message:
-            try:
-                await self.message.delete()
-            except Exception:
-                pass
+        await self._apagar_pergunta(interaction)
         msg_embed = await interaction.original_response()
-        await asyncio.sleep(self.remover_msg_depois)
-        try:
-            await msg_embed.delete()
-        except Exception:
-            pass
-        self.stop()
+        await interaction.client.deleter.delete_later(msg_embed, EMBED_DURACAO)
 
-    @discord.ui.button(label="Não", style=discord.ButtonStyle.danger)
-    async def botao_nao(self, interaction: discord.Interaction, button: discord.ui.Button):
+    async def botao_nao(self, interaction: discord.Interaction):
         # Apenas remove a mensagem de pergunta
-        if self.message:
-            try:
-                await self.message.delete()
-            except Exception:
-                pass
-        self.stop()
+        await interaction.response.defer()
+        await self._apagar_pergunta(interaction)
 
-    async def on_timeout(self):
-        """Se ninguém clicar em nada após o timeout (30 min), apaga a mensagem de pergunta."""
-        if self.message:
-            try:
-                await self.message.delete()
-            except Exception:
-                pass
-        self.stop()
+    @staticmethod
+    async def _apagar_pergunta(interaction: discord.Interaction):
+        try:
+            await interaction.message.delete()
+        except Exception:
+            pass
 
 
 # ===================================================
@@ -452,68 +112,114 @@ class PerguntaView(discord.ui.View):
 # ===================================================
 class AjudaCompletaCog(commands.Cog):
     """
-    Cog que detecta keywords para:
-    - COMANDOS DO SERVIDOR
-    - ARMADURAS
-    - VEÍCULOS
-    - ESTAÇÕES DE TRABALHO (forja, fogueira, bancada, etc.)
-    E, ao encontrar, pergunta se o usuário quer ver o conteúdo.
-    Usa botões "Sim"/"Não".
+    Cog que detecta keywords dos tópicos em ``AJUDA_DIR`` (armaduras, veículos,
+    estações de trabalho...) e pergunta se o usuário quer ver o conteúdo.
+    Usa botões "Sim"/"Não" (views persistentes, uma por tópico).
+
+    Todas as palavras de todos os tópicos ficam numa única regex (TopicMatcher):
+    uma varredura por mensagem escolhe o melhor tópico. Os arquivos são
+    recarregados quando mudam, sem reiniciar o bot.
     """
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
+        self.route = None
+        self.topicos: Dict[str, dict] = {}
+        self.views: Dict[str, TopicoView] = {}
+        self.matcher: Optional[TopicMatcher] = None
+        self._mtimes: Dict[str, float] = {}
+        self._checked = 0.0
+        # (canal, tópico) / (usuário, tópico) -> monotonic da última pergunta
+        self.cooldown_canal = LRUCache(COOLDOWN_MAX)
+        self.cooldown_usuario = LRUCache(COOLDOWN_MAX)
+
+    async def cog_load(self):
+        self.recarregar()
         # Ignora bots (incluindo o próprio)
-        if message.author.bot:
+        self.route = self.bot.router.register(
+            self.handle_message,
+            predicate=lambda m: not m.author.bot,
+            name="ajuda_completa",
+        )
+
+    async def cog_unload(self):
+        self.bot.router.unregister(self.route)
+        for view in self.views.values():
+            view.stop()   # tira a view do registro de views persistentes
+
+    # ───── carga / hot-reload ─────
+    def _arquivos(self) -> Dict[str, float]:
+        return {caminho: os.path.getmtime(caminho)
+                for caminho in sorted(glob(os.path.join(AJUDA_DIR, "*.json")))}
+
+    def recarregar_se_mudou(self):
+        agora = time.monotonic()
+        if agora - self._checked < RELOAD_INTERVAL:
             return
-
-        content_lower = message.content.lower()
-
-        # 1) COMANDOS
-        if any(k in content_lower for k in KEYWORDS_COMANDOS):
-            embed_comandos = criar_embed_comandos()
-            view = PerguntaView(embed_comandos, timeout=1800.0, remover_msg_depois=60.0)
-            msg = await message.channel.send(
-                f"{message.author.mention}, deseja ver a lista de COMANDOS do servidor?",
-                view=view
-            )
-            view.message = msg
-            return
-
-        # 2) ARMADURAS
-        if any(k in content_lower for k in KEYWORDS_ARMADURAS):
-            embed_armaduras = criar_embed_armaduras()
-            view = PerguntaView(embed_armaduras, timeout=1800.0, remover_msg_depois=60.0)
-            msg = await message.channel.send(
-                f"{message.author.mention}, deseja ver a lista de ARMADURAS e seus bônus?",
-                view=view
-            )
-            view.message = msg
+        self._checked = agora
+        try:
+            mudou = self._arquivos() != self._mtimes
+        except OSError:
+            mudou = True          # arquivo sumiu entre o glob e o stat
+        if mudou:
+            self.recarregar()
+
+    def recarregar(self):
+        """
+        Relê todos os tópicos. Se algum arquivo estiver inválido, mantém a base
+        anterior inteira (nada de meia atualização).
+        """
+        try:
+            mtimes = self._arquivos()
+            topicos = {
+                os.path.splitext(os.path.basename(caminho))[0]: carregar_topico(caminho)
+                for caminho in mtimes
+            }
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.error(f"[Ajuda] base não recarregada, mantendo a anterior: {e!r}")
+            self._mtimes = {}     # tenta de novo na próxima verificação
             return
 
-        # 3) VEÍCULOS
-        if any(k in content_lower for k in KEYWORDS_VEICULOS):
-            embed_veiculos = criar_embed_veiculos()
-            view = PerguntaView(embed_veiculos, timeout=1800.0, remover_msg_depois=60.0)
-            msg = await message.channel.send(
-                f"{message.author.mention}, deseja ver as informações sobre VEÍCULOS?",
-                view=view
-            )
-            view.message = msg
+        for topico, dados in topicos.items():
+            view = self.views.get(topico)
+            if view is None:
+                view = self.views[topico] = TopicoView(topico, dados["embed"])
+                self.bot.add_view(view)
+            else:
+                view.embed = dados["embed"]   # mesma view registrada, embed novo
+        for topico in set(self.views) - set(topicos):
+            self.views.pop(topico).stop()
+        self.topicos = topicos
+        self.matcher = TopicMatcher({t: d["palavras"] for t, d in topicos.items()})
+        self._mtimes = mtimes
+        logger.info(f"[Ajuda] {len(topicos)} tópicos, {len(self.matcher)} palavras-chave carregadas")
+
+    # ───── mensagens ─────
+    def _em_cooldown(self, message: discord.Message, topico: str) -> bool:
+        agora = time.monotonic()
+        chave_canal = (message.channel.id, topico)
+        chave_usuario = (message.author.id, topico)
+        canal = self.cooldown_canal.get(chave_canal)
+        usuario = self.cooldown_usuario.get(chave_usuario)
+        if (canal is not None and agora - canal < COOLDOWN_CANAL) or \
+           (usuario is not None and agora - usuario < COOLDOWN_USUARIO):
+            return True
+        self.cooldown_canal.put(chave_canal, agora)
+        self.cooldown_usuario.put(chave_usuario, agora)
+        return False
+
+    async def handle_message(self, message: discord.Message):
+        self.recarregar_se_mudou()
+        if not self.matcher:
             return
-
-        # 4) ESTAÇÕES DE TRABALHO
-        if any(k in content_lower for k in KEYWORDS_ESTACOES):
-            embed_estacoes = criar_embed_estacoes()
-            view = PerguntaView(embed_estacoes, timeout=1800.0, remover_msg_depois=60.0)
-            msg = await message.channel.send(
-                f"{message.author.mention}, deseja ver as ESTAÇÕES DE TRABALHO (forja, fogueira, etc.)?",
-                view=view
-            )
-            view.message = msg
+        topico = self.matcher.best(message.content.translate(ACCENT_TABLE))
+        if topico is None or self._em_cooldown(message, topico):
             return
+        msg = await message.channel.send(
+            f"{message.author.mention}, {self.topicos[topico]['pergunta']}",
+            view=self.views[topico].molde   # o clique cai na view persistente
+        )
+        # sem resposta, a pergunta some sozinha (sobrevive a reinícios)
+        await self.bot.deleter.delete_later(msg, PERGUNTA_TIMEOUT)
 
 
 async def setup(bot: commands.Bot):
@@ -4,19 +4,24 @@ GlobalBan – banimento global em todos os servidores do bot.
 Necessita tabelas:
     • GlobalBan              (id, discord_id, banned_by, reason, timestamp)
     • GlobalBanLogConfig     (guild_id, channel_id, set_by)
+    • GlobalBanJob           (discord_id, guild_id, action, status, attempts, …)
 """
 import asyncio
 import logging
+import os
 import time
-from contextlib import contextmanager
-from datetime import datetime, timezone
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 import discord
 from discord import app_commands
 from discord.ext import commands
+from sqlalchemy import delete, func, select, update
 
-from db import SessionLocal, GlobalBan, GlobalBanLogConfig
+from db import adb, GlobalBan, GlobalBanJob, GlobalBanLogConfig, upsert
+from utils.bancache import BanSet, load_snapshot, write_snapshot
+from utils.fanout import FanoutExecutor
 
 logger = logging.getLogger(__name__)
 
@@ -48,8 +53,8 @@ class E:
             title = "🚪 Auto-Ban à Entrada"
             desc = "Usuário entrou no servidor"
         else:
-            title = "⏱️ Auto-Ban Periódico"
-            desc = "Verificação periódica de membros"
+            title = "⏱️ Auto-Ban por Varredura"
+            desc = "Varredura de membros (reconciliação)"
         e = cls._base(title, discord.Color.orange(), user)
         e.add_field(name="🆔 ID",      value=f"`{user.id}`", inline=True)
         e.add_field(name="⚙️ Contexto", value=desc, inline=True)
@@ -68,6 +73,26 @@ class E:
         e.set_footer(text="Unban processado")
         return e
 
+    @classmethod
+    def fanout(cls, title: str, table: dict, done: Optional[int] = None):
+        """Resumo (ou progresso, se ``done`` vier) de uma operação em todas as guildas."""
+        counts = {}
+        for status in table.values():
+            counts[status] = counts.get(status, 0) + 1
+        e = discord.Embed(title=title, colour=discord.Color.blurple(), timestamp=datetime.now(timezone.utc))
+        if done is not None:
+            e.description = f"⏳ Processadas **{done}/{len(table)}** guildas…"
+        if counts:
+            e.add_field(name="📊 Resultado",
+                        value="\n".join(f"**{st}:** {n}" for st, n in sorted(counts.items())),
+                        inline=False)
+        problems = [f"`{g.name[:40]}` — {st}" for g, st in table.items()
+                    if st in (GlobalBanCog.FORBIDDEN, GlobalBanCog.FAILED)]
+        if problems:
+            more = f"\n… e mais {len(problems) - 15}" if len(problems) > 15 else ""
+            e.add_field(name="⚠️ Guildas com problema", value="\n".join(problems[:15]) + more, inline=False)
+        return e
+
     @classmethod
     def info(cls, desc: str):
         return discord.Embed(
@@ -86,84 +111,190 @@ class E:
             timestamp=datetime.now(timezone.utc)
         )
 
-# ───────────────────────── DB helper ─────────────────────────────────
-@contextmanager
-def db():
-    s = SessionLocal()
-    try:
-        yield s
-        s.commit()
-    except Exception:
-        s.rollback()
-        raise
-    finally:
-        s.close()
+_Job = namedtuple("_Job", "id discord_id guild_id action reason attempts")
 
 # ───────────────────────── Cog ────────────────────────────────────────
 class GlobalBanCog(commands.Cog):
     RATE_LIMIT        = 30        # segundos entre bans via slash/prefix
-    RECHECK_INTERVAL  = 5 * 60    # 5 minutos em segundos
+    # varredura completa lenta; as rápidas vêm de on_guild_join e de mudanças na lista
+    SWEEP_INTERVAL    = int(os.getenv("GBAN_SWEEP_INTERVAL", 6 * 60 * 60))
     REASONS           = ["Spam", "Scam", "Tóxico", "NSFW", "Cheats", "Outro"]
+    # fan-out: chamadas simultâneas e req/s (global e por rota) contra a API
+    FANOUT_CONCURRENCY = int(os.getenv("GBAN_CONCURRENCY", 8))
+    FANOUT_GLOBAL_RATE = float(os.getenv("GBAN_GLOBAL_RATE", 40))
+    FANOUT_ROUTE_RATE  = float(os.getenv("GBAN_ROUTE_RATE", 5))
+    PROGRESS_INTERVAL  = 1.5      # segundos entre edições da mensagem de progresso
+    # snapshot mmap do cache de IDs (carga = snapshot + bans com id > high water)
+    SNAPSHOT_FILE      = os.getenv("GBAN_SNAPSHOT", "global_bans.snap")
+    SNAPSHOT_BLOOM     = os.getenv("GBAN_BLOOM", "0") == "1"  # em Python puro o bisect já é mais rápido
+
+    # status por guilda
+    BANNED, ALREADY_BANNED = "banido", "já banido"
+    UNBANNED, NOT_BANNED   = "desbanido", "não estava banido"
+    FORBIDDEN, FAILED      = "sem permissão", "falhou"
+
+    # fila durável (GlobalBanJob)
+    JOB_PENDING, JOB_DONE, JOB_FAILED = "pending", "done", "failed"
+    JOB_FORBIDDEN, JOB_SKIPPED        = "forbidden", "skipped"
+    JOB_LEASE          = 10 * 60  # jobs em execução só voltam ao worker após esse prazo
+    JOB_WORKER_IDLE    = 30       # segundos entre verificações com a fila vazia
+    JOB_BATCH          = 200
+    JOB_MAX_ATTEMPTS   = 8
+    JOB_BACKOFF_BASE   = 30       # s; dobra a cada tentativa
+    JOB_BACKOFF_MAX    = 6 * 60 * 60
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.last_gban      = 0.0
         self.log_channels   = {}      # guild_id -> channel_id
-        self.ban_cache      = set()   # conjunto de IDs banidos
+        self.ban_cache      = BanSet()  # IDs banidos (snapshot mmap + overlay)
+        self.cache_stats    = {"source": None, "load_ms": 0.0, "delta": 0}
+        self.sweep_stats    = {
+            "sweeps": 0, "guilds": 0, "members_checked": 0, "bans_applied": 0,
+            "last_duration": 0.0, "last_at": None, "last_reason": None,
+        }
+        self._jobs_event    = asyncio.Event()
+        self.job_stats      = {
+            "enqueued": 0, "processed": 0, "done": 0, "failed": 0, "retries": 0,
+            "forbidden": 0, "skipped": 0, "last_batch": 0, "last_rate": 0.0,
+        }
+        self.executor = FanoutExecutor(self.FANOUT_CONCURRENCY, self.FANOUT_GLOBAL_RATE, self.FANOUT_ROUTE_RATE)
         self.gban = app_commands.Group(name="gban", description="Comandos de ban global")
         self._register_slash_commands()
 
     async def cog_load(self):
         await self._cache_log_channels()
         await self._load_ban_cache()
-        # inicia a task periódica de rechecagem
-        self._rechecker_task = asyncio.create_task(self._periodic_recheck())
+        # inicia o reconciliador (varredura inicial + periódica/sob demanda)
+        self._sweeper_task = asyncio.create_task(self._sweeper())
+        # drena a fila de jobs (retoma o que ficou pela metade num restart)
+        self._worker_task = asyncio.create_task(self._job_worker())
         self.bot.tree.add_command(self.gban)
 
     async def cog_unload(self):
-        self._rechecker_task.cancel()
+        self._sweeper_task.cancel()
+        self._worker_task.cancel()
         self.bot.tree.remove_command(self.gban.name, type=self.gban.type)
+        if self.ban_cache.dirty:
+            await self._write_snapshot()
 
     # ───── cache ─────
     async def _cache_log_channels(self):
-        with db() as s:
-            self.log_channels = {
-                int(r.guild_id): int(r.channel_id)
-                for r in s.query(GlobalBanLogConfig)
-            }
+        async with adb() as s:
+            rows = await s.execute(select(GlobalBanLogConfig.guild_id, GlobalBanLogConfig.channel_id))
+            self.log_channels = {int(gid): int(cid) for gid, cid in rows}
 
     async def _load_ban_cache(self):
-        with db() as s:
-            self.ban_cache = {int(r.discord_id) for r in s.query(GlobalBan)}
-        logger.info(f"[GlobalBan] cache carregado com {len(self.ban_cache)} IDs")
+        """Snapshot + delta do banco; reconstrói tudo se o snapshot não confere."""
+        start = time.perf_counter()
+        snap = load_snapshot(self.SNAPSHOT_FILE)
+        async with adb() as s:
+            if snap is not None:
+                # remoções (ou outro banco) mudam a contagem até o high water
+                rows = await s.scalar(select(func.count(GlobalBan.id)).where(GlobalBan.id <= snap.high_water))
+                if rows != snap.rows:
+                    logger.info(f"[GlobalBan] snapshot desatualizado ({snap.rows} != {rows}), reconstruindo")
+                    snap = None
+            if snap is not None:
+                cache = snap.ban_set
+                delta = (await s.scalars(
+                    select(GlobalBan.discord_id).where(GlobalBan.id > snap.high_water)
+                )).all()
+                for uid in delta:
+                    cache.add(int(uid))
+                self.cache_stats.update(source="snapshot", delta=len(delta))
+            else:
+                stream = await s.stream_scalars(
+                    select(GlobalBan.discord_id).execution_options(yield_per=10_000)
+                )
+                cache = BanSet.from_ids([int(uid) async for uid in stream], bloom=self.SNAPSHOT_BLOOM)
+                self.cache_stats.update(source="banco", delta=len(cache))
+        self.ban_cache = cache
+        if snap is None or cache.dirty:
+            await self._write_snapshot()
+            # reabre o arquivo recém-gravado: a base sai da heap e vai para o mmap
+            fresh = load_snapshot(self.SNAPSHOT_FILE)
+            if fresh is not None and len(fresh.ban_set) == len(cache):
+                self.ban_cache = fresh.ban_set
+        self.cache_stats["load_ms"] = (time.perf_counter() - start) * 1000
+        logger.info(
+            f"[GlobalBan] cache carregado com {len(self.ban_cache)} IDs "
+            f"({self.cache_stats['source']}, {self.cache_stats['load_ms']:.0f} ms)"
+        )
+
+    async def _write_snapshot(self):
+        async with adb() as s:
+            high_water, rows = (await s.execute(select(func.max(GlobalBan.id), func.count(GlobalBan.id)))).one()
+        try:
+            write_snapshot(self.SNAPSHOT_FILE, self.ban_cache.compact(), high_water or 0, rows,
+                           bloom=self.SNAPSHOT_BLOOM)
+        except OSError as e:
+            logger.warning(f"[GlobalBan] falha ao gravar snapshot: {e}")
 
-    # ───── periodic recheck ─────
-    async def _periodic_recheck(self):
+    # ───── reconciliação ─────
+    async def _sweeper(self):
         await self.bot.wait_until_ready()
+        reason = "startup"
         while True:
-            for guild in self.bot.guilds:
-                async for member in guild.fetch_members(limit=None):
-                    if member.id in self.ban_cache:
-                        try:
-                            await guild.ban(member, reason="[GlobalBan] Auto-ban periódico")
-                            embed = E.ban_auto(member, "periodic")
-                            await self._log(guild, embed)
-                        except discord.Forbidden:
-                            logger.warning(f"[GlobalBan] sem permissão para banir {member.id} em {guild.id}")
-                        except Exception as e:
-                            logger.error(f"[GlobalBan] erro ao banir {member.id}: {e}")
-            await asyncio.sleep(self.RECHECK_INTERVAL)
+            await self._sweep(self.bot.guilds, reason)
+            await asyncio.sleep(self.SWEEP_INTERVAL)
+            reason = "schedule"
+
+    def _banned_members(self, guild: discord.Guild) -> list:
+        """Interseção ban_cache x membros em cache, percorrendo o lado menor."""
+        if len(self.ban_cache) < len(guild.members):
+            self.sweep_stats["members_checked"] += len(self.ban_cache)
+            return [m for uid in self.ban_cache if (m := guild.get_member(uid))]
+        self.sweep_stats["members_checked"] += len(guild.members)
+        return [m for m in guild.members if m.id in self.ban_cache]
+
+    async def _sweep(self, guilds, reason: str):
+        start = time.perf_counter()
+        applied = 0
+        for guild in list(guilds):
+            if not guild.chunked:
+                try:
+                    await guild.chunk()
+                except Exception as e:
+                    logger.warning(f"[GlobalBan] falha ao carregar membros de {guild.id}: {e}")
+            for member in self._banned_members(guild):
+                try:
+                    await self.executor.call(
+                        ("bans", guild.id),
+                        lambda: guild.ban(member, reason="[GlobalBan] Auto-ban por varredura"),
+                    )
+                    applied += 1
+                    await self._log(guild, E.ban_auto(member, "sweep"))
+                except discord.Forbidden:
+                    logger.warning(f"[GlobalBan] sem permissão para banir {member.id} em {guild.id}")
+                except Exception as e:
+                    logger.error(f"[GlobalBan] erro ao banir {member.id}: {e}")
+        st = self.sweep_stats
+        st["sweeps"] += 1
+        st["guilds"] = len(guilds)
+        st["bans_applied"] += applied
+        st["last_duration"] = time.perf_counter() - start
+        st["last_at"] = datetime.now(timezone.utc)
+        st["last_reason"] = reason
+        logger.info(f"[GlobalBan] varredura ({reason}): {len(guilds)} guildas, "
+                    f"{applied} bans, {st['last_duration']:.2f}s")
 
     # ───── logging util ─────
     async def _log(self, guild: discord.Guild, embed: discord.Embed):
         ch = guild.get_channel(self.log_channels.get(guild.id, 0)) or guild.system_channel
         if ch and ch.permissions_for(guild.me).send_messages:
             try:
-                await ch.send(embed=embed)
+                await self.executor.call(("send", ch.id), lambda: ch.send(embed=embed))
             except Exception:
                 pass
 
     # ───── events ─────
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        # a lista inteira vai para a fila desta guilda; a varredura cobre quem já está dentro
+        await self._enqueue_jobs("ban", self.ban_cache, [guild.id], "Lista global (entrada do bot)")
+        await self._sweep([guild], "guild-join")
+
     @commands.Cog.listener()
     async def on_member_join(self, m: discord.Member):
         if m.id in self.ban_cache:
@@ -175,66 +306,259 @@ class GlobalBanCog(commands.Cog):
                 logger.warning(f"[GlobalBan] sem permissão para banir {m.id} em {m.guild.id}")
 
     # ───── DB helpers ─────
-    def _add_db(self, uid: int, by: int, reason: str) -> bool:
-        with db() as s:
-            if s.query(GlobalBan).filter_by(discord_id=str(uid)).first():
+    async def _add_db(self, uid: int, by: int, reason: str) -> bool:
+        async with adb() as s:
+            if await s.scalar(select(GlobalBan.id).filter_by(discord_id=str(uid)).limit(1)):
                 return False
             s.add(GlobalBan(discord_id=str(uid), banned_by=str(by), reason=reason))
             return True
 
-    def _del_db(self, uid: int) -> int:
-        with db() as s:
-            return s.query(GlobalBan).filter_by(discord_id=str(uid)).delete()
+    async def _del_db(self, uid: int) -> int:
+        async with adb() as s:
+            return (await s.execute(delete(GlobalBan).filter_by(discord_id=str(uid)))).rowcount
+
+    # ───── fila durável ─────
+    async def _enqueue_jobs(self, action: str, uids, guild_ids, reason: str, delay: float = 0):
+        """Cria/reativa um job por (usuário, guilda). ``delay`` = lease para quem já vai executar."""
+        now = datetime.utcnow()
+        due = now + timedelta(seconds=delay)
+        rows = [
+            {"discord_id": str(u), "guild_id": str(g), "action": action, "reason": reason,
+             "status": self.JOB_PENDING, "attempts": 0, "next_attempt_at": due,
+             "last_error": None, "updated_at": now}
+            for u in uids for g in guild_ids
+        ]
+        opposite = "unban" if action == "ban" else "ban"
+        uid_strs = [str(u) for u in uids]
+        async with adb() as s:
+            # um unban pendente não pode desfazer um ban novo (e vice-versa)
+            for i in range(0, len(uid_strs), 1000):
+                await s.execute(delete(GlobalBanJob).where(
+                    GlobalBanJob.discord_id.in_(uid_strs[i:i + 1000]),
+                    GlobalBanJob.guild_id.in_([str(g) for g in guild_ids]),
+                    GlobalBanJob.action == opposite,
+                    GlobalBanJob.status.in_([self.JOB_PENDING, self.JOB_FAILED]),
+                ))
+            for i in range(0, len(rows), 1000):
+                await s.run_sync(upsert, GlobalBanJob, rows[i:i + 1000], ["discord_id", "guild_id", "action"],
+                                 ["reason", "status", "attempts", "next_attempt_at", "last_error", "updated_at"])
+        self.job_stats["enqueued"] += len(rows)
+        if not delay:
+            self._jobs_event.set()
+
+    async def _finish_jobs(self, action: str, results: dict, errors: Optional[dict] = None):
+        """Grava o resultado de {(discord_id, guild_id): status do fan-out} na fila."""
+        if not results:
+            return
+        errors = errors or {}
+        now = datetime.utcnow()
+        st = self.job_stats
+        async with adb() as s:
+            jobs = await s.scalars(select(GlobalBanJob).where(
+                GlobalBanJob.action == action,
+                GlobalBanJob.discord_id.in_({str(u) for u, _ in results}),
+                GlobalBanJob.guild_id.in_({str(g) for _, g in results}),
+            ))
+            for job in jobs:
+                status = results.get((int(job.discord_id), int(job.guild_id)))
+                if status is None:
+                    continue
+                if status == self.FAILED:
+                    job.attempts += 1
+                    delay = min(self.JOB_BACKOFF_BASE * 2 ** (job.attempts - 1), self.JOB_BACKOFF_MAX)
+                    job.status = self.JOB_FAILED
+                    job.next_attempt_at = now + timedelta(seconds=delay)
+                    job.last_error = errors.get((int(job.discord_id), int(job.guild_id)), status)[:500]
+                    st["failed"] += 1
+                elif status == self.FORBIDDEN:
+                    job.status = self.JOB_FORBIDDEN
+                    st["forbidden"] += 1
+                elif status == self.JOB_SKIPPED:
+                    job.status = self.JOB_SKIPPED
+                    st["skipped"] += 1
+                else:
+                    job.status = self.JOB_DONE
+                    st["done"] += 1
+                st["processed"] += 1
+
+    async def _queue_depth(self) -> dict:
+        async with adb() as s:
+            rows = await s.execute(
+                select(GlobalBanJob.status, func.count(GlobalBanJob.id)).group_by(GlobalBanJob.status)
+            )
+            return {status: n for status, n in rows}
+
+    async def _job_worker(self):
+        await self.bot.wait_until_ready()
+        while True:
+            try:
+                n = await self._drain_jobs()
+            except Exception:
+                logger.exception("[GlobalBan] erro no worker da fila")
+                n = 0
+            if n < self.JOB_BATCH:
+                try:
+                    await asyncio.wait_for(self._jobs_event.wait(), timeout=self.JOB_WORKER_IDLE)
+                except asyncio.TimeoutError:
+                    pass
+                self._jobs_event.clear()
+
+    async def _drain_jobs(self) -> int:
+        """Processa um lote de jobs vencidos (pending/failed). Retorna o tamanho do lote."""
+        now = datetime.utcnow()
+        async with adb() as s:
+            jobs = [
+                _Job(j.id, int(j.discord_id), int(j.guild_id), j.action, j.reason or "", j.attempts)
+                for j in await s.scalars(select(GlobalBanJob).where(
+                    GlobalBanJob.status.in_([self.JOB_PENDING, self.JOB_FAILED]),
+                    GlobalBanJob.attempts < self.JOB_MAX_ATTEMPTS,
+                    GlobalBanJob.next_attempt_at <= now,
+                ).order_by(GlobalBanJob.next_attempt_at).limit(self.JOB_BATCH))
+            ]
+            if jobs:  # lease: ninguém pega estes de novo enquanto executam
+                await s.execute(
+                    update(GlobalBanJob).where(GlobalBanJob.id.in_([j.id for j in jobs]))
+                    .values(next_attempt_at=now + timedelta(seconds=self.JOB_LEASE))
+                )
+        if not jobs:
+            return 0
+
+        start = time.perf_counter()
+        errors = {}
+
+        async def run(job: _Job) -> str:
+            guild = self.bot.get_guild(job.guild_id)
+            if guild is None:                              # bot saiu da guilda
+                return self.JOB_SKIPPED
+            target = discord.Object(id=job.discord_id)
+            try:
+                if job.action == "ban":
+                    return await self._ban_guild(guild, target, job.reason)
+                return await self._unban_guild(guild, job.discord_id)
+            except discord.Forbidden:
+                return self.FORBIDDEN
+            except Exception as e:
+                errors[(job.discord_id, job.guild_id)] = repr(e)
+                return self.FAILED
+
+        results = await self.executor.map(jobs, run)
+        for action in ("ban", "unban"):
+            await self._finish_jobs(action, {
+                (j.discord_id, j.guild_id): st for j, st in results.items() if j.action == action
+            }, errors)
+        elapsed = time.perf_counter() - start
+        self.job_stats["retries"] += sum(1 for j in jobs if j.attempts > 0)
+        self.job_stats["last_batch"] = len(jobs)
+        self.job_stats["last_rate"] = len(jobs) / elapsed if elapsed else 0.0
+        logger.info(f"[GlobalBan] fila: {len(jobs)} jobs em {elapsed:.1f}s")
+        return len(jobs)
 
     # ───── ban & unban ─────
-    async def _exec_ban(self, user: discord.User, mod, reason: str):
+    async def _ban_guild(self, guild: discord.Guild, user: discord.abc.Snowflake, reason: str) -> str:
+        try:
+            await self.executor.call(("bans", guild.id), lambda: guild.fetch_ban(user))
+            return self.ALREADY_BANNED
+        except discord.NotFound:
+            pass
+        await self.executor.call(("bans", guild.id), lambda: guild.ban(user, reason=f"[GlobalBan] {reason}"))
+        return self.BANNED
+
+    async def _unban_guild(self, guild: discord.Guild, uid: int) -> str:
+        try:
+            await self.executor.call(
+                ("bans", guild.id),
+                lambda: guild.unban(discord.Object(id=uid), reason="[GlobalUnban]"),
+            )
+        except discord.NotFound:
+            return self.NOT_BANNED
+        return self.UNBANNED
+
+    def _progress(self, message, title: str, table: dict):
+        """Callback de progresso que edita ``message`` no máximo a cada PROGRESS_INTERVAL s."""
+        last = 0.0
+
+        async def report(done: int, total: int):
+            nonlocal last
+            now = time.monotonic()
+            if message is None or done == total or now - last < self.PROGRESS_INTERVAL:
+                return
+            last = now
+            try:
+                await message.edit(embed=E.fanout(title, table, done))
+            except discord.HTTPException:
+                pass
+        return report
+
+    async def _fanout(self, fn, ok_status: str, title: str, message=None) -> dict:
+        """Executa ``fn(guild)`` em todas as guildas e monta a tabela de resultados."""
+        guilds = list(self.bot.guilds)
+        table = {g: "pendente" for g in guilds}
+
+        async def run(guild):
+            try:
+                table[guild] = await fn(guild)
+            except discord.Forbidden:
+                table[guild] = self.FORBIDDEN
+            except Exception as e:
+                logger.warning(f"[GlobalBan] {title} falhou em {guild.id}: {e}")
+                table[guild] = self.FAILED
+
+        await self.executor.map(guilds, run, on_progress=self._progress(message, title, table))
+        logger.info(f"[GlobalBan] {title}: "
+                    f"{sum(st == ok_status for st in table.values())}/{len(guilds)} guildas")
+        return table
+
+    async def _exec_ban(self, user: discord.User, mod, reason: str, message=None) -> dict:
         if time.time() - self.last_gban < self.RATE_LIMIT:
             raise RuntimeError(f"Aguarde {self.RATE_LIMIT}s entre bans.")
-        # tenta banir em todas as guildas
-        results = await asyncio.gather(
-            *(g.ban(user, reason=f"[GlobalBan] {reason}") for g in self.bot.guilds),
-            return_exceptions=True
-        )
-        if self._add_db(user.id, mod.id, reason):
-            self.ban_cache.add(user.id)
         self.last_gban = time.time()
+        # grava ban + jobs ANTES de chamar a API: um restart no meio é retomado pelo worker
+        # o fan-out abaixo já bane em todas as guildas; sem varredura extra
+        if await self._add_db(user.id, mod.id, reason):
+            self.ban_cache.add(user.id)
+        await self._enqueue_jobs("ban", [user.id], [g.id for g in self.bot.guilds], reason, delay=self.JOB_LEASE)
+
+        table = await self._fanout(lambda g: self._ban_guild(g, user, reason), self.BANNED, "🔨 Ban Global", message)
+        await self._finish_jobs("ban", {(user.id, g.id): st for g, st in table.items()})
         try:
             await user.send(embed=E.info(f"Você foi **banido globalmente**.\nMotivo: **{reason}**"))
         except discord.HTTPException:
             pass
-        # monta embed de ban manual
+        # logs em paralelo (mesmo limitador), apenas nas guildas onde o ban entrou
         embed = E.ban_manual(user, mod, reason)
-        # envia log apenas nas guildas que tiveram sucesso
-        for guild, res in zip(self.bot.guilds, results):
-            if not isinstance(res, Exception):
-                await self._log(guild, embed)
-
-    async def _exec_unban(self, uid: int, mod):
-        results = await asyncio.gather(
-            *(g.unban(discord.Object(id=uid), reason="[GlobalUnban]") for g in self.bot.guilds),
-            return_exceptions=True
-        )
-        self._del_db(uid)
+        await asyncio.gather(*(self._log(g, embed) for g, st in table.items() if st == self.BANNED))
+        return table
+
+    async def _exec_unban(self, uid: int, mod, message=None) -> dict:
+        await self._del_db(uid)
         self.ban_cache.discard(uid)
+        await self._enqueue_jobs("unban", [uid], [g.id for g in self.bot.guilds], "", delay=self.JOB_LEASE)
+
+        table = await self._fanout(lambda g: self._unban_guild(g, uid), self.UNBANNED, "🔓 Unban Global", message)
+        await self._finish_jobs("unban", {(uid, g.id): st for g, st in table.items()})
         embed = E.unban(uid, mod)
-        for guild, res in zip(self.bot.guilds, results):
-            if not isinstance(res, Exception):
-                await self._log(guild, embed)
+        await asyncio.gather(*(self._log(g, embed) for g, st in table.items() if st == self.UNBANNED))
+        return table
 
     # ───── prefix commands ─────
     @commands.has_guild_permissions(administrator=True)
     @commands.command(name="gban")
     async def _gban_prefix(self, ctx, alvo: discord.User, *, reason="Sem Motivo"):
+        msg = await ctx.send(embed=E.info("⏳ Iniciando ban global…"))
         try:
-            await self._exec_ban(alvo, ctx.author, reason)
-            await ctx.message.add_reaction("✅")
+            table = await self._exec_ban(alvo, ctx.author, reason, msg)
         except RuntimeError as e:
-            await ctx.send(embed=E.error(str(e)))
+            await msg.edit(embed=E.error(str(e)))
+        else:
+            await msg.edit(embed=E.fanout("🔨 Ban Global", table))
+            await ctx.message.add_reaction("✅")
 
     @commands.has_guild_permissions(administrator=True)
     @commands.command(name="gunban")
     async def _gunban_prefix(self, ctx, uid: int):
-        await self._exec_unban(uid, ctx.author)
+        msg = await ctx.send(embed=E.info("⏳ Iniciando unban global…"))
+        table = await self._exec_unban(uid, ctx.author, msg)
+        await msg.edit(embed=E.fanout("🔓 Unban Global", table))
         await ctx.message.add_reaction("✅")
 
     @commands.has_guild_permissions(administrator=True)
@@ -265,19 +589,21 @@ class GlobalBanCog(commands.Cog):
         @app_commands.choices(reason=[app_commands.Choice(name=r, value=r) for r in self.REASONS])
         async def _add(inter: discord.Interaction, target: discord.User, reason: str = "Sem Motivo"):
             await inter.response.defer(thinking=True)
+            msg = await inter.followup.send(embed=E.info("⏳ Iniciando ban global…"), ephemeral=True, wait=True)
             try:
-                await self._exec_ban(target, inter.user, reason)
+                table = await self._exec_ban(target, inter.user, reason, msg)
             except RuntimeError as e:
-                await inter.followup.send(embed=E.error(str(e)), ephemeral=True)
+                await msg.edit(embed=E.error(str(e)))
             else:
-                await inter.followup.send(embed=E.ban_manual(target, inter.user, reason), ephemeral=True)
+                await msg.edit(embeds=[E.ban_manual(target, inter.user, reason), E.fanout("🔨 Ban Global", table)])
 
         @self.gban.command(name="remove", description="Unban global")
         @app_commands.check(admin)
         async def _remove(inter: discord.Interaction, target_id: int):
             await inter.response.defer(thinking=True)
-            await self._exec_unban(target_id, inter.user)
-            await inter.followup.send(embed=E.unban(target_id, inter.user), ephemeral=True)
+            msg = await inter.followup.send(embed=E.info("⏳ Iniciando unban global…"), ephemeral=True, wait=True)
+            table = await self._exec_unban(target_id, inter.user, msg)
+            await msg.edit(embeds=[E.unban(target_id, inter.user), E.fanout("🔓 Unban Global", table)])
 
         @self.gban.command(name="setlog", description="Define canal de logs")
         @app_commands.check(lambda i: i.user.guild_permissions.manage_guild)
@@ -285,12 +611,14 @@ class GlobalBanCog(commands.Cog):
             cur = self.log_channels.get(inter.guild.id)
             if cur == channel.id:
                 return await inter.response.send_message(embed=E.info(f"Já configurado para {channel.mention}."), ephemeral=True)
-            with db() as s:
-                s.merge(GlobalBanLogConfig(
-                    guild_id=str(inter.guild.id),
-                    channel_id=str(channel.id),
-                    set_by=str(inter.user.id)
-                ))
+            async with adb() as s:
+                # upsert por guild_id (merge sem id sempre inseria e batia no unique)
+                await s.run_sync(upsert, GlobalBanLogConfig, [{
+                    "guild_id": str(inter.guild.id),
+                    "channel_id": str(channel.id),
+                    "set_by": str(inter.user.id),
+                    "updated_at": datetime.utcnow(),
+                }], ["guild_id"], ["channel_id", "set_by", "updated_at"])
             self.log_channels[inter.guild.id] = channel.id
             await inter.response.send_message(embed=E.info(f"Canal definido: {channel.mention}"), ephemeral=True)
 
@@ -309,13 +637,43 @@ class GlobalBanCog(commands.Cog):
             embed.set_footer(text=f"Solicitado por {inter.user}", icon_url=inter.user.display_avatar.url)
             await inter.response.send_message(embed=embed, ephemeral=True)
 
+        @self.gban.command(name="stats", description="Métricas da reconciliação de bans")
+        @app_commands.check(admin)
+        async def _stats(inter: discord.Interaction):
+            st = self.sweep_stats
+            last = discord.utils.format_dt(st["last_at"], "R") if st["last_at"] else "nunca"
+            embed = E.info(
+                f"**IDs banidos:** {len(self.ban_cache)} "
+                f"(carga via {self.cache_stats['source']} em {self.cache_stats['load_ms']:.0f} ms, "
+                f"delta {self.cache_stats['delta']})\n"
+                f"**Varreduras:** {st['sweeps']} (última {last}, motivo `{st['last_reason']}`)\n"
+                f"**Duração da última:** {st['last_duration'] * 1000:.0f} ms em {st['guilds']} guildas\n"
+                f"**Membros verificados (total):** {st['members_checked']}\n"
+                f"**Bans aplicados por varredura:** {st['bans_applied']}\n"
+                f"**Intervalo lento:** {self.SWEEP_INTERVAL}s"
+            )
+            js = self.job_stats
+            depth = await self._queue_depth()
+            embed.add_field(
+                name="📬 Fila de jobs",
+                value=(
+                    f"**Pendentes:** {depth.get(self.JOB_PENDING, 0)} • **Com falha:** {depth.get(self.JOB_FAILED, 0)}\n"
+                    f"**Processados:** {js['processed']} (ok {js['done']}, falhas {js['failed']}, "
+                    f"sem permissão {js['forbidden']}, ignorados {js['skipped']})\n"
+                    f"**Retentativas:** {js['retries']} • **Enfileirados:** {js['enqueued']}\n"
+                    f"**Último lote:** {js['last_batch']} jobs a {js['last_rate']:.1f} jobs/s"
+                ),
+                inline=False,
+            )
+            await inter.response.send_message(embed=embed, ephemeral=True)
+
         @self.gban.command(name="removelog", description="Remove canal de logs")
         @app_commands.check(lambda i: i.user.guild_permissions.manage_guild)
         async def _removelog(inter: discord.Interaction):
             if inter.guild.id not in self.log_channels:
                 return await inter.response.send_message(embed=E.info("Nenhum canal configurado."), ephemeral=True)
-            with db() as s:
-                s.query(GlobalBanLogConfig).filter_by(guild_id=str(inter.guild.id)).delete()
+            async with adb() as s:
+                await s.execute(delete(GlobalBanLogConfig).filter_by(guild_id=str(inter.guild.id)))
             self.log_channels.pop(inter.guild.id, None)
             await inter.response.send_message(embed=E.info("Canal de log removido."), ephemeral=True)
 
@@ -1,11 +1,13 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import asyncio
 import re
 import datetime
+from typing import Optional
 
-from db import SessionLocal, PlayerName, GuildConfig
+from sqlalchemy import select
+
+from db import adb, PlayerName, GuildConfig
 
 # Cores de exemplo
 COR_SUCESSO = discord.Color.green()
@@ -31,6 +33,33 @@ class VerificacaoCog(commands.Cog):
         self.bot = bot
         # Dicionário para contar quantas vezes cada user errou (user_id -> int)
         self.error_counts = {}
+        # Cache write-through das configs (guild_id -> GuildConfig); o banco só é
+        # lido no cog_load e escrito pelos comandos set_*
+        self.configs = {}
+        self.routes = {}  # guild_id -> rota do canal de verificação
+
+    async def cog_load(self):
+        async with adb() as s:
+            self.configs = {int(c.guild_id): c for c in await s.scalars(select(GuildConfig))}
+        for guild_id, config in self.configs.items():
+            if config.verification_channel_id:
+                self._route_channel(guild_id, int(config.verification_channel_id))
+
+    async def cog_unload(self):
+        for route in self.routes.values():
+            self.bot.router.unregister(route)
+        self.routes.clear()
+
+    def _route_channel(self, guild_id: int, channel_id: int):
+        """(Re)inscreve o canal de verificação do servidor: outros canais nem chegam aqui."""
+        self.bot.router.unregister(self.routes.pop(guild_id, None))
+        self.routes[guild_id] = self.bot.router.register(
+            self.handle_message,
+            guild_id=guild_id,
+            channel_id=channel_id,
+            predicate=lambda m: not m.author.bot,
+            name="verificacao",
+        )
 
     # =======================================================
     #   1) Comandos Slash de Configuração do Servidor
@@ -47,29 +76,18 @@ class VerificacaoCog(commands.Cog):
         canal: discord.TextChannel
     ):
         await interaction.response.defer(ephemeral=True)
-        guild_id = str(interaction.guild_id)
-        session = SessionLocal()
         try:
-            config = session.query(GuildConfig).filter_by(guild_id=guild_id).first()
-            if not config:
-                config = GuildConfig(guild_id=guild_id)
-                session.add(config)
-
-            config.verification_channel_id = str(canal.id)
-            session.commit()
+            await self._set_config_field(interaction.guild_id, "verification_channel_id", str(canal.id))
 
             await interaction.followup.send(
                 f"Canal de verificação configurado para {canal.mention}.",
                 ephemeral=True
             )
         except Exception as e:
-            session.rollback()
             await interaction.followup.send(
                 f"Erro ao configurar o canal: {e}",
                 ephemeral=True
             )
-        finally:
-            session.close()
 
     @app_commands.command(
         name="set_canal_log",
@@ -79,27 +97,15 @@ class VerificacaoCog(commands.Cog):
     @app_commands.checks.has_permissions(administrator=True)
     async def set_canal_log(self, interaction: discord.Interaction, canal: discord.TextChannel):
         await interaction.response.defer(ephemeral=True)
-        guild_id = str(interaction.guild_id)
-
-        session = SessionLocal()
         try:
-            config = session.query(GuildConfig).filter_by(guild_id=guild_id).first()
-            if not config:
-                config = GuildConfig(guild_id=guild_id)
-                session.add(config)
-
-            config.log_channel_id = str(canal.id)
-            session.commit()
+            await self._set_config_field(interaction.guild_id, "log_channel_id", str(canal.id))
 
             await interaction.followup.send(
                 f"Canal de log configurado para {canal.mention}.",
                 ephemeral=True
             )
         except Exception as e:
-            session.rollback()
             await interaction.followup.send(f"Erro ao configurar o canal de log: {e}", ephemeral=True)
-        finally:
-            session.close()
 
     @app_commands.command(
         name="set_cargo_verificado",
@@ -109,27 +115,15 @@ class VerificacaoCog(commands.Cog):
     @app_commands.checks.has_permissions(administrator=True)
     async def set_cargo_verificado(self, interaction: discord.Interaction, cargo: discord.Role):
         await interaction.response.defer(ephemeral=True)
-        guild_id = str(interaction.guild_id)
-
-        session = SessionLocal()
         try:
-            config = session.query(GuildConfig).filter_by(guild_id=guild_id).first()
-            if not config:
-                config = GuildConfig(guild_id=guild_id)
-                session.add(config)
-
-            config.verificado_role_id = str(cargo.id)
-            session.commit()
+            await self._set_config_field(interaction.guild_id, "verificado_role_id", str(cargo.id))
 
             await interaction.followup.send(
                 f"Cargo de verificado configurado para {cargo.mention}",
                 ephemeral=True
             )
         except Exception as e:
-            session.rollback()
             await interaction.followup.send(f"Erro ao configurar o cargo: {e}", ephemeral=True)
-        finally:
-            session.close()
 
     @app_commands.command(
         name="set_cargo_staff",
@@ -139,44 +133,23 @@ class VerificacaoCog(commands.Cog):
     @app_commands.checks.has_permissions(administrator=True)
     async def set_cargo_staff(self, interaction: discord.Interaction, cargo: discord.Role):
         await interaction.response.defer(ephemeral=True)
-        guild_id = str(interaction.guild_id)
-
-        session = SessionLocal()
         try:
-            config = session.query(GuildConfig).filter_by(guild_id=guild_id).first()
-            if not config:
-                config = GuildConfig(guild_id=guild_id)
-                session.add(config)
-
-            config.staff_role_id = str(cargo.id)
-            session.commit()
+            await self._set_config_field(interaction.guild_id, "staff_role_id", str(cargo.id))
 
             await interaction.followup.send(
                 f"Cargo de staff configurado para {cargo.mention}",
                 ephemeral=True
             )
         except Exception as e:
-            session.rollback()
             await interaction.followup.send(f"Erro ao configurar o cargo de staff: {e}", ephemeral=True)
-        finally:
-            session.close()
 
     # =======================================================
-    #   2) Listener on_message: Fluxo de Verificação
+    #   2) Mensagens (via roteador): Fluxo de Verificação
     # =======================================================
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        # Ignorar bots, DMs, etc.
-        if message.author.bot or not message.guild:
-            return
-
-        # Verificar se há config para este servidor e se o canal é o correto
+    async def handle_message(self, message: discord.Message):
+        # O roteador só entrega mensagens de não-bots no canal de verificação
         config = self.get_guild_config(message.guild.id)
-        if not config or not config.verification_channel_id:
-            return
-
-        # Se não estiver no canal configurado, sai
-        if str(message.channel.id) != config.verification_channel_id:
+        if not config or str(message.channel.id) != config.verification_channel_id:
             return
 
         member = message.author
@@ -231,20 +204,7 @@ class VerificacaoCog(commands.Cog):
         self.reset_error_count(member.id)
 
         # Salvar no DB (PlayerName)
-        session = SessionLocal()
-        try:
-            p = session.query(PlayerName).filter_by(discord_id=str(member.id)).first()
-            if not p:
-                p = PlayerName(discord_id=str(member.id), in_game_name=novo_nick)
-                session.add(p)
-            else:
-                p.in_game_name = novo_nick
-            session.commit()
-        except Exception as e:
-            session.rollback()
-            print(f"[ERRO DB] {e}")
-        finally:
-            session.close()
+        await self.salvar_nome(member.id, novo_nick)
 
         # Atribuir cargo verificado se existir
         if config.verificado_role_id:
@@ -279,12 +239,8 @@ class VerificacaoCog(commands.Cog):
             config
         )
 
-        # [Opcional] Apagar a embed depois de X segundos
-        await asyncio.sleep(15)
-        try:
-            await msg_sucesso.delete()
-        except:
-            pass
+        # Apaga a embed depois de 15 segundos (agendador central, sem segurar o handler)
+        await self.bot.deleter.delete_later(msg_sucesso, 15)
 
     # =======================================================
     #   3) Listener on_member_update (remover cargo se mudar)
@@ -382,20 +338,7 @@ class VerificacaoCog(commands.Cog):
             return
 
         # Salvar no DB
-        session = SessionLocal()
-        try:
-            p = session.query(PlayerName).filter_by(discord_id=str(interaction.user.id)).first()
-            if not p:
-                p = PlayerName(discord_id=str(interaction.user.id), in_game_name=novo_nick)
-                session.add(p)
-            else:
-                p.in_game_name = novo_nick
-            session.commit()
-        except Exception as e:
-            session.rollback()
-            print(f"[ERRO DB] {e}")
-        finally:
-            session.close()
+        await self.salvar_nome(interaction.user.id, novo_nick)
 
         # Adiciona cargo verificado
         if config.verificado_role_id:
@@ -415,13 +358,34 @@ class VerificacaoCog(commands.Cog):
     # =======================================================
     #   5) Funções Auxiliares
     # =======================================================
-    def get_guild_config(self, guild_id: int) -> GuildConfig:
-        """Obtém (ou None) as configs salvas no DB para este guild."""
-        session = SessionLocal()
+    def get_guild_config(self, guild_id: int) -> Optional[GuildConfig]:
+        """Obtém (ou None) as configs deste guild, direto do cache."""
+        return self.configs.get(guild_id)
+
+    async def _set_config_field(self, guild_id: int, field: str, value: str):
+        """Grava um campo do GuildConfig (cria a linha se ainda não existir) e atualiza o cache."""
+        async with adb() as s:
+            config = await s.scalar(select(GuildConfig).filter_by(guild_id=str(guild_id)))
+            if not config:
+                config = GuildConfig(guild_id=str(guild_id))
+                s.add(config)
+            setattr(config, field, value)
+        # só depois do commit: o cache nunca mostra algo que o banco não tem
+        self.configs[guild_id] = config
+        if field == "verification_channel_id":
+            self._route_channel(guild_id, int(value))
+
+    async def salvar_nome(self, discord_id: int, novo_nick: str):
+        """Cria/atualiza o PlayerName do usuário; erro de DB só vai para o log."""
         try:
-            return session.query(GuildConfig).filter_by(guild_id=str(guild_id)).first()
-        finally:
-            session.close()
+            async with adb() as s:
+                p = await s.scalar(select(PlayerName).filter_by(discord_id=str(discord_id)))
+                if not p:
+                    s.add(PlayerName(discord_id=str(discord_id), in_game_name=novo_nick))
+                else:
+                    p.in_game_name = novo_nick
+        except Exception as e:
+            print(f"[ERRO DB] {e}")
 
     async def is_verified(self, member: discord.Member, config: GuildConfig) -> bool:
         """
@@ -453,11 +417,7 @@ class VerificacaoCog(commands.Cog):
             pass
 
         # Apaga a mensagem de erro após alguns segundos
-        await asyncio.sleep(10)
-        try:
-            await msg_erro.delete()
-        except:
-            pass
+        await self.bot.deleter.delete_later(msg_erro, 10)
 
     def increment_error_count(self, user_id: int) -> int:
         """Incrementa o contador de erros de um usuário e retorna o novo total."""
@@ -500,12 +460,7 @@ class VerificacaoCog(commands.Cog):
             color=COR_ALERTA
         )
         msg_tutorial = await channel.send(embed=embed)
-
-        await asyncio.sleep(30)
-        try:
-            await msg_tutorial.delete()
-        except:
-            pass
+        await self.bot.deleter.delete_later(msg_tutorial, 30)
 
     async def logar(self, guild: discord.Guild, texto: str, config: GuildConfig):
         """Envia logs no canal configurado, se houver um canal de log."""
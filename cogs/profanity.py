@@ -1,77 +1,302 @@
 # cogs/profanity.py
-import re
 import os
 import json
+import asyncio
 import logging
 import discord
-from discord.ext import commands
+from discord import app_commands
+from discord.ext import commands, tasks
 from datetime import datetime, timezone
 
+from sqlalchemy import delete, select
+
+from db import adb, ProfanityList, ProfanityWord, ProfanityWarn, upsert
+from utils.cache import LRUCache
+from utils.matcher import WordMatcher
+from utils.text import fold
+
 logger = logging.getLogger(__name__)
 
+# lista padrão, usada por servidores que ainda não personalizaram a sua
+DEFAULT_BLOCKED = (
+    "porra","caralho","merda","puta","cacete","fodase","foda-se",
+    "filhodaputa","filho da puta","vai se foder","vai te catar",
+    "viado","bicha","traveco","tchola","macaco","negro de merda",
+    "crioulada","sua mãe","sua avó","seu pai","seu irmão",
+    "idiota","burro","retardado","imbecil","otário"
+)
+
+class WarnStore:
+    """
+    Contadores de avisos com escrita adiada (write-behind).
+
+    Incrementos só mexem no dicionário em memória e marcam a chave como suja;
+    o flush junta tudo que está sujo em um upsert por lote na tabela
+    profanity_warns, pela sessão assíncrona. Se o banco falhar, as linhas
+    pendentes vão para um journal JSON (tmp + os.replace, atômico) que é
+    reaplicado no próximo load.
+    """
+
+    def __init__(self, journal_path: str, flush_threshold: int = 50):
+        self.journal_path = journal_path
+        self.flush_threshold = flush_threshold
+        self.counts = {}   # (guild_id, user_id) -> avisos
+        self.dirty = set()
+        self._lock = asyncio.Lock()
+        self._pending = None
+        self.flushes = 0
+        self.rows_written = 0
+
+    async def load(self):
+        async with adb() as s:
+            rows = await s.execute(select(ProfanityWarn.guild_id, ProfanityWarn.user_id, ProfanityWarn.count))
+            for gid, uid, count in rows:
+                self.counts[(gid, uid)] = count
+        # journal pendente (ou o profanity_state.json antigo): sobrescreve o banco
+        if os.path.isfile(self.journal_path):
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for gid, users in json.load(f).items():
+                    for uid, count in users.items():
+                        self.counts[(gid, uid)] = count
+                        self.dirty.add((gid, uid))
+        logger.info(f"[Profanity] {len(self.counts)} contadores carregados, {len(self.dirty)} pendentes")
+
+    def get(self, guild_id: str, user_id: str) -> int:
+        return self.counts.get((guild_id, user_id), 0)
+
+    def incr(self, guild_id: str, user_id: str) -> int:
+        key = (guild_id, user_id)
+        count = self.counts.get(key, 0) + 1
+        self.counts[key] = count
+        self._mark(key)
+        return count
+
+    def reset(self, guild_id: str, user_id: str):
+        key = (guild_id, user_id)
+        self.counts.pop(key, None)
+        self._mark(key)
+
+    def _mark(self, key):
+        self.dirty.add(key)
+        if len(self.dirty) >= self.flush_threshold and (self._pending is None or self._pending.done()):
+            self._pending = asyncio.create_task(self.flush())
+
+    async def flush(self):
+        """Grava as chaves sujas; flushes concorrentes são serializados."""
+        async with self._lock:
+            if not self.dirty:
+                return
+            batch = {k: self.counts.get(k, 0) for k in self.dirty}
+            self.dirty.clear()
+            loop = asyncio.get_running_loop()
+            try:
+                await self._write_db(batch)
+            except Exception:
+                logger.exception(f"[Profanity] falha ao gravar {len(batch)} avisos; usando journal")
+                self.dirty.update(batch)
+                pending = {}
+                for (gid, uid) in self.dirty:
+                    pending.setdefault(gid, {})[uid] = self.counts.get((gid, uid), 0)
+                await loop.run_in_executor(None, self._write_journal, pending)
+                return
+            self.flushes += 1
+            self.rows_written += len(batch)
+            if not self.dirty and os.path.isfile(self.journal_path):
+                os.remove(self.journal_path)
+
+    @staticmethod
+    async def _write_db(batch: dict):
+        now = datetime.utcnow()
+        rows = [
+            {"guild_id": gid, "user_id": uid, "count": count, "updated_at": now}
+            for (gid, uid), count in batch.items() if count > 0
+        ]
+        async with adb() as s:
+            await s.run_sync(upsert, ProfanityWarn, rows, ["guild_id", "user_id"], ["count", "updated_at"])
+            for (gid, uid), count in batch.items():
+                if count <= 0:
+                    await s.execute(delete(ProfanityWarn).filter_by(guild_id=gid, user_id=uid))
+
+    def _write_journal(self, pending: dict):
+        tmp = f"{self.journal_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(pending, f, ensure_ascii=False)
+        os.replace(tmp, self.journal_path)
+
+
 class ProfanityCog(commands.Cog):
     """
     Detecta xingamentos, remove a mensagem e envia um embed persistente
     com detalhes. Bane automaticamente após 10 avisos.
+    Cada servidor pode ter a própria lista (tabela profanity_words; a marca de
+    "personalizado" fica em profanity_lists, então uma lista esvaziada continua vazia).
     """
-    STATE_FILE = "profanity_state.json"
+    STATE_FILE = "profanity_state.json"  # journal de avisos ainda não gravados
     DEFAULT_LIMIT = 10  # avisos até ban
+    FLUSH_INTERVAL = 15  # segundos entre flushes dos avisos
+    FLUSH_THRESHOLD = 50  # ou antes, se acumular esta quantidade de avisos sujos
+    MATCHER_CACHE_SIZE = 256  # matchers compilados mantidos em memória
+    MAX_WORD_LEN = 100
+
+    palavras = app_commands.Group(
+        name="palavras",
+        description="Gerencia as palavras proibidas deste servidor",
+        default_permissions=discord.Permissions(manage_guild=True),
+        guild_only=True,
+    )
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        # lista de palavras proibidas
-        blocked = [
-            "porra","caralho","merda","puta","cacete","fodase","foda-se",
-            "filhodaputa","filho da puta","vai se foder","vai te catar",
-            "viado","bicha","traveco","tchola","macaco","negro de merda",
-            "crioulada","sua mãe","sua avó","seu pai","seu irmão",
-            "idiota","burro","retardado","imbecil","otário"
-        ]
-        self.patterns = [re.compile(rf"\b{re.escape(w)}\b", re.IGNORECASE) for w in blocked]
-        self.warns = {}  # { guild_id: { user_id: count } }
-        self.load_state()
-
-    def cog_unload(self):
-        self.save_state()
-
-    def load_state(self):
-        if os.path.isfile(self.STATE_FILE):
-            with open(self.STATE_FILE, "r", encoding="utf-8") as f:
-                self.warns = json.load(f)
-        else:
-            self.warns = {}
-
-    def save_state(self):
-        with open(self.STATE_FILE, "w", encoding="utf-8") as f:
-            json.dump(self.warns, f, indent=2, ensure_ascii=False)
-
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        # ignora bots, DMs e administradores
-        if message.author.bot or not message.guild:
-            return await self.bot.process_commands(message)
+        self.default_matcher = self._compile(DEFAULT_BLOCKED)
+        self.guild_words = {}  # { guild_id: tuple(palavras) } – só servidores personalizados
+        self.matchers = LRUCache(self.MATCHER_CACHE_SIZE)  # guild_id -> WordMatcher
+        self._edit_lock = asyncio.Lock()  # edições de lista: a memória segue a ordem do banco
+        self.store = WarnStore(self.STATE_FILE, self.FLUSH_THRESHOLD)
+
+    async def cog_load(self):
+        async with adb() as s:
+            # servidor marcado sem nenhuma palavra = lista esvaziada de propósito
+            words = {int(gid): [] for gid in await s.scalars(select(ProfanityList.guild_id))}
+            for gid, word in await s.execute(select(ProfanityWord.guild_id, ProfanityWord.word)):
+                words.setdefault(int(gid), []).append(word)
+        self.guild_words = {gid: tuple(ws) for gid, ws in words.items()}
+        logger.info(f"[Profanity] listas personalizadas carregadas para {len(self.guild_words)} servidores")
+        await self.store.load()
+        self.flush_task.start()
+        # todas as mensagens de servidor, exceto bots
+        self.route = self.bot.router.register(
+            self.handle_message,
+            predicate=lambda m: m.guild is not None and not m.author.bot,
+            name="profanity",
+        )
+
+    async def cog_unload(self):
+        # também roda no bot.close(), garantindo o flush final
+        self.bot.router.unregister(self.route)
+        self.flush_task.cancel()
+        await self.store.flush()
+
+    @tasks.loop(seconds=FLUSH_INTERVAL)
+    async def flush_task(self):
+        await self.store.flush()
+
+    # ───── matcher por servidor ─────
+    @staticmethod
+    def _compile(words) -> WordMatcher:
+        # palavras passam pela mesma dobra do texto; repetições/espaços ficam na regex
+        return WordMatcher((fold(w) for w in words), fuzzy=True)
+
+    def matcher_for(self, guild_id: int) -> WordMatcher:
+        """Matcher compilado do servidor; recompila só após mudança na lista."""
+        words = self.guild_words.get(guild_id)
+        if words is None:
+            return self.default_matcher
+        matcher = self.matchers.get(guild_id)
+        if matcher is None:
+            matcher = self._compile(words)
+            self.matchers.put(guild_id, matcher)
+        return matcher
+
+    def _set_guild_words(self, guild_id: int, words):
+        self.guild_words[guild_id] = tuple(words)
+        self.matchers.pop(guild_id)  # invalida só este servidor
+
+    async def _ensure_guild_list(self, s, guild_id: int):
+        """Na primeira personalização, marca o servidor e copia a lista padrão para o banco."""
+        if guild_id in self.guild_words:
+            return list(self.guild_words[guild_id])
+        words = list(DEFAULT_BLOCKED)
+        # ON CONFLICT DO NOTHING: outra instância pode ter personalizado ao mesmo tempo
+        await s.run_sync(upsert, ProfanityList, [{"guild_id": str(guild_id)}], ["guild_id"], [])
+        await s.run_sync(upsert, ProfanityWord, [
+            {"guild_id": str(guild_id), "word": w, "added_by": "default"} for w in words
+        ], ["guild_id", "word"], [])
+        return words
+
+    def _is_default(self, guild_id: int) -> bool:
+        return guild_id not in self.guild_words
+
+    # ───── slash commands ─────
+    @palavras.command(name="adicionar", description="Adiciona uma palavra/frase proibida")
+    @app_commands.describe(palavra="Palavra ou frase a bloquear")
+    async def palavras_adicionar(self, interaction: discord.Interaction, palavra: str):
+        word = palavra.strip().lower()
+        if not word or len(word) > self.MAX_WORD_LEN:
+            return await interaction.response.send_message("❌ Palavra inválida.", ephemeral=True)
+        gid = interaction.guild_id
+        async with self._edit_lock:
+            # já está na lista padrão: nada muda, o servidor continua sem lista própria
+            exists = self._is_default(gid) and word in DEFAULT_BLOCKED
+            if not exists:
+                async with adb() as s:
+                    words = await self._ensure_guild_list(s, gid)
+                    exists = word in words
+                    if not exists:
+                        s.add(ProfanityWord(guild_id=str(gid), word=word, added_by=str(interaction.user.id)))
+                if not exists:
+                    words.append(word)
+                self._set_guild_words(gid, words)
+        if exists:
+            return await interaction.response.send_message(f"ℹ️ `{word}` já está na lista.", ephemeral=True)
+        words = self.guild_words[gid]
+        await interaction.response.send_message(f"✅ `{word}` adicionada à lista ({len(words)} palavras).", ephemeral=True)
+
+    @palavras.command(name="remover", description="Remove uma palavra/frase proibida")
+    @app_commands.describe(palavra="Palavra ou frase a liberar")
+    async def palavras_remover(self, interaction: discord.Interaction, palavra: str):
+        word = palavra.strip().lower()
+        gid = interaction.guild_id
+        async with self._edit_lock:
+            # fora da lista padrão: nada a remover, e o servidor não vira personalizado
+            missing = self._is_default(gid) and word not in DEFAULT_BLOCKED
+            if not missing:
+                async with adb() as s:
+                    words = await self._ensure_guild_list(s, gid)
+                    missing = word not in words
+                    if not missing:
+                        await s.execute(delete(ProfanityWord).filter_by(guild_id=str(gid), word=word))
+                if not missing:
+                    words.remove(word)
+                self._set_guild_words(gid, words)
+        if missing:
+            return await interaction.response.send_message(f"ℹ️ `{word}` não está na lista.", ephemeral=True)
+        words = self.guild_words[gid]
+        await interaction.response.send_message(f"✅ `{word}` removida da lista ({len(words)} palavras).", ephemeral=True)
+
+    @palavras.command(name="listar", description="Mostra as palavras proibidas deste servidor")
+    async def palavras_listar(self, interaction: discord.Interaction):
+        words = self.guild_words.get(interaction.guild_id, DEFAULT_BLOCKED)
+        desc = ", ".join(f"`{w}`" for w in sorted(words)) or "Nenhuma palavra bloqueada."
+        embed = discord.Embed(
+            title="🚫 Palavras Proibidas",
+            description=desc[:4000],
+            color=discord.Color.orange()
+        )
+        embed.set_footer(text=f"{len(words)} palavras"
+                              + ("" if interaction.guild_id in self.guild_words else " • lista padrão"))
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    async def handle_message(self, message: discord.Message):
+        # bots e DMs já são filtrados pela rota; ignora administradores
         if message.author.guild_permissions.administrator:
-            return await self.bot.process_commands(message)
+            return
 
         guild_id = str(message.guild.id)
         user_id = str(message.author.id)
 
-        for patt in self.patterns:
-            m = patt.search(message.content)
-            if not m:
-                continue
-
-            bad = m.group(0)
+        # fold() preserva o comprimento: offsets no texto dobrado valem no original
+        content = message.content
+        matches = list(self.matcher_for(message.guild.id).finditer(fold(content)))
+        if matches:
+            # todas as ocorrências (como o usuário escreveu), sem repetir
+            bad = "`, `".join(dict.fromkeys(content[m.start:m.end] for m in matches))
             try:
                 await message.delete()
             except discord.Forbidden:
                 return
 
             # contabiliza aviso
-            guild_warns = self.warns.setdefault(guild_id, {})
-            count = guild_warns.get(user_id, 0) + 1
-            guild_warns[user_id] = count
-            self.save_state()
+            count = self.store.incr(guild_id, user_id)
 
             # cria embed persistente
             now = datetime.now(timezone.utc)
@@ -122,13 +347,7 @@ class ProfanityCog(commands.Cog):
 
                 await message.channel.send(embed=ban_embed)
                 # reset contador
-                guild_warns.pop(user_id, None)
-                self.save_state()
-
-            return
-
-        # processa outros comandos normalmente
-        await self.bot.process_commands(message)
+                self.store.reset(guild_id, user_id)
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(ProfanityCog(bot))
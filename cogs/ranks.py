@@ -1,13 +1,23 @@
 # cogs/ranks_cog.py
-import re, asyncio, functools, discord
+import re, asyncio, functools, hashlib, discord
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Tuple, Dict
 from discord.ext import commands
 from discord import app_commands
+from sqlalchemy import and_, delete, func, select
+
+from db import adb, upsert, RankAlert, RankMonitorConfig, RankSeed, RankSnapshot
+from utils.debounce import Debouncer
 
 # ---------- CONFIG ----------
+# padrão usado só para criar o primeiro monitor, uma única vez (marca em rank_seeds);
+# os demais são configurados com /rank_monitor_add
 LIMIT_PER_CLAN = 6500
 CHANNEL_ID = 1367957693809033267          # canal onde o ranking aparece e onde o aviso ficará
-CHECK_DELAY = 2                           # espera após edições
+CHECK_DELAY = 2                           # silêncio após a última edição antes de processar
+CHECK_MAX_DELAY = 10                      # edições sem parar: processa no máximo a cada N s
+TREND_MIN_HOURS = 6                       # histórico mínimo para calcular crescimento
+WARN_DAYS = 7                             # projeção: destaca quem passa do limite antes disso
 # -----------------------------
 
 LINE_RE = re.compile(r"\s*(\d+)\s+(.+?)\s+([0-9]{1,3}(?:[.,][0-9]{3})*)\s*$")
@@ -23,134 +33,472 @@ def parse_line(line: str) -> Optional[Tuple[str, int]]:
     return guild, blocks
 
 
+class Monitor:
+    """Um canal de ranking monitorado: limite, destino do alerta e estado próprio."""
+    __slots__ = ("channel_id", "guild_id", "limit", "alert_channel_id",
+                 "exceeded", "alert_id", "last_blocks", "last_digest", "route")
+
+    def __init__(self, config: RankMonitorConfig):
+        self.channel_id = int(config.channel_id)
+        self.guild_id = int(config.guild_id)
+        self.limit = config.limit_per_clan
+        self.alert_channel_id = int(config.alert_channel_id) if config.alert_channel_id else None
+        self.exceeded: Dict[str, int] = {}        # guild -> blocos atuais
+        self.alert_id: Optional[int] = None       # embed de alerta (persistido em RankAlert)
+        self.last_blocks: Dict[str, int] = {}     # último total gravado por clã
+        self.last_digest: Optional[bytes] = None  # hash do último texto processado
+        self.route = None
+
+
 class RanksCog(commands.Cog):
-    """Mantém um único embed de alerta, atualizando quando o ranking mudar."""
+    """Mantém um embed de alerta por canal monitorado, atualizando quando o ranking mudar."""
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.exceeded: Dict[str, int] = {}          # guild -> blocos atuais
-        self.embed_message: Optional[discord.Message] = None
+        self.monitors: Dict[int, Monitor] = {}    # channel_id -> Monitor (consulta O(1) nos listeners)
+        # rajadas de edições da mesma mensagem viram um só processamento
+        self.edits = Debouncer(CHECK_DELAY, self._process_edit, max_delay=CHECK_MAX_DELAY)
+        self.parses = 0
+        self.parses_skipped = 0
+
+    async def cog_load(self):
+        async with adb() as s:
+            configs = list(await s.scalars(select(RankMonitorConfig)))
+            alerts = {a.channel_id: int(a.message_id) for a in await s.scalars(select(RankAlert))}
+            seeded = bool(CHANNEL_ID) and await s.scalar(
+                select(RankSeed.id).filter_by(channel_id=str(CHANNEL_ID))) is not None
+        for config in configs:
+            monitor = self._add_monitor(config)
+            monitor.alert_id = alerts.get(config.channel_id)
+            monitor.last_blocks = {c: b for c, (b, _) in (await self._clan_values(monitor.channel_id)).items()}
+            # sem isso o alerta persistido nunca sairia se ninguém mais passar do limite
+            monitor.exceeded = {g: b for g, b in monitor.last_blocks.items() if b > monitor.limit}
+        if CHANNEL_ID and not seeded:
+            if configs:
+                await self._mark_seeded()                 # instalação anterior à marca: já semeada
+            else:
+                asyncio.create_task(self._seed_default())
+
+    async def cog_unload(self):
+        for monitor in self.monitors.values():
+            self.bot.router.unregister(monitor.route)
+        self.edits.cancel()
+
+    async def _seed_default(self):
+        """Primeira execução: vira monitor o canal/limite que antes eram fixos no código."""
+        await self.bot.wait_until_ready()
+        channel = self.bot.get_channel(CHANNEL_ID)
+        if not isinstance(channel, discord.TextChannel):
+            return
+        await self._save_monitor(channel.guild.id, CHANNEL_ID, LIMIT_PER_CLAN, None)
+        await self._mark_seeded()
+
+    @staticmethod
+    async def _mark_seeded():
+        # tabela de monitores vazia depois disso = nada monitorado, não "semeie de novo"
+        async with adb() as s:
+            await s.run_sync(upsert, RankSeed, [{"channel_id": str(CHANNEL_ID)}], ["channel_id"], [])
+
+    def _add_monitor(self, config: RankMonitorConfig) -> Monitor:
+        monitor = Monitor(config)
+        old = self.monitors.get(monitor.channel_id)
+        if old is not None:
+            self.bot.router.unregister(old.route)
+        self.monitors[monitor.channel_id] = monitor
+        # só mensagens de bot nos canais de ranking chegam aqui
+        monitor.route = self.bot.router.register(
+            self.handle_message,
+            channel_id=monitor.channel_id,
+            predicate=self._from_ranking_bot,
+            name="ranks",
+        )
+        return monitor
+
+    def _from_ranking_bot(self, msg: discord.Message) -> bool:
+        """Outro bot; o nosso próprio alerta (postado no mesmo canal) não é ranking."""
+        me = self.bot.user
+        return msg.author.bot and (me is None or msg.author.id != me.id)
 
     # ---------- LISTENERS ----------
-    @commands.Cog.listener()
-    async def on_message(self, msg: discord.Message):
-        if msg.author.bot and msg.channel.id == CHANNEL_ID:
-            await self._process(msg.content, msg.channel)
+    async def handle_message(self, msg: discord.Message):
+        monitor = self.monitors.get(msg.channel.id)
+        if monitor:
+            await self._process(monitor, msg.content, msg.channel)
 
     @commands.Cog.listener()
     async def on_message_edit(self, _b: discord.Message, after: discord.Message):
-        if after.author.bot and after.channel.id == CHANNEL_ID:
-            await asyncio.sleep(CHECK_DELAY)
-            await self._process(after.content, after.channel)
+        if after.channel.id in self.monitors and self._from_ranking_bot(after):
+            self.edits.push(after.id, (after.content, after.channel))
+
+    async def _process_edit(self, _msg_id: int, latest: tuple):
+        content, channel = latest
+        monitor = self.monitors.get(channel.id)
+        if monitor:                                   # pode ter sido removido na espera
+            await self._process(monitor, content, channel)
 
     # ---------- COMMANDS ----------
     @app_commands.command(
         name="scanrank",
         description="Analisa o ranking; passe o ID da mensagem opcionalmente."
     )
-    @app_commands.describe(msg_id="ID da mensagem com o ranking")
-    async def scanrank_slash(self, itx: discord.Interaction, msg_id: str | None = None):
+    @app_commands.describe(msg_id="ID da mensagem com o ranking", canal="Canal monitorado (se houver mais de um)")
+    async def scanrank_slash(self, itx: discord.Interaction, msg_id: str | None = None,
+                             canal: discord.TextChannel | None = None):
         await itx.response.defer(thinking=True, ephemeral=True)
-        ch = self._get_channel(itx)
+        monitor = self._get_monitor(itx.guild_id, canal or itx.channel)
+        ch = monitor and self.bot.get_channel(monitor.channel_id)
         if not ch:
             await itx.followup.send("Canal não encontrado.", ephemeral=True)
             return
-        ok = await self._manual_scan(ch, msg_id)
+        ok = await self._manual_scan(monitor, ch, msg_id)
         await itx.followup.send(
             "Ranking processado." if ok else "Ranking não encontrado.", ephemeral=True
         )
 
     @commands.command(name="scanrank", help="Analisa o ranking; opcionalmente passe o ID.")
     async def scanrank_prefix(self, ctx: commands.Context, msg_id: str | None = None):
-        ch = self._get_channel(ctx)
+        monitor = self._get_monitor(ctx.guild.id if ctx.guild else None, ctx.channel)
+        ch = monitor and self.bot.get_channel(monitor.channel_id)
         if not ch:
             await ctx.send("Canal não encontrado."); return
-        ok = await self._manual_scan(ch, msg_id)
+        ok = await self._manual_scan(monitor, ch, msg_id)
         if ok:
             await ctx.message.add_reaction("✅")
         else:
             await ctx.send("Ranking não encontrado.")
 
+    @app_commands.command(name="rank_monitor_add", description="Monitora um canal de ranking com limite próprio.")
+    @app_commands.default_permissions(manage_guild=True)
+    @app_commands.describe(canal="Canal onde o bot de ranking publica", limite="Limite de blocos por clã",
+                           canal_alerta="Onde postar o alerta (padrão: o próprio canal)")
+    async def rank_monitor_add(self, itx: discord.Interaction, canal: discord.TextChannel,
+                               limite: app_commands.Range[int, 1], canal_alerta: discord.TextChannel | None = None):
+        await itx.response.defer(thinking=True, ephemeral=True)
+        await self._save_monitor(itx.guild_id, canal.id, limite, canal_alerta.id if canal_alerta else None)
+        destino = canal_alerta or canal
+        await itx.followup.send(
+            f"✅ Monitorando {canal.mention} (limite **{limite:,}**). Alertas em {destino.mention}.", ephemeral=True
+        )
+
+    @app_commands.command(name="rank_monitor_remove", description="Para de monitorar um canal de ranking.")
+    @app_commands.default_permissions(manage_guild=True)
+    async def rank_monitor_remove(self, itx: discord.Interaction, canal: discord.TextChannel):
+        await itx.response.defer(thinking=True, ephemeral=True)
+        monitor = self.monitors.get(canal.id)
+        if not monitor or monitor.guild_id != itx.guild_id:
+            await itx.followup.send("Esse canal não é monitorado.", ephemeral=True)
+            return
+        await self._remove_monitor(monitor)
+        await itx.followup.send(f"✅ {canal.mention} não é mais monitorado (o histórico foi mantido).", ephemeral=True)
+
+    @app_commands.command(name="rank_monitor_list", description="Lista os canais de ranking monitorados.")
+    @app_commands.default_permissions(manage_guild=True)
+    async def rank_monitor_list(self, itx: discord.Interaction):
+        monitors = [m for m in self.monitors.values() if m.guild_id == itx.guild_id]
+        if not monitors:
+            await itx.response.send_message("Nenhum canal monitorado. Use /rank_monitor_add.", ephemeral=True)
+            return
+        emb = discord.Embed(title="📋 Monitores de ranking", colour=0x1E88E5)
+        for m in monitors:
+            alert = f"<#{m.alert_channel_id}>" if m.alert_channel_id else "mesmo canal"
+            emb.add_field(
+                name=f"#{getattr(self.bot.get_channel(m.channel_id), 'name', m.channel_id)}",
+                value=f"Limite: **{m.limit:,}** • Alerta: {alert} • Acima: **{len(m.exceeded)}**",
+                inline=False,
+            )
+        emb.set_footer(text="Anarquia Z • Monitor")
+        await itx.response.send_message(embed=emb, ephemeral=True)
+
+    @app_commands.command(name="rank_growth", description="Crescimento de blocos de um clã e previsão até o limite.")
+    @app_commands.describe(cla="Nome do clã como aparece no ranking", dias="Janela em dias (padrão 7)",
+                           canal="Canal monitorado (se houver mais de um)")
+    async def rank_growth(self, itx: discord.Interaction, cla: str, dias: app_commands.Range[int, 1, 90] = 7,
+                          canal: discord.TextChannel | None = None):
+        await itx.response.defer(thinking=True)
+        monitor = self._get_monitor(itx.guild_id, canal or itx.channel)
+        if not monitor:
+            await itx.followup.send("Nenhum canal de ranking monitorado aqui; informe o canal.")
+            return
+        # aceita o nome sem diferenciar maiúsculas
+        name = next((c for c in monitor.last_blocks if c.lower() == cla.lower()), cla)
+        t = (await self._trends(monitor, dias, clan=name)).get(name)
+        if not t:
+            await itx.followup.send(f"Sem histórico para **{cla}**.")
+            return
+        rate = "—" if t["rate"] is None else f"{t['rate']:+,.0f} blocos/dia"
+        emb = discord.Embed(title=f"📈 {name}", colour=0x1E88E5)
+        emb.add_field(name="Total atual", value=f"**{t['blocks']:,}** / {monitor.limit:,}", inline=True)
+        emb.add_field(name=f"Crescimento ({dias}d)", value=f"**{rate}**", inline=True)
+        emb.add_field(name="Chega ao limite", value=self._fmt_eta(monitor, t), inline=False)
+        emb.set_footer(text="Anarquia Z • Monitor")
+        await itx.followup.send(embed=emb)
+
+    @app_commands.command(name="rank_projection", description="Clãs que devem passar do limite de blocos em breve.")
+    @app_commands.describe(dias="Janela usada para medir o crescimento (padrão 7)",
+                           canal="Canal monitorado (se houver mais de um)")
+    async def rank_projection(self, itx: discord.Interaction, dias: app_commands.Range[int, 1, 90] = 7,
+                              canal: discord.TextChannel | None = None):
+        await itx.response.defer(thinking=True)
+        monitor = self._get_monitor(itx.guild_id, canal or itx.channel)
+        if not monitor:
+            await itx.followup.send("Nenhum canal de ranking monitorado aqui; informe o canal.")
+            return
+        trends = await self._trends(monitor, dias)
+        # só quem está no ranking atual e ainda abaixo do limite, crescendo
+        rising = sorted(
+            ((c, t) for c, t in trends.items()
+             if c in monitor.last_blocks and t["eta"] is not None),
+            key=lambda x: x[1]["eta"],
+        )
+        if not rising:
+            await itx.followup.send("Nenhum clã abaixo do limite está crescendo na janela informada.")
+            return
+        soon = datetime.utcnow() + timedelta(days=WARN_DAYS)
+        emb = discord.Embed(
+            title="⏳ Previsão de clãs chegando ao limite",
+            colour=0xFB8C00,
+            description=f"Limite: **{monitor.limit:,}** blocos • crescimento medido em {dias}d",
+        )
+        for c, t in rising[:15]:
+            flag = "⚠️ " if t["eta"] <= soon else ""
+            emb.add_field(
+                name=f"{flag}{c}",
+                value=f"**{t['blocks']:,}** ({t['rate']:+,.0f}/dia) • limite {self._fmt_eta(monitor, t)}",
+                inline=False,
+            )
+        emb.set_footer(text=f"⚠️ = previsto para os próximos {WARN_DAYS} dias • Anarquia Z • Monitor")
+        await itx.followup.send(embed=emb)
+
     # ---------- CORE ----------
-    async def _manual_scan(self, ch: discord.TextChannel, msg_id: str | None) -> bool:
+    async def _manual_scan(self, monitor: Monitor, ch: discord.TextChannel, msg_id: str | None) -> bool:
         """Retorna True se achou ranking e processou."""
         if msg_id and msg_id.isdigit():
             try:
                 msg = await ch.fetch_message(int(msg_id))
-                await self._process(msg.content, ch)
+                await self._process(monitor, msg.content, ch, force=True)
                 return True
             except discord.NotFound:
                 return False
 
         async for msg in ch.history(limit=50):
             if "Guilda" in msg.content and "Estruturas" in msg.content:
-                await self._process(msg.content, ch)
+                await self._process(monitor, msg.content, ch, force=True)
                 return True
         return False
 
-    async def _process(self, text: str, channel: discord.TextChannel):
+    async def _process(self, monitor: Monitor, text: str, channel: discord.TextChannel, force: bool = False):
         text = text.strip("`\n")                      # remove ``` se presente
+        # mesmo texto do último processamento: o resultado seria o mesmo
+        digest = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        if digest == monitor.last_digest and not force:
+            self.parses_skipped += 1
+            return
+        self.parses += 1
         current: Dict[str, int] = {}
         for line in filter(None, text.split("\n")):
             parsed = parse_line(line)
             if parsed:
                 g, b = parsed
                 current[g] = b
+        if not current:                               # não é um ranking: não mexe no último digest
+            return
+        monitor.last_digest = digest
+        await self._record(monitor, current)
 
         changed = False
         for g, b in current.items():
-            if b > LIMIT_PER_CLAN:
-                if self.exceeded.get(g) != b:
-                    self.exceeded[g] = b
+            if b > monitor.limit:
+                if monitor.exceeded.get(g) != b:
+                    monitor.exceeded[g] = b
                     changed = True
             else:
-                if g in self.exceeded:
-                    del self.exceeded[g]
+                if g in monitor.exceeded:
+                    del monitor.exceeded[g]
                     changed = True
 
-        for g in list(self.exceeded):
+        for g in list(monitor.exceeded):
             if g not in current:                      # saiu do ranking
-                del self.exceeded[g]
+                del monitor.exceeded[g]
                 changed = True
 
-        if changed:
-            await self._update_embed(channel)
+        # alerta órfão (ninguém acima, mas a mensagem ficou): remove de uma vez
+        if changed or force or (monitor.alert_id and not monitor.exceeded):
+            await self._update_embed(monitor, channel)
+
+    def _alert_channel(self, monitor: Monitor, channel: discord.TextChannel) -> discord.TextChannel:
+        if monitor.alert_channel_id:
+            target = self.bot.get_channel(monitor.alert_channel_id)
+            if isinstance(target, discord.TextChannel):
+                return target
+        return channel
 
-    async def _update_embed(self, channel: discord.TextChannel):
-        if not self.exceeded:                         # ninguém acima -> remove embed
-            if self.embed_message:
+    async def _update_embed(self, monitor: Monitor, channel: discord.TextChannel):
+        target = self._alert_channel(monitor, channel)
+        if not monitor.exceeded:                      # ninguém acima -> remove embed
+            if monitor.alert_id:
                 try:
-                    await self.embed_message.delete()
+                    await target.get_partial_message(monitor.alert_id).delete()
                 except discord.NotFound:
                     pass
-                self.embed_message = None
+                await self._set_alert(monitor, None)
             return
 
         emb = discord.Embed(
             title="🚨 Clãs acima do limite de blocos!",
             colour=0xE53935,
-            description=f"Limite: **{LIMIT_PER_CLAN:,}** blocos",
+            description=f"Limite: **{monitor.limit:,}** blocos",
         )
-        for g, b in sorted(self.exceeded.items(), key=lambda x: (-x[1], x[0])):
+        if target.id != channel.id:
+            emb.description += f" • Ranking: {channel.mention}"
+        for g, b in sorted(monitor.exceeded.items(), key=lambda x: (-x[1], x[0])):
             emb.add_field(
                 name=g,
-                value=f"Total: **{b:,}**\nExcesso: **{b - LIMIT_PER_CLAN:,}** 🔴",
+                value=f"Total: **{b:,}**\nExcesso: **{b - monitor.limit:,}** 🔴",
                 inline=False,
             )
         emb.set_footer(text="Anarquia Z • Monitor")
 
-        if self.embed_message:
+        if monitor.alert_id:
             try:
-                await self.embed_message.edit(embed=emb)
+                await target.get_partial_message(monitor.alert_id).edit(embed=emb)
+                return
             except discord.NotFound:
-                self.embed_message = await channel.send(embed=emb)
+                pass
+        msg = await target.send(embed=emb)
+        await self._set_alert(monitor, msg.id)
+
+    # ---------- CONFIG ----------
+    async def _save_monitor(self, guild_id: int, channel_id: int, limit: int, alert_channel_id: Optional[int]):
+        old = self.monitors.get(channel_id)
+        async with adb() as s:
+            await s.run_sync(upsert, RankMonitorConfig, [{
+                "guild_id": str(guild_id), "channel_id": str(channel_id), "limit_per_clan": limit,
+                "alert_channel_id": str(alert_channel_id) if alert_channel_id else None,
+                "updated_at": datetime.utcnow(),
+            }], ["channel_id"], ["guild_id", "limit_per_clan", "alert_channel_id", "updated_at"])
+            config = await s.scalar(select(RankMonitorConfig).filter_by(channel_id=str(channel_id)))
+        if old is not None and old.alert_channel_id != alert_channel_id and old.alert_id:
+            # alerta mudou de canal: apaga o antigo, o próximo sai no destino novo
+            channel = self.bot.get_channel(channel_id)
+            if channel:
+                try:
+                    await self._alert_channel(old, channel).get_partial_message(old.alert_id).delete()
+                except discord.HTTPException:
+                    pass
+            await self._set_alert(old, None)
+        monitor = self._add_monitor(config)
+        if old is not None:
+            monitor.alert_id, monitor.last_digest = old.alert_id, old.last_digest
+            monitor.last_blocks = old.last_blocks
         else:
-            self.embed_message = await channel.send(embed=emb)
+            async with adb() as s:
+                alert = await s.scalar(select(RankAlert).filter_by(channel_id=str(channel_id)))
+            monitor.alert_id = int(alert.message_id) if alert else None
+            monitor.last_blocks = {c: b for c, (b, _) in (await self._clan_values(channel_id)).items()}
+        # limite novo vale já para o último ranking conhecido
+        monitor.exceeded = {g: b for g, b in monitor.last_blocks.items() if b > monitor.limit}
+        channel = self.bot.get_channel(channel_id)
+        if isinstance(channel, discord.TextChannel) and (monitor.exceeded or monitor.alert_id):
+            await self._update_embed(monitor, channel)
+
+    async def _remove_monitor(self, monitor: Monitor):
+        self.bot.router.unregister(monitor.route)
+        self.monitors.pop(monitor.channel_id, None)
+        channel = self.bot.get_channel(monitor.channel_id)
+        if monitor.alert_id and channel:
+            try:
+                await self._alert_channel(monitor, channel).get_partial_message(monitor.alert_id).delete()
+            except discord.HTTPException:
+                pass
+        async with adb() as s:
+            await s.execute(delete(RankMonitorConfig).filter_by(channel_id=str(monitor.channel_id)))
+            await s.execute(delete(RankAlert).filter_by(channel_id=str(monitor.channel_id)))
+
+    # ---------- HISTÓRICO ----------
+    async def _record(self, monitor: Monitor, current: Dict[str, int]):
+        """Grava só os clãs cujo total mudou desde o último ranking."""
+        now = datetime.utcnow()
+        rows = [RankSnapshot(channel_id=str(monitor.channel_id), clan=g, blocks=b, ts=now)
+                for g, b in current.items() if monitor.last_blocks.get(g) != b]
+        monitor.last_blocks = dict(current)
+        if not rows:
+            return
+        try:
+            async with adb() as s:
+                s.add_all(rows)
+        except Exception as e:
+            print(f"[ERROR] Erro ao gravar histórico do ranking: {repr(e)}")
+
+    async def _set_alert(self, monitor: Monitor, message_id: Optional[int]):
+        """Persiste o ID do embed de alerta: após reiniciar, edita em vez de duplicar."""
+        monitor.alert_id = message_id
+        channel_id = str(monitor.channel_id)
+        async with adb() as s:
+            if message_id is None:
+                await s.execute(delete(RankAlert).filter_by(channel_id=channel_id))
+            else:
+                await s.run_sync(upsert, RankAlert, [{"channel_id": channel_id, "message_id": str(message_id)}],
+                                 ["channel_id"], ["message_id"])
+
+    @staticmethod
+    async def _clan_values(channel_id: int, at: Optional[datetime] = None, first_after: bool = False,
+                           clan: Optional[str] = None) -> Dict[str, Tuple[int, datetime]]:
+        """
+        (blocos, ts) de cada clã: a última linha com ts <= ``at`` (ou a mais recente),
+        ou, com ``first_after``, a primeira linha depois de ``at``. Usa o índice
+        (channel_id, clan, ts).
+        """
+        cond = [RankSnapshot.channel_id == str(channel_id)]
+        if clan is not None:
+            cond.append(RankSnapshot.clan == clan)
+        if at is not None:
+            cond.append(RankSnapshot.ts > at if first_after else RankSnapshot.ts <= at)
+        agg = func.min if first_after else func.max
+        sub = (select(RankSnapshot.clan, agg(RankSnapshot.ts).label("ts"))
+               .where(*cond).group_by(RankSnapshot.clan).subquery())
+        q = (select(RankSnapshot.clan, RankSnapshot.blocks, RankSnapshot.ts)
+             .join(sub, and_(RankSnapshot.clan == sub.c.clan, RankSnapshot.ts == sub.c.ts))
+             .where(RankSnapshot.channel_id == str(channel_id)))
+        async with adb() as s:
+            return {c: (b, ts) for c, b, ts in await s.execute(q)}
+
+    async def _trends(self, monitor: Monitor, days: int, clan: Optional[str] = None) -> Dict[str, dict]:
+        """Crescimento por dia na janela e previsão de quando cada clã chega ao limite."""
+        now = datetime.utcnow()
+        start = now - timedelta(days=days)
+        latest = await self._clan_values(monitor.channel_id, clan=clan)
+        base = await self._clan_values(monitor.channel_id, start, clan=clan)
+        first = await self._clan_values(monitor.channel_id, start, first_after=True, clan=clan)
+        out = {}
+        for c, (blocks, _) in latest.items():
+            # o valor vale até a próxima mudança: no início da janela é o último antes dela
+            begin, since = (base[c][0], start) if c in base else first[c]
+            elapsed = (now - since).total_seconds() / 86400
+            rate = (blocks - begin) / elapsed if elapsed * 24 >= TREND_MIN_HOURS else None
+            eta = None
+            if rate and rate > 0 and blocks <= monitor.limit:
+                eta = now + timedelta(days=(monitor.limit - blocks) / rate)
+            out[c] = {"blocks": blocks, "rate": rate, "since": since, "eta": eta}
+        return out
+
+    @staticmethod
+    def _fmt_eta(monitor: Monitor, t: dict) -> str:
+        if t["blocks"] > monitor.limit:
+            return "🔴 já acima do limite"
+        if t["rate"] is None:
+            return "histórico insuficiente"
+        if t["eta"] is None:
+            return "sem crescimento"
+        return f"<t:{int(t['eta'].replace(tzinfo=timezone.utc).timestamp())}:R>"
 
     # ---------- helpers ----------
-    def _get_channel(self, ctx_or_itx) -> Optional[discord.TextChannel]:
-        ch = self.bot.get_channel(CHANNEL_ID)
-        return ch if isinstance(ch, discord.TextChannel) else None
+    def _get_monitor(self, guild_id: Optional[int], channel) -> Optional[Monitor]:
+        """O canal informado/atual se for monitorado; senão o único monitor da guild."""
+        monitor = self.monitors.get(getattr(channel, "id", None))
+        if monitor and monitor.guild_id == guild_id:
+            return monitor
+        in_guild = [m for m in self.monitors.values() if m.guild_id == guild_id]
+        return in_guild[0] if len(in_guild) == 1 else None
 
 
 async def setup(bot: commands.Bot):
@@ -6,7 +6,6 @@ import re
 import discord
 from discord.ext import commands
 from discord import app_commands
-import asyncio
 from datetime import datetime
 
 CONFIG_PATH = "configs/recruitment_config.json"
@@ -28,6 +27,27 @@ class RecruitmentCog(commands.Cog):
                 self.config = json.load(f)
         else:
             self.config = {}
+        self.routes = {}  # guild_id -> rota do canal de recrutamento
+
+    async def cog_load(self):
+        for guild_id, channel_id in self.config.items():
+            self._route_channel(int(guild_id), channel_id)
+
+    async def cog_unload(self):
+        for route in self.routes.values():
+            self.bot.router.unregister(route)
+        self.routes.clear()
+
+    def _route_channel(self, guild_id: int, channel_id: int):
+        """(Re)inscreve o canal de recrutamento do servidor no roteador."""
+        self.bot.router.unregister(self.routes.pop(guild_id, None))
+        self.routes[guild_id] = self.bot.router.register(
+            self.handle_message,
+            guild_id=guild_id,
+            channel_id=channel_id,
+            predicate=lambda m: not m.author.bot,
+            name="recrutamento",
+        )
 
     def save_config(self):
         with open(CONFIG_PATH, "w", encoding="utf-8") as f:
@@ -44,22 +64,15 @@ class RecruitmentCog(commands.Cog):
 
         self.config[str(interaction.guild_id)] = channel.id
         self.save_config()
+        self._route_channel(interaction.guild_id, channel.id)
 
         await interaction.response.send_message(
             f"✅ Canal de recrutamento definido: {channel.mention}",
             ephemeral=True
         )
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        if message.author.bot or message.guild is None:
-            return
-
-        guild_id = str(message.guild.id)
-        channel_id = self.config.get(guild_id)
-        if message.channel.id != channel_id:
-            return
-
+    async def handle_message(self, message: discord.Message):
+        # o roteador só entrega mensagens do canal configurado, de não-bots
         content = message.content.strip()
         match = PATTERN.match(content)
 
@@ -88,7 +101,7 @@ class RecruitmentCog(commands.Cog):
             embed.set_footer(text="Tutorial de Recrutamento • Será apagado em 30s")
 
             tip = await message.channel.send(embed=embed)
-            asyncio.create_task(self._delete_after(tip, 30))
+            await self.bot.deleter.delete_later(tip, 30)
             return
 
         # Formato correto: extrai dados
@@ -122,12 +135,5 @@ class RecruitmentCog(commands.Cog):
         await post.add_reaction("✅")
         await post.add_reaction("❌")
 
-    async def _delete_after(self, message: discord.Message, delay: int):
-        await asyncio.sleep(delay)
-        try:
-            await message.delete()
-        except:
-            pass
-
 async def setup(bot: commands.Bot):
     await bot.add_cog(RecruitmentCog(bot))
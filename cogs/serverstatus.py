@@ -1,154 +1,592 @@
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord import app_commands
 from discord.errors import NotFound
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, delete, select
 import asyncio
-import aiohttp
-from datetime import datetime
-
-from db import SessionLocal, ServerStatusConfig
-
-async def get_message(channel: discord.TextChannel, message_id: int):
-    """
-    Tenta recuperar a mensagem via fetch_message.
-    Se não encontrar, percorre o histórico do canal.
-    """
-    try:
-        return await channel.fetch_message(message_id)
-    except NotFound:
-        async for msg in channel.history(limit=100):
-            if msg.id == message_id:
-                return msg
-        raise NotFound(f"Mensagem {message_id} não encontrada no histórico.")
+import heapq
+import ipaddress
+import itertools
+import os
+import random
+import socket
+import time
+from datetime import datetime, timedelta, timezone
+
+from db import adb, upsert, ServerStatusBackend, ServerStatusConfig, ServerStatusRollup, ServerStatusSample
+from utils import crypto
+from utils.cache import TTLCache
+from utils.sdtd_console import ConsoleError, ConsolePool
+from utils.timeseries import PERIODS, Bucket, bucket_start, peak_hours, series, sparkline
+
+class EmptyAPIResponse(Exception):
+    """A API respondeu, mas sem dados do servidor."""
+
+class PollEntry:
+    """Estado de agendamento de uma config: intervalo atual e entrada válida no heap."""
+    __slots__ = ("config", "interval", "due", "seq")
+
+    def __init__(self, config: ServerStatusConfig, interval: float):
+        self.config = config
+        self.interval = interval
+        self.due = 0.0
+        self.seq = 0
 
 class ServerStatusCog(commands.Cog):
+    API_URL = "https://7daystodie-servers.com/api/"
+    # consultas simultâneas do agendador
+    CONCURRENCY = int(os.getenv("SERVERSTATUS_CONCURRENCY", 5))
+    # agendamento adaptativo por servidor (s): cai para MIN logo após online<->offline,
+    # volta a BASE quando os dados mudam e cresce BACKOFF× enquanto nada muda
+    POLL_MIN      = int(os.getenv("SERVERSTATUS_POLL_MIN", 60))
+    POLL_BASE     = int(os.getenv("SERVERSTATUS_POLL_BASE", 5 * 60))
+    POLL_STABLE   = int(os.getenv("SERVERSTATUS_POLL_STABLE", 15 * 60))   # teto online e estável
+    POLL_OFFLINE  = int(os.getenv("SERVERSTATUS_POLL_OFFLINE", 30 * 60))  # teto offline há tempo
+    POLL_BACKOFF  = 1.5
+    POLL_JITTER   = 0.1   # ±10% para não sincronizar as consultas
+    # IDs de mensagens recriadas (404) são gravados juntos, após este atraso (s)
+    MESSAGE_ID_FLUSH_DELAY = 5
+    # resultados da API por server_key: guilds com a mesma key dividem a consulta;
+    # se a API falhar, dados com até CACHE_TTL + STALE_TTL segundos são reaproveitados
+    CACHE_TTL = int(os.getenv("SERVERSTATUS_CACHE_TTL", 60))
+    STALE_TTL = int(os.getenv("SERVERSTATUS_STALE_TTL", 30 * 60))
+    # sem mudança nos dados, a mensagem só é reeditada após este tempo (s)
+    MAX_STALENESS = int(os.getenv("SERVERSTATUS_MAX_STALENESS", 60 * 60))
+    # backend telnet: jogadores ao vivo direto do console do servidor
+    CONSOLE_TIMEOUT = int(os.getenv("SERVERSTATUS_CONSOLE_TIMEOUT", 10))
+    LIVE_TTL        = int(os.getenv("SERVERSTATUS_LIVE_TTL", 15))
+    # histórico: amostras brutas e baldes por hora expiram; baldes diários ficam
+    RAW_RETENTION    = timedelta(days=int(os.getenv("SERVERSTATUS_RAW_DAYS", 7)))
+    HOURLY_RETENTION = timedelta(days=int(os.getenv("SERVERSTATUS_HOURLY_DAYS", 90)))
+    # fuso usado nos horários de pico (o banco guarda UTC)
+    UTC_OFFSET = int(os.getenv("SERVERSTATUS_UTC_OFFSET", -3))
+
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         # Guarda o último status (True = Online, False = Offline) para enviar alertas de mudança
         self.last_status = {}
-        self.status_task.start()
+        self.api_cache = TTLCache(self.CACHE_TTL, self.STALE_TTL)
+        # guild_id -> (fingerprint, quando os dados mudaram, monotonic da última edição)
+        self.fingerprints = {}
+        self.edits = 0
+        self.edits_skipped = 0
+        # guild_id (str) -> PartialMessage do painel: edita direto, sem fetch prévio
+        self.messages = {}
+        self._pending_ids = {}      # guild_id (str) -> novo message_id ainda não gravado
+        self._ids_flush = None
+        self.recreated = 0
+        # (server_key, período) -> Bucket corrente, espelho do que está no banco
+        self.buckets = {}
+        # guild_id (str) -> ServerStatusBackend; conexões telnet persistentes por servidor
+        self.backends = {}
+        self.consoles = ConsolePool(self.CONSOLE_TIMEOUT)
+        self.live_cache = TTLCache(self.LIVE_TTL)
+        # agendador: heap de (vencimento, seq, guild_id); entradas antigas são ignoradas pelo seq
+        self.entries = {}   # guild_id (str) -> PollEntry
+        self._heap = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self.polls = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    async def cog_load(self):
+        async with adb() as s:
+            self.backends = {b.guild_id: b for b in await s.scalars(select(ServerStatusBackend))}
+        self._scheduler_task = asyncio.create_task(self._scheduler())
+
+    async def cog_unload(self):
+        self._scheduler_task.cancel()
+        await self._flush_message_ids()
+        await self.consoles.close()
+
+    # ───── DB helpers (async: não travam o gateway) ─────
+    async def _load_configs(self) -> list:
+        async with adb() as s:
+            return list(await s.scalars(select(ServerStatusConfig)))
+
+    async def _get_config(self, guild_id: int):
+        async with adb() as s:
+            return await s.scalar(select(ServerStatusConfig).filter_by(guild_id=str(guild_id)))
+
+    async def _save_config(self, guild_id: int, server_key: str, channel_id: int, message_id: int):
+        async with adb() as s:
+            config = await s.scalar(select(ServerStatusConfig).filter_by(guild_id=str(guild_id)))
+            if not config:
+                config = ServerStatusConfig(guild_id=str(guild_id))
+                s.add(config)
+            config.server_key = server_key
+            config.channel_id = str(channel_id)
+            config.message_id = str(message_id)
+        self.fingerprints.pop(str(guild_id), None)  # mensagem nova: próxima consulta edita
+        self._schedule(config, self.POLL_MIN)
+
+    def _queue_message_id(self, guild_id: str, message_id: int):
+        """Agenda a gravação do novo message_id; recriações próximas viram um só UPDATE."""
+        self._pending_ids[guild_id] = str(message_id)
+        if self._ids_flush is None or self._ids_flush.done():
+            self._ids_flush = asyncio.create_task(self._flush_message_ids(self.MESSAGE_ID_FLUSH_DELAY))
+
+    async def _flush_message_ids(self, delay: float = 0):
+        if delay:
+            await asyncio.sleep(delay)
+        if not self._pending_ids:
+            return
+        rows = [{"b_gid": gid, "b_mid": mid} for gid, mid in self._pending_ids.items()]
+        self._pending_ids = {}
+        table = ServerStatusConfig.__table__
+        stmt = table.update().where(table.c.guild_id == bindparam("b_gid")).values(message_id=bindparam("b_mid"))
+        try:
+            async with adb() as s:
+                await s.execute(stmt, rows)   # executemany: um round trip para o lote
+        except Exception as e:
+            print(f"[ERROR] Erro ao gravar {len(rows)} IDs de mensagem: {repr(e)}")
+            for row in rows:
+                self._pending_ids.setdefault(row["b_gid"], row["b_mid"])
+
+    def _panel(self, channel: discord.TextChannel, config: ServerStatusConfig) -> discord.PartialMessage:
+        """Handle do painel da guild (cacheado enquanto canal e ID não mudarem)."""
+        handle = self.messages.get(config.guild_id)
+        if handle is None or handle.id != int(config.message_id) or handle.channel.id != channel.id:
+            handle = self.messages[config.guild_id] = channel.get_partial_message(int(config.message_id))
+        return handle
+
+    async def _delete_config(self, guild_id: int):
+        async with adb() as s:
+            await s.execute(delete(ServerStatusConfig).filter_by(guild_id=str(guild_id)))
+            await s.execute(delete(ServerStatusBackend).filter_by(guild_id=str(guild_id)))
+        await self._forget_backend(str(guild_id))
+        self.fingerprints.pop(str(guild_id), None)
+        self.messages.pop(str(guild_id), None)
+        self._pending_ids.pop(str(guild_id), None)
+        self.entries.pop(str(guild_id), None)  # o que sobrar no heap é descartado pelo seq
 
-    async def fetch_embed(self, server_key: str) -> discord.Embed:
+    async def _save_backend(self, guild_id: str, host: str, port: int, password: str):
+        async with adb() as s:
+            await s.run_sync(upsert, ServerStatusBackend, [{
+                "guild_id": guild_id, "kind": "telnet", "host": host, "port": port,
+                "password": crypto.encrypt(password), "updated_at": datetime.utcnow(),
+            }], ["guild_id"], ["kind", "host", "port", "password", "updated_at"])
+            self.backends[guild_id] = await s.scalar(select(ServerStatusBackend).filter_by(guild_id=guild_id))
+
+    async def _delete_backend(self, guild_id: str):
+        async with adb() as s:
+            await s.execute(delete(ServerStatusBackend).filter_by(guild_id=guild_id))
+        await self._forget_backend(guild_id)
+
+    async def _forget_backend(self, guild_id: str):
+        """Tira o backend do cache e fecha a conexão se nenhuma outra guild a usa."""
+        backend = self.backends.pop(guild_id, None)
+        if backend is None:
+            return
+        if not any((b.host, b.port) == (backend.host, backend.port) for b in self.backends.values()):
+            await self.consoles.discard(backend.host, backend.port)
+
+    # ───── coleta ─────
+    async def fetch_status(self, server_key: str, backend: ServerStatusBackend = None) -> dict:
         """
-        Consulta a API do 7DTD para obter os dados do servidor e constrói um embed formatado.
-        Em caso de erro, retorna um embed de erro.
+        Dados da API de listagem; com backend telnet, jogadores e status vêm
+        ao vivo do console (a API atrasa minutos). Se uma das fontes falhar,
+        usa a outra.
         """
-        headers = {"Accept": "application/json"}
-        detail_url = f"https://7daystodie-servers.com/api/?object=servers&element=detail&key={server_key}&format=json"
-        votes_url = f"https://7daystodie-servers.com/api/?object=servers&element=votes&key={server_key}&format=json"
-        voters_url = f"https://7daystodie-servers.com/api/?object=servers&element=voters&key={server_key}&month=current&format=json"
+        if backend is None:
+            return await self.fetch_data(server_key)
+        api, live = await asyncio.gather(self.fetch_data(server_key), self.fetch_live(backend),
+                                         return_exceptions=True)
+        if isinstance(live, Exception):
+            print(f"[LOG] Console {backend.host}:{backend.port} indisponível: {repr(live)}")
+            if isinstance(api, Exception):
+                raise api
+            return api
+        if isinstance(api, Exception):
+            api = dict.fromkeys(("version", "hostname", "location", "maxplayers",
+                                 "favorited", "uptime", "top3"), "N/A")
+            api.update(name=f"{backend.host}:{backend.port}", ip=backend.host, port=backend.port, total_votes=0)
+        return {**api, **live}
+
+    async def fetch_live(self, backend: ServerStatusBackend) -> dict:
+        """Jogadores via telnet (cache curto + single-flight por servidor)."""
+        key = (backend.host, backend.port)
+        return await self.live_cache.get(key, lambda: self._fetch_console(backend))
+
+    async def _fetch_console(self, backend: ServerStatusBackend) -> dict:
+        console = self.consoles.get(backend.host, backend.port, crypto.decrypt(backend.password))
+        players, names = await console.list_players()
+        return {"players": players, "names": names, "online": True, "live": True}
+
+    @staticmethod
+    def _is_public(ip: str) -> bool:
         try:
-            async with aiohttp.ClientSession() as session:
-                resp_detail = await asyncio.wait_for(session.get(detail_url, headers=headers), timeout=10)
-                async with resp_detail:
-                    detail_data = await resp_detail.json(content_type=None)
-                
-                resp_votes = await asyncio.wait_for(session.get(votes_url, headers=headers), timeout=10)
-                async with resp_votes:
-                    votes_data = await resp_votes.json(content_type=None)
-                
-                resp_voters = await asyncio.wait_for(session.get(voters_url, headers=headers), timeout=10)
-                async with resp_voters:
-                    voters_data = await resp_voters.json(content_type=None)
-        except Exception as e:
-            embed = discord.Embed(
-                title="❌ Erro na API",
-                description=f"Ocorreu um erro ao consultar a API: {repr(e)}",
-                color=discord.Color.red()
-            )
-            embed.set_image(url="https://imgur.com/oOfp23C.gif")
-            return embed
+            return ipaddress.ip_address(ip).is_global
+        except ValueError:                              # ex.: IPv6 com escopo (fe80::1%eth0)
+            return False
+
+    @staticmethod
+    async def _resolve(host: str, port: int) -> set:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        return {info[4][0] for info in infos}
 
+    async def _check_console_host(self, server_key: str, host: str, port: int) -> str:
+        """
+        O bot só abre telnet para o IP público que a API de listagem informa para
+        o servidor configurado; nada de endereços internos (127.0.0.1, 10.x…).
+        Devolve o IP conferido, que é o que fica salvo (sem nova resolução DNS).
+        """
+        try:
+            addrs = await self._resolve(host, port)
+        except OSError:
+            raise ValueError(f"não foi possível resolver `{host}`.")
+        if not addrs or not all(self._is_public(a) for a in addrs):
+            raise ValueError("endereços privados, locais ou reservados não são aceitos.")
+        try:
+            listed = (await self.fetch_data(server_key)).get("ip")
+            listed_addrs = await self._resolve(listed, port) if listed and listed != "N/A" else set()
+        except Exception:
+            listed, listed_addrs = None, set()
+        if not listed_addrs:
+            raise ValueError("a API de listagem não informou o IP do servidor para conferir; tente mais tarde.")
+        match = addrs & listed_addrs
+        if not match:
+            raise ValueError(f"o host precisa ser o IP do servidor na listagem (`{listed}`).")
+        return sorted(match)[0]
+
+    async def fetch_data(self, server_key: str) -> dict:
+        """Dados do servidor via cache (uma consulta por server_key, compartilhada)."""
+        return await self.api_cache.get(server_key, lambda: self._fetch_api(server_key))
+
+    async def _fetch_api(self, server_key: str) -> dict:
+        """Consulta a API do 7DTD e devolve só os campos usados no embed."""
+        headers = {"Accept": "application/json"}
+        detail_url = f"{self.API_URL}?object=servers&element=detail&key={server_key}&format=json"
+        votes_url = f"{self.API_URL}?object=servers&element=votes&key={server_key}&format=json"
+        voters_url = f"{self.API_URL}?object=servers&element=voters&key={server_key}&month=current&format=json"
+        http = self.bot.http_client
+        # as três consultas em paralelo, pela sessão compartilhada (keep-alive)
+        detail_data, votes_data, voters_data = await asyncio.gather(
+            http.get_json(detail_url, headers=headers),
+            http.get_json(votes_url, headers=headers),
+            http.get_json(voters_url, headers=headers),
+        )
         if not detail_data:
-            embed = discord.Embed(
-                title="❌ Erro",
-                description="A API não retornou informações.",
-                color=discord.Color.red()
-            )
-            embed.set_image(url="https://imgur.com/oOfp23C.gif")
-            return embed
-
-        # Dados do servidor
-        server_version = detail_data.get("version", "N/A")
-        server_name = detail_data.get("name", "N/A")
-        hostname = detail_data.get("hostname", "N/A")
-        location = detail_data.get("location", "N/A")
-        maxplayers = detail_data.get("maxplayers", "N/A")
-        players = detail_data.get("players", "N/A")
-        favorited = detail_data.get("favorited", "N/A")
-        uptime = detail_data.get("uptime", "N/A")
-        ip = detail_data.get("address", "N/A")
-        port = detail_data.get("port", "N/A")
-        online_status = detail_data.get("is_online", "0") == "1"
-        
-        status_emoji = "🟢" if online_status else "🔴"
-        status_text = "Online" if online_status else "Offline"
-        now = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
+            raise EmptyAPIResponse("A API não retornou informações.")
 
         # Processa votos
         votes_array = votes_data if isinstance(votes_data, list) else votes_data.get("votes", [])
-        total_votes = len(votes_array)
         voters_list = voters_data if isinstance(voters_data, list) else voters_data.get("voters", [])
         top3 = sorted(voters_list, key=lambda v: int(v.get("votes", 0)), reverse=True)[:3]
         top3_str = ", ".join(f"{v.get('nickname', 'N/A')} ({v.get('votes', 0)})" for v in top3) if top3 else "N/A"
 
+        data = {
+            "name": detail_data.get("name", "N/A"),
+            "version": detail_data.get("version", "N/A"),
+            "hostname": detail_data.get("hostname", "N/A"),
+            "location": detail_data.get("location", "N/A"),
+            "players": detail_data.get("players", "N/A"),
+            "maxplayers": detail_data.get("maxplayers", "N/A"),
+            "favorited": detail_data.get("favorited", "N/A"),
+            "uptime": detail_data.get("uptime", "N/A"),
+            "ip": detail_data.get("address", "N/A"),
+            "port": detail_data.get("port", "N/A"),
+            "online": detail_data.get("is_online", "0") == "1",
+            "total_votes": len(votes_array),
+            "top3": top3_str,
+            "fetched_at": datetime.now(),
+        }
+        # só consultas reais chegam aqui (acertos do cache não geram amostra)
+        try:
+            await self._record_sample(server_key, data)
+        except Exception as e:
+            print(f"[ERROR] Erro ao gravar histórico de {server_key}: {repr(e)}")
+        return data
+
+    # ───── série temporal ─────
+    @staticmethod
+    def _to_int(value):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    async def _record_sample(self, server_key: str, data: dict):
+        """Anexa a amostra bruta e atualiza os baldes hora/dia correntes (um upsert)."""
+        ts = datetime.utcnow()
+        players = self._to_int(data["players"])
+        votes = data["total_votes"]
+        rows = []
+        async with adb() as s:
+            s.add(ServerStatusSample(
+                server_key=server_key, ts=ts, online=int(data["online"]), players=players,
+                maxplayers=self._to_int(data["maxplayers"]), votes=votes,
+            ))
+            for period in PERIODS:
+                start = bucket_start(ts, period)
+                bucket = self.buckets.get((server_key, period))
+                if bucket is None or bucket.start != start:
+                    # balde novo (ou reinício do bot): retoma o que já estiver gravado
+                    bucket = self.buckets[(server_key, period)] = await self._load_bucket(s, server_key, period, start)
+                    if period == "hour":
+                        await self._prune_history(s, server_key, ts)
+                bucket.add(data["online"], players, votes)
+                rows.append(bucket.row(server_key, period))
+            await s.run_sync(upsert, ServerStatusRollup, rows, ["server_key", "period", "bucket_start"],
+                             ["samples", "online_samples", "players_sum", "players_max", "votes"])
+
+    @staticmethod
+    async def _load_bucket(s, server_key: str, period: str, start: datetime) -> Bucket:
+        row = await s.scalar(select(ServerStatusRollup).filter_by(
+            server_key=server_key, period=period, bucket_start=start))
+        if row is None:
+            return Bucket(start)
+        return Bucket(start, row.samples, row.online_samples, row.players_sum, row.players_max, row.votes)
+
+    async def _prune_history(self, s, server_key: str, now: datetime):
+        """Roda uma vez por hora por server_key: descarta bruto e baldes horários antigos."""
+        await s.execute(delete(ServerStatusSample).where(
+            ServerStatusSample.server_key == server_key,
+            ServerStatusSample.ts < now - self.RAW_RETENTION,
+        ))
+        await s.execute(delete(ServerStatusRollup).where(
+            ServerStatusRollup.server_key == server_key,
+            ServerStatusRollup.period == "hour",
+            ServerStatusRollup.bucket_start < now - self.HOURLY_RETENTION,
+        ))
+
+    async def _load_buckets(self, server_key: str, period: str, since: datetime) -> list:
+        async with adb() as s:
+            rows = await s.scalars(
+                select(ServerStatusRollup)
+                .where(ServerStatusRollup.server_key == server_key,
+                       ServerStatusRollup.period == period,
+                       ServerStatusRollup.bucket_start >= since)
+                .order_by(ServerStatusRollup.bucket_start)
+            )
+            return [Bucket(r.bucket_start, r.samples, r.online_samples, r.players_sum, r.players_max, r.votes)
+                    for r in rows]
+
+    def build_history_embed(self, server_key: str, hours: list, days: list, now: datetime) -> discord.Embed:
+        """Sparklines das últimas 24h (por hora) e 30 dias (por dia) + horários de pico."""
+        day_start = bucket_start(now, "hour") - timedelta(hours=23)
+        last_24h = series([b for b in hours if b.start >= day_start], day_start, "hour", 24)
+        month_start = bucket_start(now, "day") - timedelta(days=29)
+        last_30d = series(days, month_start, "day", 30)
+
+        def line(slots):
+            avg = [b.avg_players if b else None for b in slots]
+            known = [b for b in slots if b]
+            peak = max((b.players_max for b in known), default=0)
+            samples = sum(b.samples for b in known)
+            uptime = sum(b.online_samples for b in known) / samples if samples else 0
+            return f"`{sparkline(avg)}`\nPico: **{peak}** jogadores • Online: **{uptime:.0%}** das verificações"
+
+        embed = discord.Embed(title=f"📈 Histórico do servidor ({server_key[:6]}…)", color=discord.Color.blue())
+        embed.add_field(name="🕐 Últimas 24h (média por hora)", value=line(last_24h), inline=False)
+        embed.add_field(name="📅 Últimos 30 dias (média por dia)", value=line(last_30d), inline=False)
+        peaks = peak_hours([b for b in hours if b.start >= now - timedelta(days=7)], self.UTC_OFFSET)
+        embed.add_field(
+            name="🔥 Horários de pico (últimos 7 dias)",
+            value=" • ".join(f"**{h:02d}h** ({avg:.1f})" for h, avg in peaks) or "Sem dados ainda.",
+            inline=False,
+        )
+        votes = next((b.votes for b in reversed(days) if b.votes is not None), None)
+        if votes is not None:
+            embed.add_field(name="📊 Votos no mês", value=f"**{votes}**", inline=True)
+        embed.set_footer(text=f"Horários em UTC{self.UTC_OFFSET:+d} • agregados por hora e por dia")
+        return embed
+
+    def build_embed(self, data: dict) -> discord.Embed:
+        """Monta o embed de status a partir dos dados de fetch_data."""
+        online_status = data["online"]
+        status_emoji = "🟢" if online_status else "🔴"
+        status_text = "Online" if online_status else "Offline"
+
         # Cria o embed com formatação aprimorada e emojis
         embed = discord.Embed(
-            title=f"{status_emoji} {server_name} - Status",
+            title=f"{status_emoji} {data['name']} - Status",
             color=discord.Color.green() if online_status else discord.Color.red()
         )
-        embed.add_field(name="🌍 Localização", value=f"**{location}**", inline=True)
-        embed.add_field(name="🔢 Versão", value=f"**{server_version}**", inline=True)
-        embed.add_field(name="💻 Hostname", value=f"**{hostname}**", inline=True)
-        embed.add_field(name="🎮 Jogadores", value=f"**{players}/{maxplayers}**", inline=True)
-        embed.add_field(name="⭐ Favoritos", value=f"**{favorited}**", inline=True)
-        embed.add_field(name="⏱ Uptime", value=f"**{uptime}%**", inline=True)
-        embed.add_field(name="📡 IP", value=f"**{ip}:{port}**", inline=True)
+        embed.add_field(name="🌍 Localização", value=f"**{data['location']}**", inline=True)
+        embed.add_field(name="🔢 Versão", value=f"**{data['version']}**", inline=True)
+        embed.add_field(name="💻 Hostname", value=f"**{data['hostname']}**", inline=True)
+        live = " (ao vivo)" if data.get("live") else ""
+        embed.add_field(name="🎮 Jogadores", value=f"**{data['players']}/{data['maxplayers']}**{live}", inline=True)
+        embed.add_field(name="⭐ Favoritos", value=f"**{data['favorited']}**", inline=True)
+        embed.add_field(name="⏱ Uptime", value=f"**{data['uptime']}%**", inline=True)
+        embed.add_field(name="📡 IP", value=f"**{data['ip']}:{data['port']}**", inline=True)
         embed.add_field(name="🔔 Status", value=f"**{status_text}**", inline=True)
-        embed.add_field(name="📊 Total de Votos", value=f"**{total_votes}**", inline=True)
-        embed.add_field(name="🏆 Top 3 Votantes", value=f"**{top3_str}**", inline=False)
-        embed.set_footer(text=f"Atualizado em: {now} | Atualiza a cada 5 minutos")
+        embed.add_field(name="📊 Total de Votos", value=f"**{data['total_votes']}**", inline=True)
+        embed.add_field(name="🏆 Top 3 Votantes", value=f"**{data['top3']}**", inline=False)
+        if data.get("names"):
+            names = ", ".join(sorted(data["names"], key=str.lower))
+            embed.add_field(name="👥 Online agora", value=names if len(names) <= 1024 else names[:1021] + "...",
+                            inline=False)
+        # o rodapé não renderiza <t:…:R>; o horário da última mudança vai num campo (stamp_change)
+        embed.set_footer(text="Verificado automaticamente (mais vezes quando o status muda)")
         # Adiciona o GIF na parte inferior do embed
         embed.set_image(url="https://imgur.com/oOfp23C.gif")
         return embed
 
-    @tasks.loop(minutes=5)
-    async def status_task(self):
-        """Atualiza automaticamente o status de todos os servidores a cada 5 minutos."""
-        with SessionLocal() as session:
-            configs = session.query(ServerStatusConfig).all()
-        for config in configs:
-            embed = await self.fetch_embed(config.server_key)
-            channel = self.bot.get_channel(int(config.channel_id))
-            if not channel:
+    @staticmethod
+    def fingerprint(embed: discord.Embed) -> tuple:
+        """Conteúdo que importa (sem rodapé/horários): se não mudou, não há o que editar."""
+        color = embed.color.value if embed.color else None
+        return (embed.title, embed.description, color,
+                tuple((f.name, f.value) for f in embed.fields))
+
+    @staticmethod
+    def stamp_change(embed: discord.Embed, changed_at: datetime) -> discord.Embed:
+        """Acrescenta a última mudança como timestamp relativo (o cliente atualiza sozinho)."""
+        embed.add_field(name="🕒 Última mudança", value=f"<t:{int(changed_at.timestamp())}:R>", inline=False)
+        return embed
+
+    async def fetch_embed(self, server_key: str, backend: ServerStatusBackend = None) -> discord.Embed:
+        """
+        Consulta a API do 7DTD (via cache) e, se configurado, o console telnet,
+        e constrói um embed formatado. Em caso de erro, retorna um embed de erro.
+        """
+        try:
+            return self.build_embed(await self.fetch_status(server_key, backend))
+        except EmptyAPIResponse as e:
+            embed = discord.Embed(
+                title="❌ Erro",
+                description=str(e),
+                color=discord.Color.red()
+            )
+        except Exception as e:
+            embed = discord.Embed(
+                title="❌ Erro na API",
+                description=f"Ocorreu um erro ao consultar a API: {repr(e)}",
+                color=discord.Color.red()
+            )
+        embed.set_image(url="https://imgur.com/oOfp23C.gif")
+        return embed
+
+    # ───── agendador adaptativo ─────
+    def _schedule(self, config: ServerStatusConfig, delay: float, interval: float = None):
+        """(Re)agenda a config para daqui a ``delay`` segundos (com jitter)."""
+        entry = self.entries.get(config.guild_id)
+        if entry is None:
+            entry = self.entries[config.guild_id] = PollEntry(config, self.POLL_BASE)
+        entry.config = config
+        if interval is not None:
+            entry.interval = interval
+        entry.due = time.monotonic() + delay * random.uniform(1 - self.POLL_JITTER, 1 + self.POLL_JITTER)
+        entry.seq = next(self._seq)
+        heapq.heappush(self._heap, (entry.due, entry.seq, config.guild_id))
+        self._wakeup.set()
+
+    def _next_interval(self, entry: PollEntry, online: bool, transition: bool, changed: bool) -> float:
+        if transition:
+            return self.POLL_MIN
+        if changed:
+            return self.POLL_BASE
+        cap = self.POLL_STABLE if online else self.POLL_OFFLINE
+        return min(max(entry.interval, self.POLL_MIN) * self.POLL_BACKOFF, cap)
+
+    def queue_stats(self) -> dict:
+        now = time.monotonic()
+        overdue = sum(1 for e in self.entries.values() if e.due <= now)
+        return {"depth": len(self.entries), "overdue": overdue,
+                "last_lag": self.last_lag, "max_lag": self.max_lag, "polls": self.polls}
+
+    async def _scheduler(self):
+        await self.bot.wait_until_ready()
+        configs = await self._load_configs()
+        # primeira rodada espalhada pelo intervalo base, não tudo de uma vez
+        for i, config in enumerate(configs):
+            self._schedule(config, self.POLL_BASE * i / max(len(configs), 1))
+        sem = asyncio.Semaphore(self.CONCURRENCY)
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+            due, seq, guild_id = self._heap[0]
+            entry = self.entries.get(guild_id)
+            if entry is None or entry.seq != seq:       # removida ou reagendada
+                heapq.heappop(self._heap)
+                continue
+            delay = due - time.monotonic()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
                 continue
+            heapq.heappop(self._heap)
+            await sem.acquire()                         # espera vaga: o atraso entra no lag
+            self.last_lag = time.monotonic() - due
+            self.max_lag = max(self.max_lag, self.last_lag)
+            entry.due = float("inf")                    # em execução: não conta como atrasada
+            asyncio.create_task(self._poll(entry, sem))
+
+    async def _poll(self, entry: PollEntry, sem: asyncio.Semaphore):
+        config, seq = entry.config, entry.seq
+        was_online = self.last_status.get(config.guild_id)
+        online, changed = False, False
+        try:
+            online, changed = await self._update_status(config)
+        except Exception as e:
+            print(f"[ERROR] Erro ao atualizar status da guild {config.guild_id}: {repr(e)}")
+        finally:
+            sem.release()
+            self.polls += 1
+        if self.entries.get(config.guild_id) is not entry:   # removida/substituída no meio
+            return
+        if entry.seq != seq:
+            # config/backend trocados durante a consulta: já foi reagendada com a config nova
+            return
+        transition = was_online is not None and was_online != online
+        interval = self._next_interval(entry, online, transition, changed)
+        self._schedule(entry.config, interval, interval)
+
+    async def _update_status(self, config: ServerStatusConfig):
+        """
+        Atualiza a mensagem de status de uma guild e avisa se o servidor caiu/voltou.
+        Só edita quando o conteúdo mudou ou a mensagem passou de MAX_STALENESS.
+        Retorna (online, dados mudaram) para o agendador.
+        """
+        embed = await self.fetch_embed(config.server_key, self.backends.get(config.guild_id))
+        online = (embed.color.value == discord.Color.green().value)
+        channel = self.bot.get_channel(int(config.channel_id))
+        if not channel:
+            return online, False
+        fp = self.fingerprint(embed)
+        prev = self.fingerprints.get(config.guild_id)
+        changed = not prev or prev[0] != fp
+        now = time.monotonic()
+        if prev and prev[0] == fp and now - prev[2] < self.MAX_STALENESS:
+            self.edits_skipped += 1
+        else:
+            changed_at = prev[1] if prev and prev[0] == fp else datetime.now(timezone.utc)
+            self.stamp_change(embed, changed_at)
             try:
-                msg = await get_message(channel, int(config.message_id))
-                await msg.edit(embed=embed)
+                await self._panel(channel, config).edit(embed=embed)
+                self.fingerprints[config.guild_id] = (fp, changed_at, now)
+                self.edits += 1
             except NotFound as nf:
+                # só aqui a mensagem é recriada; o novo ID vai para o banco em lote
                 print(f"[LOG] Mensagem não encontrada para guild {config.guild_id}: {repr(nf)}")
                 try:
                     msg = await channel.send(embed=embed)
-                    with SessionLocal() as session:
-                        cfg = session.query(ServerStatusConfig).filter_by(guild_id=str(config.guild_id)).first()
-                        if cfg:
-                            cfg.message_id = str(msg.id)
-                            session.commit()
+                    config.message_id = str(msg.id)
+                    self.messages[config.guild_id] = channel.get_partial_message(msg.id)
+                    self._queue_message_id(config.guild_id, msg.id)
+                    self.fingerprints[config.guild_id] = (fp, changed_at, now)
+                    self.recreated += 1
                     print(f"[LOG] Nova mensagem de status criada para guild {config.guild_id}")
                 except Exception as e2:
                     print(f"[ERROR] Erro ao criar nova mensagem para guild {config.guild_id}: {repr(e2)}")
             except Exception as e:
                 print(f"[ERROR] Erro ao editar mensagem de status para guild {config.guild_id}: {repr(e)}")
-            
-            # Verifica mudança de status para enviar alertas
-            online = (embed.color.value == discord.Color.green().value)
-            if config.guild_id in self.last_status:
-                if self.last_status[config.guild_id] and not online:
-                    await channel.send("🔴 **Alerta:** O servidor está OFFLINE!")
-                elif not self.last_status[config.guild_id] and online:
-                    await channel.send("🟢 **O servidor voltou ONLINE!**")
-            self.last_status[config.guild_id] = online
+
+        # Verifica mudança de status para enviar alertas
+        if config.guild_id in self.last_status:
+            if self.last_status[config.guild_id] and not online:
+                await channel.send("🔴 **Alerta:** O servidor está OFFLINE!")
+            elif not self.last_status[config.guild_id] and online:
+                await channel.send("🟢 **O servidor voltou ONLINE!**")
+        self.last_status[config.guild_id] = online
+        return online, changed
 
     @app_commands.command(name="serverstatus_config", description="Configura o status do servidor 7DTD (atualização automática).")
     async def serverstatus_config(self, interaction: discord.Interaction, server_key: str, canal: discord.TextChannel):
@@ -161,16 +599,8 @@ class ServerStatusCog(commands.Cog):
             await interaction.response.defer(thinking=True, ephemeral=True)
             embed = await asyncio.wait_for(self.fetch_embed(server_key), timeout=10)
             msg = await canal.send(embed=embed)
-            with SessionLocal() as session:
-                config = session.query(ServerStatusConfig).filter_by(guild_id=str(interaction.guild.id)).first()
-                if not config:
-                    config = ServerStatusConfig(guild_id=str(interaction.guild.id))
-                    session.add(config)
-                config.server_key = server_key
-                config.channel_id = str(canal.id)
-                config.message_id = str(msg.id)
-                session.commit()
-            await interaction.followup.send("✅ Configuração salva! O status será atualizado automaticamente a cada 5 minutos.", ephemeral=True)
+            await self._save_config(interaction.guild.id, server_key, canal.id, msg.id)
+            await interaction.followup.send("✅ Configuração salva! O status será atualizado automaticamente.", ephemeral=True)
         except Exception as e:
             print(f"[ERROR] Erro no comando serverstatus_config: {repr(e)}")
             await interaction.followup.send(f"❌ Ocorreu um erro: {repr(e)}", ephemeral=True)
@@ -180,26 +610,16 @@ class ServerStatusCog(commands.Cog):
         """
         Exibe o status do servidor imediatamente.
         Se a mensagem de status estiver configurada, envia o embed atual;
-        caso contrário, informa que não há configuração.
+        caso contrário, informa que não há configuração. O painel em si é
+        mantido pelo agendador.
         """
         try:
             await interaction.response.defer(thinking=True, ephemeral=False)
-            with SessionLocal() as session:
-                config = session.query(ServerStatusConfig).filter_by(guild_id=str(interaction.guild.id)).first()
+            config = await self._get_config(interaction.guild.id)
             if not config:
                 await interaction.followup.send("Nenhuma configuração encontrada. Use /serverstatus_config para configurar.")
                 return
-            embed = await self.fetch_embed(config.server_key)
-            channel = interaction.channel
-            try:
-                msg = await get_message(channel, int(config.message_id))
-            except NotFound as nf:
-                print(f"[LOG] Mensagem não encontrada: {repr(nf)}")
-                msg = await channel.send(embed=embed)
-                with SessionLocal() as session:
-                    conf = session.query(ServerStatusConfig).filter_by(guild_id=str(interaction.guild.id)).first()
-                    conf.message_id = str(msg.id)
-                    session.commit()
+            embed = await self.fetch_embed(config.server_key, self.backends.get(config.guild_id))
             await interaction.followup.send(embed=embed)
         except Exception as e:
             print(f"[ERROR] Erro no comando serverstatus_show: {repr(e)}")
@@ -214,24 +634,124 @@ class ServerStatusCog(commands.Cog):
         """
         try:
             await interaction.response.defer(thinking=True, ephemeral=True)
-            with SessionLocal() as session:
-                config = session.query(ServerStatusConfig).filter_by(guild_id=str(interaction.guild.id)).first()
-                if not config:
-                    await interaction.followup.send("Nenhuma configuração encontrada.", ephemeral=True)
-                    return
-                channel = self.bot.get_channel(int(config.channel_id))
-                if channel:
-                    try:
-                        msg = await channel.fetch_message(int(config.message_id))
-                        await msg.delete()
-                    except Exception as e:
-                        print(f"[ERROR] Erro ao deletar a mensagem: {repr(e)}")
-                session.delete(config)
-                session.commit()
+            config = await self._get_config(interaction.guild.id)
+            if not config:
+                await interaction.followup.send("Nenhuma configuração encontrada.", ephemeral=True)
+                return
+            channel = self.bot.get_channel(int(config.channel_id))
+            if channel:
+                try:
+                    await channel.get_partial_message(int(config.message_id)).delete()
+                except NotFound:
+                    pass
+                except Exception as e:
+                    print(f"[ERROR] Erro ao deletar a mensagem: {repr(e)}")
+            await self._delete_config(interaction.guild.id)
             await interaction.followup.send("✅ Configuração removida e mensagem deletada (se encontrada).", ephemeral=True)
         except Exception as e:
             print(f"[ERROR] Erro no comando serverstatus_remove: {repr(e)}")
             await interaction.followup.send(f"❌ Ocorreu um erro: {repr(e)}", ephemeral=True)
 
+    @app_commands.command(name="serverstatus_backend", description="Define a fonte dos jogadores: API de listagem ou console telnet do servidor.")
+    @app_commands.default_permissions(manage_guild=True)
+    @app_commands.describe(fonte="api (padrão) ou telnet",
+                           host="Host do console telnet (o mesmo IP do servidor na listagem)",
+                           porta="Porta do telnet (padrão 8081)", senha="Senha do telnet (guardada cifrada)")
+    @app_commands.choices(fonte=[app_commands.Choice(name="API de listagem", value="api"),
+                                 app_commands.Choice(name="Console telnet (ao vivo)", value="telnet")])
+    async def serverstatus_backend(self, interaction: discord.Interaction, fonte: str,
+                                   host: str = None, porta: int = 8081, senha: str = None):
+        """
+        Com telnet, confere o host e testa a conexão (``lp``) antes de salvar.
+        O host precisa ser o IP público da listagem (o dono do bot pode usar
+        qualquer um) e a senha só é aceita se der para cifrá-la (BOT_SECRET_KEY).
+        """
+        try:
+            await interaction.response.defer(thinking=True, ephemeral=True)
+            guild_id = str(interaction.guild.id)
+            config = await self._get_config(interaction.guild.id)
+            if not config:
+                await interaction.followup.send("Nenhuma configuração encontrada. Use /serverstatus_config primeiro.", ephemeral=True)
+                return
+            if fonte == "api":
+                await self._delete_backend(guild_id)
+                msg = "✅ Jogadores voltarão a vir da API de listagem."
+            else:
+                if not host:
+                    await interaction.followup.send("❌ Informe o host do console telnet.", ephemeral=True)
+                    return
+                if senha and not crypto.available():
+                    await interaction.followup.send(
+                        "❌ O bot não tem chave para cifrar a senha (BOT_SECRET_KEY); ela não foi salva.",
+                        ephemeral=True)
+                    return
+                if not await self.bot.is_owner(interaction.user):
+                    try:
+                        host = await self._check_console_host(config.server_key, host, porta)
+                    except ValueError as e:
+                        await interaction.followup.send(f"❌ Host recusado: {e}", ephemeral=True)
+                        return
+                await self.consoles.discard(host, porta)    # testa com conexão nova
+                try:
+                    players, _ = await self.consoles.get(host, porta, senha).list_players()
+                except ConsoleError as e:
+                    await self.consoles.discard(host, porta)
+                    await interaction.followup.send(f"❌ Não foi possível usar o console: {e}", ephemeral=True)
+                    return
+                await self._save_backend(guild_id, host, porta, senha)
+                self.live_cache.invalidate((host, porta))
+                msg = f"✅ Console conectado ({players} jogadores online agora). O status passa a ser ao vivo."
+            self.fingerprints.pop(guild_id, None)
+            self._schedule(config, 0)
+            await interaction.followup.send(msg, ephemeral=True)
+        except Exception as e:
+            print(f"[ERROR] Erro no comando serverstatus_backend: {repr(e)}")
+            await interaction.followup.send(f"❌ Ocorreu um erro: {repr(e)}", ephemeral=True)
+
+    @app_commands.command(name="serverstatus_history", description="Mostra o histórico de jogadores do servidor 7DTD.")
+    async def serverstatus_history(self, interaction: discord.Interaction):
+        """Lê só os baldes agregados (≤ 7×24 horários + 30 diários), nunca as amostras brutas."""
+        try:
+            await interaction.response.defer(thinking=True)
+            config = await self._get_config(interaction.guild.id)
+            if not config:
+                await interaction.followup.send("Nenhuma configuração encontrada. Use /serverstatus_config para configurar.")
+                return
+            now = datetime.utcnow()
+            hours = await self._load_buckets(config.server_key, "hour", bucket_start(now, "hour") - timedelta(days=7))
+            days = await self._load_buckets(config.server_key, "day", bucket_start(now, "day") - timedelta(days=29))
+            if not hours and not days:
+                await interaction.followup.send("Ainda não há histórico para este servidor. Aguarde algumas verificações.")
+                return
+            await interaction.followup.send(embed=self.build_history_embed(config.server_key, hours, days, now))
+        except Exception as e:
+            print(f"[ERROR] Erro no comando serverstatus_history: {repr(e)}")
+            await interaction.followup.send(f"❌ Ocorreu um erro: {repr(e)}", ephemeral=True)
+
+    @app_commands.command(name="serverstatus_stats", description="Mostra a eficiência do cache da API do 7DTD.")
+    @app_commands.default_permissions(manage_guild=True)
+    async def serverstatus_stats(self, interaction: discord.Interaction):
+        st = self.api_cache.stats()
+        q = self.queue_stats()
+        c = self.consoles.stats()
+        embed = discord.Embed(
+            title="📈 Cache da API 7DTD",
+            description=(
+                f"**Acertos:** {st['hits']} • **Caronas (single-flight):** {st['coalesced']}\n"
+                f"**Consultas à API:** {st['misses']} • **Falhas:** {st['errors']} "
+                f"(**{st['stale']}** respondidas com dados antigos)\n"
+                f"**Taxa de acerto:** {st['hit_rate']:.0%} • **server_keys em cache:** {st['size']}\n"
+                f"**Edições:** {self.edits} (**{self.edits_skipped}** evitadas: nada mudou) • "
+                f"**Painéis recriados:** {self.recreated}\n"
+                f"**Fila:** {q['depth']} servidores, {q['overdue']} atrasados • **Consultas:** {q['polls']}\n"
+                f"**Lag do agendador:** último {q['last_lag']:.1f}s • máx {q['max_lag']:.1f}s\n"
+                f"**Consoles telnet:** {c['connected']}/{c['servers']} conectados • "
+                f"{c['commands']} comandos em {c['connects']} conexões"
+            ),
+            color=discord.Color.blue()
+        )
+        embed.set_footer(text=f"TTL {self.CACHE_TTL}s • dados antigos aceitos por mais {self.STALE_TTL}s")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
 async def setup(bot: commands.Bot):
     await bot.add_cog(ServerStatusCog(bot))
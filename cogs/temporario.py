@@ -12,17 +12,12 @@ async def send_temporary_embed(
     delay: int = 30
 ) -> None:
     """
-    Envia um embed (visível a todos) e deleta após 'delay' segundos.
+    Envia um embed (visível a todos) e agenda a exclusão para 'delay' segundos.
     """
     await interaction.response.send_message(embed=embed, ephemeral=False)
     # Pega a mensagem que acabamos de enviar
     msg = await interaction.original_response()
-    await asyncio.sleep(delay)
-    # Tenta apagar
-    try:
-        await msg.delete()
-    except:
-        pass
+    await interaction.client.deleter.delete_later(msg, delay)
 
 # =========================
 # Modals
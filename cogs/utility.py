@@ -1,23 +1,17 @@
 # cogs/utility_cog.py
 import asyncio
+import os
 import discord
 from discord.ext import commands
 from discord import app_commands
 from deep_translator import GoogleTranslator
 
+from utils.translate_cache import TranslationCache
 
-# ---------- tradução assíncrona ----------
-async def translate_text(text: str, dest: str) -> str | None:
-    loop = asyncio.get_running_loop()
-
-    def _sync():
-        return GoogleTranslator(source="auto", target=dest).translate(text)
 
-    try:
-        return await loop.run_in_executor(None, _sync)
-    except Exception as e:
-        print(f"[translate] erro: {e}")
-        return None
+# ---------- tradução assíncrona ----------
+def _google_translator(dest: str) -> GoogleTranslator:
+    return GoogleTranslator(source="auto", target=dest)
 # -----------------------------------------
 
 
@@ -46,9 +40,30 @@ class LanguageSelectView(discord.ui.View):
 
 
 class UtilityCog(commands.Cog):
-    """/traduzir · !traduzir · /ping · !ping"""
+    """/traduzir · !traduzir · /traducao_stats · /ping · !ping"""
+    # textos repetidos não voltam à rede: LRU em memória na frente de um SQLite local
+    TRANSLATION_CACHE_FILE = os.getenv("TRANSLATION_CACHE", "translations.sqlite3")
+    TRANSLATION_CACHE_MB   = float(os.getenv("TRANSLATION_CACHE_MB", "32"))
+    TRANSLATION_MEMORY     = int(os.getenv("TRANSLATION_MEMORY", "512"))    # traduções na LRU
+    TRANSLATORS_PER_LANG   = int(os.getenv("TRANSLATORS_PER_LANG", "2"))
+
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self.translations = TranslationCache(
+            _google_translator, self.TRANSLATION_CACHE_FILE,
+            max_bytes=int(self.TRANSLATION_CACHE_MB * 1024 * 1024),
+            memory_size=self.TRANSLATION_MEMORY, per_lang=self.TRANSLATORS_PER_LANG,
+        )
+
+    def cog_unload(self):
+        self.translations.close()
+
+    async def translate_text(self, text: str, dest: str) -> str | None:
+        try:
+            return await self.translations.translate(text, dest)
+        except Exception as e:
+            print(f"[translate] erro: {e}")
+            return None
 
     # ---------- /traduzir ----------
     @app_commands.command(
@@ -85,7 +100,7 @@ class UtilityCog(commands.Cog):
             await prompt.edit(content="⏳ Tempo esgotado.", embed=None, view=None)
             return
 
-        traduzido = await translate_text(alvo, lang)
+        traduzido = await self.translate_text(alvo, lang)
         if not traduzido:
             await prompt.edit(content="❌ Erro na tradução.", embed=None, view=None)
             return
@@ -134,11 +149,32 @@ class UtilityCog(commands.Cog):
 
         lang = langs[str(reaction.emoji)]
         status = await ctx.send("🔄 Traduzindo…")
-        traduzido = await translate_text(alvo, lang)
+        traduzido = await self.translate_text(alvo, lang)
         if not traduzido:
             await status.edit(content="❌ Erro na tradução."); return
         await status.edit(content=f"✅ **({lang})** {traduzido}")
 
+    # ---------- estatísticas ----------
+    @app_commands.command(name="traducao_stats", description="Mostra a eficiência do cache de traduções.")
+    @app_commands.default_permissions(manage_guild=True)
+    async def traducao_stats(self, itx: discord.Interaction):
+        st = self.translations.stats()
+        embed = discord.Embed(
+            title="📈 Cache de Traduções",
+            description=(
+                f"**Acertos:** {st['memory_hits']} em memória • {st['disk_hits']} em disco • "
+                f"**Caronas:** {st['coalesced']}\n"
+                f"**Traduções pela rede:** {st['misses']} • **Falhas:** {st['errors']}\n"
+                f"**Taxa de acerto:** {st['hit_rate']:.0%}\n"
+                f"**Memória:** {st['memory_size']}/{st['memory_maxsize']} traduções\n"
+                f"**Disco:** {st['disk_rows']} traduções • {st['disk_bytes'] / 1048576:.1f}/"
+                f"{st['disk_max_bytes'] / 1048576:.0f} MB • **{st['disk_evicted']}** descartadas\n"
+                f"**Tradutores criados:** {st['translators']}"
+            ),
+            color=discord.Color.blue()
+        )
+        await itx.response.send_message(embed=embed, ephemeral=True)
+
     # ---------- ping ----------
     @app_commands.command(name="ping", description="Latência do bot")
     async def ping_slash(self, itx: discord.Interaction):
@@ -1,15 +1,19 @@
-import os, re
+import os, re, time
+from contextlib import asynccontextmanager
 from datetime import datetime
 from sqlalchemy import (
-    create_engine, Column, Integer, String, Text, DateTime, Index
+    create_engine, event, Column, Integer, String, Text, DateTime, Index, UniqueConstraint
 )
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
+from utils.text import ACCENT_TABLE
+
 # ---------------------------------------------------
 #  util
 # ---------------------------------------------------
 def normalize(text: str) -> str:
-    text = text.lower().strip()
+    text = text.translate(ACCENT_TABLE).lower().strip()   # "Ação" -> "acao"
     text = re.sub(r"[^\w\s]", "", text, flags=re.UNICODE)
     return re.sub(r"\s+", " ", text)
 
@@ -21,6 +25,87 @@ engine = create_engine(DATABASE_URL, echo=False, pool_size=10, max_overflow=20)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# ---------------------------------------------------
+#  engine assíncrono (asyncpg / aiosqlite) – use nos cogs para não travar o loop
+# ---------------------------------------------------
+def async_url(url: str) -> str:
+    """postgres://… -> postgresql+asyncpg://…, sqlite://… -> sqlite+aiosqlite://…"""
+    scheme, sep, rest = url.partition("://")
+    driver = scheme.split("+")[0]
+    if driver in ("postgres", "postgresql"):
+        rest = rest.replace("sslmode=", "ssl=")   # asyncpg não entende sslmode
+        return f"postgresql+asyncpg{sep}{rest}"
+    if driver == "sqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    return url
+
+ASYNC_DATABASE_URL = async_url(DATABASE_URL)
+_pool_args = {} if ASYNC_DATABASE_URL.startswith("sqlite") else {"pool_size": 10, "max_overflow": 20}
+async_engine = create_async_engine(ASYNC_DATABASE_URL, echo=False, **_pool_args)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+class DBMetrics:
+    """Espera por conexão do pool e latência das queries (ambos os engines)."""
+    SLOW_QUERY = 0.25   # s
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.queries = self.slow_queries = 0
+        self.query_time = self.query_max = 0.0
+        self.pool_waits = 0
+        self.pool_wait_time = self.pool_wait_max = 0.0
+
+    def record_query(self, elapsed: float):
+        self.queries += 1
+        self.query_time += elapsed
+        self.query_max = max(self.query_max, elapsed)
+        if elapsed >= self.SLOW_QUERY:
+            self.slow_queries += 1
+
+    def record_wait(self, elapsed: float):
+        self.pool_waits += 1
+        self.pool_wait_time += elapsed
+        self.pool_wait_max = max(self.pool_wait_max, elapsed)
+
+    def snapshot(self) -> dict:
+        return {
+            "queries": self.queries,
+            "slow_queries": self.slow_queries,
+            "query_avg_ms": self.query_time / self.queries * 1000 if self.queries else 0.0,
+            "query_max_ms": self.query_max * 1000,
+            "pool_waits": self.pool_waits,
+            "pool_wait_avg_ms": self.pool_wait_time / self.pool_waits * 1000 if self.pool_waits else 0.0,
+            "pool_wait_max_ms": self.pool_wait_max * 1000,
+        }
+
+db_metrics = DBMetrics()
+
+def _before_cursor_execute(conn, cursor, statement, params, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, params, context, executemany):
+    db_metrics.record_query(time.perf_counter() - conn.info["query_start"].pop())
+
+for _eng in (engine, async_engine.sync_engine):
+    event.listen(_eng, "before_cursor_execute", _before_cursor_execute)
+    event.listen(_eng, "after_cursor_execute", _after_cursor_execute)
+
+@asynccontextmanager
+async def adb():
+    """Sessão assíncrona com commit/rollback automático (equivalente async do db())."""
+    async with AsyncSessionLocal() as s:
+        start = time.perf_counter()
+        await s.connection()                      # checkout do pool: aqui é que se espera
+        db_metrics.record_wait(time.perf_counter() - start)
+        try:
+            yield s
+            await s.commit()
+        except Exception:
+            await s.rollback()
+            raise
+
 # ---------------------------------------------------
 #  modelos já existentes (mantive sem mudanças)
 # ---------------------------------------------------
@@ -32,6 +117,46 @@ class ServerStatusConfig(Base):
     channel_id  = Column(String, nullable=False)
     message_id  = Column(String, nullable=False)
 
+class ServerStatusBackend(Base):
+    """Fonte dos jogadores ao vivo por guild; sem linha = só a API de listagem."""
+    __tablename__ = "server_status_backends"
+    id          = Column(Integer, primary_key=True, index=True)
+    guild_id    = Column(String, unique=True, index=True, nullable=False)
+    kind        = Column(String, nullable=False, default="telnet")   # "telnet"
+    host        = Column(String, nullable=False)
+    port        = Column(Integer, nullable=False, default=8081)
+    password    = Column(String, nullable=True)    # cifrada (utils.crypto, "enc1:…")
+    updated_at  = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+# ---------------------------------------------------
+#  Server Status – série temporal (bruto + agregados hora/dia)
+# ---------------------------------------------------
+class ServerStatusSample(Base):
+    __tablename__ = "server_status_samples"
+    id          = Column(Integer, primary_key=True, index=True)
+    server_key  = Column(String, nullable=False)
+    ts          = Column(DateTime, nullable=False, default=datetime.utcnow)   # UTC
+    online      = Column(Integer, nullable=False, default=0)                  # 0/1
+    players     = Column(Integer, nullable=True)
+    maxplayers  = Column(Integer, nullable=True)
+    votes       = Column(Integer, nullable=True)
+    __table_args__ = (Index("ix_status_sample_key_ts", "server_key", "ts"),)
+
+class ServerStatusRollup(Base):
+    __tablename__ = "server_status_rollups"
+    id             = Column(Integer, primary_key=True, index=True)
+    server_key     = Column(String, nullable=False)
+    period         = Column(String, nullable=False)      # "hour" | "day"
+    bucket_start   = Column(DateTime, nullable=False)    # UTC, início do balde
+    samples        = Column(Integer, nullable=False, default=0)
+    online_samples = Column(Integer, nullable=False, default=0)
+    players_sum    = Column(Integer, nullable=False, default=0)
+    players_max    = Column(Integer, nullable=False, default=0)
+    votes          = Column(Integer, nullable=True)      # último total visto no balde
+    __table_args__ = (
+        UniqueConstraint("server_key", "period", "bucket_start", name="uq_status_rollup"),
+    )
+
 class PlayerName(Base):
     __tablename__ = "player_name"
     id          = Column(Integer, primary_key=True, index=True)
@@ -58,6 +183,27 @@ class GlobalBan(Base):
     reason      = Column(String, nullable=False)
     timestamp   = Column(DateTime, default=datetime.utcnow)
 
+# ---------------------------------------------------
+#  Global Ban – fila durável: um job por (ban/unban, guilda)
+# ---------------------------------------------------
+class GlobalBanJob(Base):
+    __tablename__ = "global_ban_jobs"
+    id              = Column(Integer, primary_key=True, index=True)
+    discord_id      = Column(String, nullable=False)
+    guild_id        = Column(String, nullable=False)
+    action          = Column(String, nullable=False)            # "ban" | "unban"
+    reason          = Column(String, nullable=True)
+    status          = Column(String, nullable=False, default="pending")
+    attempts        = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow)
+    last_error      = Column(Text, nullable=True)
+    created_at      = Column(DateTime, default=datetime.utcnow)
+    updated_at      = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    __table_args__ = (
+        UniqueConstraint("discord_id", "guild_id", "action", name="uq_gban_job"),
+        Index("ix_gban_job_due", "status", "next_attempt_at"),
+    )
+
 # ---------------------------------------------------
 #  Global Ban – configuração de canal de log  (NOVA)
 # ---------------------------------------------------
@@ -70,6 +216,111 @@ class GlobalBanLogConfig(Base):
     updated_at = Column(DateTime, default=datetime.utcnow,
                         onupdate=datetime.utcnow)
 
+# ---------------------------------------------------
+#  Profanity – palavras proibidas por servidor
+# ---------------------------------------------------
+class ProfanityWord(Base):
+    __tablename__ = "profanity_words"
+    id         = Column(Integer, primary_key=True, index=True)
+    guild_id   = Column(String, index=True, nullable=False)
+    word       = Column(String, nullable=False)
+    added_by   = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    __table_args__ = (UniqueConstraint("guild_id", "word", name="uq_profanity_guild_word"),)
+
+class ProfanityList(Base):
+    """Servidor com lista própria (mesmo vazia); sem linha aqui vale a lista padrão."""
+    __tablename__ = "profanity_lists"
+    id            = Column(Integer, primary_key=True, index=True)
+    guild_id      = Column(String, unique=True, nullable=False)
+    customized_at = Column(DateTime, default=datetime.utcnow)
+
+class ProfanityWarn(Base):
+    __tablename__ = "profanity_warns"
+    id         = Column(Integer, primary_key=True, index=True)
+    guild_id   = Column(String, nullable=False)
+    user_id    = Column(String, nullable=False)
+    count      = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    __table_args__ = (UniqueConstraint("guild_id", "user_id", name="uq_profanity_warn_guild_user"),)
+
+# ---------------------------------------------------
+#  Ranks – histórico de blocos por clã e embed de alerta
+# ---------------------------------------------------
+class RankMonitorConfig(Base):
+    """Canal de ranking monitorado: limite próprio e canal do alerta (vazio = o mesmo)."""
+    __tablename__ = "rank_monitor_configs"
+    id               = Column(Integer, primary_key=True, index=True)
+    guild_id         = Column(String, index=True, nullable=False)
+    channel_id       = Column(String, unique=True, index=True, nullable=False)
+    limit_per_clan   = Column(Integer, nullable=False, default=6500)
+    alert_channel_id = Column(String, nullable=True)
+    updated_at       = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class RankSeed(Base):
+    """Canal padrão (ranks.CHANNEL_ID) que já virou monitor uma vez; removê-lo depois é definitivo."""
+    __tablename__ = "rank_seeds"
+    id         = Column(Integer, primary_key=True, index=True)
+    channel_id = Column(String, unique=True, nullable=False)
+    seeded_at  = Column(DateTime, default=datetime.utcnow)
+
+class RankSnapshot(Base):
+    """Só grava quando o total do clã muda: o valor em T é a última linha com ts <= T."""
+    __tablename__ = "rank_snapshots"
+    id         = Column(Integer, primary_key=True)
+    channel_id = Column(String, nullable=False)
+    clan       = Column(String, nullable=False)
+    blocks     = Column(Integer, nullable=False)
+    ts         = Column(DateTime, nullable=False, default=datetime.utcnow)   # UTC
+    __table_args__ = (Index("ix_rank_snapshot_channel_clan_ts", "channel_id", "clan", "ts"),)
+
+class RankAlert(Base):
+    __tablename__ = "rank_alerts"
+    id         = Column(Integer, primary_key=True, index=True)
+    channel_id = Column(String, unique=True, index=True, nullable=False)
+    message_id = Column(String, nullable=False)
+
+# ---------------------------------------------------
+#  Exclusões agendadas (utils/deleter.py) – sobrevivem a reinícios
+# ---------------------------------------------------
+class PendingDeletion(Base):
+    __tablename__ = "pending_deletions"
+    id         = Column(Integer, primary_key=True, index=True)
+    channel_id = Column(String, nullable=False)
+    message_id = Column(String, unique=True, nullable=False)
+    due_at     = Column(DateTime, index=True, nullable=False)   # UTC
+
+# ---------------------------------------------------
+#  upsert (INSERT … ON CONFLICT DO UPDATE) p/ Postgres e SQLite
+# ---------------------------------------------------
+def upsert(session, model, rows: list[dict], keys: list[str], update: list[str]):
+    """Insere/atualiza várias linhas num único statement, por chave única."""
+    if not rows:
+        return
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        for row in rows:
+            obj = session.query(model).filter_by(**{k: row[k] for k in keys}).first()
+            if obj:
+                for col in update:
+                    setattr(obj, col, row[col])
+            else:
+                session.add(model(**row))
+        return
+    stmt = insert(model).values(rows)
+    if update:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=keys,
+            set_={col: stmt.excluded[col] for col in update},
+        )
+    else:                                   # sem colunas a atualizar: só insere o que falta
+        stmt = stmt.on_conflict_do_nothing(index_elements=keys)
+    session.execute(stmt)
+
 # ---------------------------------------------------
 #  criação de tabelas
 # ---------------------------------------------------
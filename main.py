@@ -1,10 +1,16 @@
 import os
 import asyncio
 import random
+import signal
 
 import discord
 from discord.ext import commands, tasks
 
+from db import async_engine
+from utils.deleter import DeletionScheduler
+from utils.http import HTTPClient
+from utils.router import MessageRouter
+
 TOKEN = os.getenv("TOKEN")
 
 # ─────────────────────────── Intents ────────────────────────────
@@ -12,11 +18,14 @@ intents = discord.Intents.default()
 intents.guilds = True
 intents.messages = True
 intents.message_content = True
-intents.members = True     # <<< ESSENCIAL para varrer guild.members / fetch_members
+intents.members = True     # <<< ESSENCIAL: cache de membros usado na reconciliação do GlobalBan
 intents.presences = False  # não precisa de presences, a menos que queira status dos users
 
 # ───────────────────────── Bot Client ──────────────────────────
 bot = commands.Bot(command_prefix="!", intents=intents)
+bot.router = MessageRouter()  # cogs se inscrevem aqui em vez de usar on_message
+bot.http_client = HTTPClient()  # sessão HTTP compartilhada (keep-alive, DNS em cache)
+bot.deleter = DeletionScheduler(bot)  # mensagens temporárias: apagadas em lote, persistidas no banco
 
 # ─────────────────────────── Status Loop ────────────────────────
 STATUS_LIST = [
@@ -52,12 +61,19 @@ async def on_ready():
 
     print("🚀 Bot está pronto para uso!")
 
+# ─────────────────────────── on_message ─────────────────────────
+@bot.event
+async def on_message(message: discord.Message):
+    # único on_message do bot: roteia para os cogs e processa comandos UMA vez
+    await bot.router.dispatch(message)
+    await bot.process_commands(message)
+
 # ─────────────────────────── Load Cogs ──────────────────────────
 async def load_cogs():
     cogs = [
         "cogs.admin",
         "cogs.utility",
-        "cogs.global_ban",      # <-- Cog de ban global com recheck a cada 5 min
+        "cogs.global_ban",      # <-- Cog de ban global (reconciliação pelo cache de membros)
         "cogs.ajuda_completa",
         "cogs.nome",
         "cogs.temporario",
@@ -75,11 +91,27 @@ async def load_cogs():
 
 # ───────────────────────────── Main ─────────────────────────────
 async def main():
-    await load_cogs()
-    if not TOKEN:
-        print("❌ ERRO: Variável de ambiente TOKEN não encontrada.")
-        return
-    await bot.start(TOKEN)
+    # "async with" garante bot.close() na saída, que descarrega os cogs
+    # (flush de estado pendente em cog_unload)
+    try:
+        async with bot:
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                try:
+                    loop.add_signal_handler(sig, lambda: asyncio.create_task(bot.close()))
+                except NotImplementedError:  # Windows
+                    pass
+            await load_cogs()
+            bot.deleter.start()
+            if not TOKEN:
+                print("❌ ERRO: Variável de ambiente TOKEN não encontrada.")
+                return
+            await bot.start(TOKEN)
+    finally:
+        # só depois dos flushes dos cogs: fecha a sessão HTTP e o pool assíncrono
+        await bot.deleter.close()
+        await bot.http_client.close()
+        await async_engine.dispose()
 
 # ────────────────────────── Entrypoint ──────────────────────────
 if __name__ == "__main__":
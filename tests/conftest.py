@@ -0,0 +1,12 @@
+# tests/conftest.py
+# os testes importam os módulos a partir da raiz do repositório (utils.*, cogs.*)
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# db.py exige DATABASE_URL no import; os testes usam um SQLite descartável
+os.environ.setdefault(
+    "DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="bot-tests-"), "test.db")
+)
@@ -0,0 +1,104 @@
+# tests/test_ajuda_completa.py
+import asyncio
+import json
+from types import SimpleNamespace
+
+import discord
+from discord.ui.view import ViewStore
+
+import cogs.ajuda_completa as ajuda
+from cogs.ajuda_completa import AjudaCompletaCog
+
+
+class FakeState:
+    """O bastante do ConnectionState para o ``Messageable.send`` de verdade rodar."""
+
+    def __init__(self):
+        self.allowed_mentions = None
+        self.store = ViewStore(self)
+        self.sent = []
+        self.next_id = 1000
+        self.http = SimpleNamespace(send_message=self._send_message)
+
+    async def _send_message(self, channel_id, params):
+        self.next_id += 1
+        self.sent.append(params.payload)
+        return {"id": self.next_id}
+
+    def create_message(self, channel, data):
+        return SimpleNamespace(id=data["id"], channel=channel)
+
+    def store_view(self, view, message_id):
+        self.store.add_view(view, message_id)
+
+
+class FakeChannel(discord.abc.Messageable):
+    def __init__(self, state):
+        self.id = 42
+        self._state = state
+
+    async def _get_channel(self):
+        return self
+
+
+class FakeDeleter:
+    async def delete_later(self, message, delay):
+        pass
+
+
+def make_cog(tmp_path, monkeypatch, topicos=("armadura",)):
+    for topico in topicos:
+        (tmp_path / f"{topico}.json").write_text(json.dumps({
+            "pergunta": f"quer ver {topico}?",
+            "palavras": [topico],
+            "embed": {"title": topico},
+        }), encoding="utf-8")
+    monkeypatch.setattr(ajuda, "AJUDA_DIR", str(tmp_path))
+    monkeypatch.setattr(ajuda, "COOLDOWN_CANAL", 0)
+    monkeypatch.setattr(ajuda, "COOLDOWN_USUARIO", 0)
+    state = FakeState()
+    bot = SimpleNamespace(add_view=state.store.add_view, deleter=FakeDeleter())
+    cog = AjudaCompletaCog(bot)
+    cog.recarregar()
+    return cog, state
+
+
+def message(state, author_id, content):
+    author = SimpleNamespace(id=author_id, mention=f"<@{author_id}>", bot=False)
+    return SimpleNamespace(content=content, author=author, channel=FakeChannel(state))
+
+
+def test_store_does_not_grow_per_prompt(tmp_path, monkeypatch):
+    async def run():
+        cog, state = make_cog(tmp_path, monkeypatch)
+        antes = (len(state.store._views), len(state.store._synced_message_views))
+        for i in range(200):
+            await cog.handle_message(message(state, i, "minha armadura quebrou"))
+        return cog, state, antes
+
+    cog, state, antes = asyncio.run(run())
+    assert len(state.sent) == 200
+    assert (len(state.store._views), len(state.store._synced_message_views)) == antes
+    ids = {c["custom_id"] for row in state.sent[-1]["components"] for c in row["components"]}
+    assert ids == {"ajuda_completa:sim:armadura", "ajuda_completa:nao:armadura"}
+    # o clique continua caindo na view persistente (chave None)
+    item = state.store._views[None][(2, "ajuda_completa:sim:armadura")]
+    assert item.view is cog.views["armadura"]
+
+
+def test_stop_removes_persistent_view(tmp_path, monkeypatch):
+    async def run():
+        cog, state = make_cog(tmp_path, monkeypatch, ("armadura", "veiculo"))
+        for i in range(10):
+            await cog.handle_message(message(state, i, "cadê meu veiculo"))
+        (tmp_path / "veiculo.json").unlink()
+        cog.recarregar()
+        depois_reload = dict(state.store._views.get(None, {}))
+        for view in cog.views.values():
+            view.stop()
+        return state, depois_reload
+
+    state, depois_reload = asyncio.run(run())
+    assert {cid for _, cid in depois_reload} == {"ajuda_completa:sim:armadura", "ajuda_completa:nao:armadura"}
+    assert state.store._views == {}
+    assert state.store._synced_message_views == {}
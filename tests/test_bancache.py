@@ -0,0 +1,91 @@
+# tests/test_bancache.py
+import random
+from array import array
+
+from utils.bancache import HEADER, MAGIC, BanSet, BloomFilter, load_snapshot, write_snapshot
+
+IDS = [10, 20, 30, 2**63 + 5, 2**64 - 1]
+
+
+def test_banset_overlays():
+    s = BanSet.from_ids(IDS)
+    assert len(s) == 5 and not s.dirty
+
+    s.add(40)
+    s.add(20)                        # já na base: não entra no overlay
+    s.discard(10)
+    s.discard(99)                    # ausente: nada muda
+    assert s.dirty
+    assert 40 in s and 20 in s and 10 not in s and 99 not in s
+    assert len(s) == 5
+    assert sorted(s) == [20, 30, 40, 2**63 + 5, 2**64 - 1]
+
+    s.add(10)                        # volta para a base
+    s.discard(40)                    # sai do overlay de adição
+    assert sorted(s) == sorted(IDS)
+    assert not s.dirty
+    assert s.compact() == array("Q", sorted(IDS))
+
+
+def test_banset_vazio():
+    s = BanSet()
+    assert len(s) == 0 and list(s) == [] and 1 not in s
+    s.add(1)
+    assert list(s) == [1]
+
+
+def test_bloom_sem_falsos_negativos_e_poucos_falsos_positivos():
+    rnd = random.Random(7)
+    ids = sorted(rnd.getrandbits(63) for _ in range(5000))
+    bloom = BloomFilter.build(ids)
+    assert all(bloom.might_contain(uid) for uid in ids)
+    known = set(ids)
+    others = [uid for uid in (rnd.getrandbits(63) for _ in range(5000)) if uid not in known]
+    false_pos = sum(bloom.might_contain(uid) for uid in others)
+    assert false_pos < 5000 * 0.03     # ~1% com 10 bits/ID e k=7
+
+
+def test_banset_com_bloom_equivale_ao_sem():
+    com, sem = BanSet.from_ids(IDS, bloom=True), BanSet.from_ids(IDS)
+    for uid in IDS + [0, 11, 2**63]:
+        assert (uid in com) == (uid in sem)
+
+
+def test_snapshot_ida_e_volta(tmp_path):
+    path = str(tmp_path / "bans.snap")
+    for bloom in (False, True):
+        write_snapshot(path, array("Q", sorted(IDS)), high_water=42, rows=7, bloom=bloom)
+        snap = load_snapshot(path)
+        assert (snap.high_water, snap.rows) == (42, 7)
+        assert sorted(snap.ban_set) == sorted(IDS)
+        assert all(uid in snap.ban_set for uid in IDS) and 11 not in snap.ban_set
+        snap.ban_set.add(11)         # overlay sobre a base mapeada (somente leitura)
+        assert 11 in snap.ban_set and len(snap.ban_set) == 6
+        assert not (tmp_path / "bans.snap.tmp").exists()
+
+
+def test_snapshot_vazio(tmp_path):
+    path = str(tmp_path / "bans.snap")
+    write_snapshot(path, array("Q"), high_water=0, rows=0, bloom=True)
+    snap = load_snapshot(path)
+    assert len(snap.ban_set) == 0 and 1 not in snap.ban_set
+
+
+def test_snapshot_invalido_e_rejeitado(tmp_path):
+    path = tmp_path / "bans.snap"
+    assert load_snapshot(str(path)) is None                        # ausente
+
+    path.write_bytes(b"curto")
+    assert load_snapshot(str(path)) is None                        # menor que o cabeçalho
+
+    write_snapshot(str(path), array("Q", IDS[:3]), 3, 3)
+    good = path.read_bytes()
+    path.write_bytes(b"XXXXXXXX" + good[8:])
+    assert load_snapshot(str(path)) is None                        # magic errado
+
+    path.write_bytes(good[:-4])
+    assert load_snapshot(str(path)) is None                        # truncado
+
+    header = HEADER.pack(MAGIC, 4, 3, 3, 0, 0, 0)                  # diz 4 IDs, tem 3
+    path.write_bytes(header + good[HEADER.size:])
+    assert load_snapshot(str(path)) is None
@@ -0,0 +1,92 @@
+# tests/test_debounce.py
+import asyncio
+import time
+
+from utils.debounce import Debouncer
+
+
+def test_rajada_vira_um_callback_com_o_ultimo_valor():
+    calls = []
+
+    async def cb(key, value):
+        calls.append((key, value))
+
+    async def main():
+        d = Debouncer(0.05, cb)
+        for i in range(5):
+            d.push("a", i)
+            d.push("b", -i)
+            await asyncio.sleep(0.01)
+        assert calls == [] and len(d) == 2
+        await asyncio.sleep(0.1)
+        return d.stats()
+
+    st = asyncio.run(main())
+    assert sorted(calls) == [("a", 4), ("b", -4)]
+    assert st == {"pending": 0, "pushed": 10, "fired": 2}
+
+
+def test_max_delay_limita_a_espera_de_rajadas_longas():
+    fired_at = []
+
+    async def cb(key, value):
+        fired_at.append((time.monotonic(), value))
+
+    async def main():
+        d = Debouncer(0.05, cb, max_delay=0.15)
+        start = time.monotonic()
+        for i in range(20):                    # nunca fica 0.05s quieto
+            d.push("k", i)
+            await asyncio.sleep(0.02)
+        await asyncio.sleep(0.1)
+        return start
+
+    start = asyncio.run(main())
+    first_at, first_value = fired_at[0]
+    assert first_at - start < 0.25             # sem o teto só dispararia após ~0.45s
+    assert 0 < first_value < 19
+    assert fired_at[-1][1] == 19               # o final da rajada também é processado
+    assert len(fired_at) >= 2
+
+
+def test_evento_durante_o_callback_reagenda():
+    calls = []
+
+    async def main():
+        d = None
+
+        async def cb(key, value):
+            calls.append(value)
+            if value == 1:
+                d.push(key, 2)                 # chega enquanto o callback roda
+                await asyncio.sleep(0.02)
+
+        d = Debouncer(0.02, cb)
+        d.push("k", 1)
+        await asyncio.sleep(0.15)
+        return d
+
+    d = asyncio.run(main())
+    assert calls == [1, 2]
+    assert len(d) == 0 and not d._tasks
+
+
+def test_cancel_descarta_pendentes_e_erro_no_callback_nao_trava():
+    calls = []
+
+    async def cb(key, value):
+        calls.append(value)
+        if value == "erro":
+            raise RuntimeError("falhou")
+
+    async def main():
+        d = Debouncer(0.02, cb)
+        d.push("x", "descartado")
+        d.cancel()
+        d.push("y", "erro")
+        await asyncio.sleep(0.05)
+        d.push("y", "depois")
+        await asyncio.sleep(0.05)
+
+    asyncio.run(main())
+    assert calls == ["erro", "depois"]
@@ -0,0 +1,163 @@
+# tests/test_deleter.py
+import asyncio
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+import discord
+import pytest
+from sqlalchemy import delete, func, select
+
+from db import adb, PendingDeletion
+from utils.deleter import DeletionScheduler
+
+
+def snowflake(age: timedelta) -> int:
+    snowflake.n += 1                          # ids distintos no mesmo milissegundo
+    return discord.utils.time_snowflake(discord.utils.utcnow() - age) + snowflake.n
+
+
+snowflake.n = 0
+RECENT = timedelta(minutes=5)
+OLD = timedelta(days=15)
+
+
+class FakeChannel:
+    def __init__(self, channel_id, manage_messages=True):
+        self.id = channel_id
+        self.guild = SimpleNamespace(me=object())
+        self.manage_messages = manage_messages
+        self.bulk = []            # listas de ids por chamada
+        self.single = []
+        self.gone = set()         # já apagadas por alguém
+
+    def permissions_for(self, member):
+        return SimpleNamespace(manage_messages=self.manage_messages)
+
+    async def delete_messages(self, messages):
+        self.bulk.append(sorted(m.id for m in messages))
+
+    def get_partial_message(self, message_id):
+        async def delete():
+            if message_id in self.gone:
+                raise discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "sumiu")
+            self.single.append(message_id)
+        return SimpleNamespace(delete=delete)
+
+
+class FakeBot:
+    def __init__(self, *channels):
+        self.channels = {c.id: c for c in channels}
+
+    async def wait_until_ready(self):
+        pass
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+
+@pytest.fixture(autouse=True)
+def _limpa_pendentes():
+    async def clear():
+        async with adb() as s:
+            await s.execute(delete(PendingDeletion))
+    asyncio.run(clear())
+
+
+async def _pending_rows():
+    async with adb() as s:
+        return await s.scalar(select(func.count()).select_from(PendingDeletion))
+
+
+async def _drain(deleter, timeout=2.0):
+    end = time.monotonic() + timeout
+    while len(deleter) and time.monotonic() < end:
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.05)                 # _forget depois do lote
+
+
+def test_lote_por_canal_com_corte_de_14_dias():
+    a, b = FakeChannel(1), FakeChannel(2)
+    recent_a = [snowflake(RECENT) for _ in range(3)]
+    old_a = [snowflake(OLD) for _ in range(2)]
+    only_b = snowflake(RECENT)
+
+    async def main():
+        deleter = DeletionScheduler(FakeBot(a, b), batch_window=0.2)
+        for mid in recent_a + old_a:
+            await deleter.schedule(1, mid, delay=0.05)
+        await deleter.schedule(2, only_b, delay=0.1)
+        assert await _pending_rows() == 6
+        deleter.start()
+        await _drain(deleter)
+        await deleter.close()
+        return deleter, await _pending_rows()
+
+    deleter, pending = asyncio.run(main())
+    assert a.bulk == [sorted(recent_a)]                        # um bulk só, no mesmo lote
+    assert sorted(a.single) == sorted(old_a)                   # > 14 dias: uma a uma
+    assert b.bulk == [] and b.single == [only_b]               # 1 mensagem não vale bulk
+    assert pending == 0
+    assert deleter.stats() == {"pending": 0, "scheduled": 6, "deleted": 6,
+                               "bulk_calls": 1, "single_calls": 3, "failed": 0}
+
+
+def test_sem_permissao_apaga_uma_a_uma_e_ignora_ja_apagadas():
+    ch = FakeChannel(3, manage_messages=False)
+    ids = [snowflake(RECENT) for _ in range(3)]
+    ch.gone.add(ids[0])
+
+    async def main():
+        deleter = DeletionScheduler(FakeBot(ch), batch_window=0.2)
+        for mid in ids:
+            await deleter.schedule(3, mid, delay=0)
+        deleter.start()
+        await _drain(deleter)
+        await deleter.close()
+        return deleter
+
+    deleter = asyncio.run(main())
+    assert ch.bulk == [] and sorted(ch.single) == sorted(ids[1:])
+    assert deleter.failed == 0
+
+
+def test_pendentes_recarregados_apos_reinicio():
+    ch = FakeChannel(4)
+    due_now, later = snowflake(RECENT), snowflake(RECENT)
+
+    async def main():
+        first = DeletionScheduler(FakeBot(ch))               # nunca iniciado: só persiste
+        await first.schedule(4, due_now, due=time.time() - 60)
+        await first.schedule(4, later, delay=3600)
+        await first.close()
+
+        second = DeletionScheduler(FakeBot(ch), batch_window=0.1)
+        second.start()
+        end = time.monotonic() + 2
+        while not ch.single and time.monotonic() < end:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        pending = len(second)
+        await second.close()
+        return pending, await _pending_rows()
+
+    pending, rows = asyncio.run(main())
+    assert ch.single == [due_now]                            # o vencido sai na hora
+    assert pending == 1 and rows == 1                        # o outro segue agendado e no banco
+
+
+def test_canal_inexistente_nao_trava_o_laco():
+    ch = FakeChannel(5)
+    mid = snowflake(RECENT)
+
+    async def main():
+        deleter = DeletionScheduler(FakeBot(ch), batch_window=0.05)
+        await deleter.schedule(999, snowflake(RECENT), delay=0)
+        await deleter.schedule(5, mid, delay=0.1)
+        deleter.start()
+        await _drain(deleter)
+        await deleter.close()
+        return await _pending_rows()
+
+    assert asyncio.run(main()) == 0
+    assert ch.single == [mid]
@@ -0,0 +1,21 @@
+# tests/test_fanout.py
+import asyncio
+
+from utils.fanout import FanoutExecutor
+
+
+def test_buckets_por_rota_ficam_limitados():
+    async def main():
+        ex = FanoutExecutor(route_rate=1000.0, global_rate=1000.0, max_routes=10)
+
+        async def ok():
+            return 1
+
+        results = await ex.map(range(100), lambda i: ok(), route=lambda i: ("ban", i))
+        return ex, results
+
+    ex, results = asyncio.run(main())
+    assert sum(results.values()) == 100
+    assert ex.calls == 100
+    assert len(ex._routes) == 10          # só as rotas mais recentes
+    assert ("ban", 99) in ex._routes and ("ban", 0) not in ex._routes
@@ -0,0 +1,62 @@
+# tests/test_matcher.py
+from utils.matcher import WordMatcher, trie_regex
+
+
+def test_trie_regex_compartilha_prefixos():
+    assert trie_regex(["casa", "caso", "cas"]) == "cas(?:[ao])?"
+
+
+def test_word_matcher_respeita_limite_de_palavra():
+    m = WordMatcher(["burro", "sua mae"])
+    assert m.search("ele é burro demais").text == "burro"
+    assert m.search("burrooo") is None
+    assert m.search("aburro") is None
+    assert m.search("SUA MAE").text == "SUA MAE"
+
+
+def test_word_matcher_finditer_devolve_offsets():
+    texto = "Ô BURRO, você é um burro"
+    achados = list(WordMatcher(["burro"]).finditer(texto))
+    assert [(a.start, a.end) for a in achados] == [(2, 7), (19, 24)]
+    assert [a.text for a in achados] == ["BURRO", "burro"]
+
+
+def test_word_matcher_vazio():
+    m = WordMatcher(["", "   "])
+    assert len(m) == 0
+    assert m.search("qualquer coisa") is None
+    assert list(m.finditer("qualquer coisa")) == []
+
+
+# ───── modo fuzzy (filtro de palavrões) ─────
+from cogs.profanity import DEFAULT_BLOCKED  # noqa: E402
+from utils.text import fold  # noqa: E402
+
+
+def _profanity():
+    return WordMatcher((fold(w) for w in DEFAULT_BLOCKED), fuzzy=True)
+
+
+def _hits(matcher, texto):
+    return [texto[m.start:m.end] for m in matcher.finditer(fold(texto))]
+
+
+def test_fuzzy_pega_ofuscacoes():
+    m = _profanity()
+    for texto in ("p.o.r.r.a", "porrrra", "p0rra", "P O R R A", "pooorra", "PÔRRA", "p_o-r.r a"):
+        assert _hits(m, texto) == [texto], texto
+
+
+def test_fuzzy_nao_pega_frases_comuns():
+    m = _profanity()
+    for texto in ("vou pôr a mesa", "pôr a culpa nele", "quero por a foto",
+                  "por aqui", "por raiva", "buro"):
+        assert _hits(m, texto) == [], texto
+
+
+def test_fuzzy_nao_avanca_sobre_as_palavras_seguintes():
+    m = _profanity()
+    assert _hits(m, "sua mãe é") == ["sua mãe"]
+    assert _hits(m, "porra 4") == ["porra"]
+    assert _hits(m, "idiota a a a") == ["idiota"]
+    assert _hits(m, "que porra, idiota!") == ["porra", "idiota"]
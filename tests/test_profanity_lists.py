@@ -0,0 +1,96 @@
+# tests/test_profanity_lists.py
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import func, select
+
+from cogs.profanity import DEFAULT_BLOCKED, ProfanityCog
+from db import adb, ProfanityList, ProfanityWord
+
+
+class FakeRouter:
+    def register(self, *args, **kwargs):
+        return object()
+
+    def unregister(self, route):
+        pass
+
+
+class FakeResponse:
+    def __init__(self):
+        self.sent = []
+
+    async def send_message(self, content=None, **kwargs):
+        self.sent.append(content)
+
+
+def _itx(guild_id):
+    return SimpleNamespace(guild_id=guild_id, user=SimpleNamespace(id=1), response=FakeResponse())
+
+
+@pytest.fixture(autouse=True)
+def _cwd(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)                     # journal de avisos fica no tmp
+
+
+async def _loaded_cog():
+    cog = ProfanityCog(SimpleNamespace(router=FakeRouter()))
+    await cog.cog_load()
+    return cog
+
+
+async def _count(model, guild_id):
+    async with adb() as s:
+        return await s.scalar(select(func.count()).select_from(model).filter_by(guild_id=str(guild_id)))
+
+
+def test_lista_esvaziada_continua_vazia_apos_reinicio():
+    gid = 1001
+
+    async def main():
+        cog = await _loaded_cog()
+        for w in DEFAULT_BLOCKED:
+            await cog.palavras_remover.callback(cog, _itx(gid), w)
+        await cog.cog_unload()
+        reloaded = await _loaded_cog()
+        await reloaded.cog_unload()
+        return cog, reloaded
+
+    cog, reloaded = asyncio.run(main())
+    assert cog.guild_words[gid] == ()
+    assert reloaded.guild_words[gid] == ()
+    assert reloaded.matcher_for(gid).search("porra") is None
+
+
+def test_remover_palavra_fora_da_lista_nao_personaliza():
+    gid = 1002
+
+    async def main():
+        cog = await _loaded_cog()
+        itx = _itx(gid)
+        await cog.palavras_remover.callback(cog, itx, "abacaxi")
+        await cog.palavras_adicionar.callback(cog, itx, "porra")     # já é padrão
+        await cog.cog_unload()
+        return cog, itx, await _count(ProfanityList, gid), await _count(ProfanityWord, gid)
+
+    cog, itx, lists, words = asyncio.run(main())
+    assert gid not in cog.guild_words
+    assert (lists, words) == (0, 0)
+    assert all(msg.startswith("ℹ️") for msg in itx.response.sent)
+
+
+def test_primeiras_personalizacoes_simultaneas():
+    gid = 1003
+
+    async def main():
+        cogs = [await _loaded_cog() for _ in range(2)]  # ex.: duas instâncias do bot
+        await asyncio.gather(
+            cogs[0].palavras_adicionar.callback(cogs[0], _itx(gid), "abacaxi"),
+            cogs[1].palavras_adicionar.callback(cogs[1], _itx(gid), "banana"),
+        )
+        for cog in cogs:
+            await cog.cog_unload()
+        return await _count(ProfanityList, gid), await _count(ProfanityWord, gid)
+
+    assert asyncio.run(main()) == (1, len(DEFAULT_BLOCKED) + 2)
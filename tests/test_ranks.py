@@ -0,0 +1,118 @@
+# tests/test_ranks.py
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from sqlalchemy import delete, select
+
+from cogs import ranks
+from cogs.ranks import RanksCog
+from db import adb, RankMonitorConfig, RankSeed
+
+CHANNEL = 7001
+
+
+class FakeRouter:
+    def register(self, *args, **kwargs):
+        return object()
+
+    def unregister(self, route):
+        pass
+
+
+class FakeChannel:
+    id = CHANNEL
+    mention = "#ranking"
+
+    def __init__(self):
+        self.sent = 0
+
+    async def send(self, **kwargs):
+        self.sent += 1
+        return SimpleNamespace(id=9000 + self.sent)
+
+    def get_partial_message(self, message_id):
+        async def noop(**kwargs):
+            pass
+        return SimpleNamespace(id=message_id, edit=noop, delete=noop)
+
+
+def _msg(author_id, bot=True, content=""):
+    return SimpleNamespace(author=SimpleNamespace(id=author_id, bot=bot), content=content)
+
+
+async def _cog():
+    async with adb() as s:
+        if not await s.scalar(select(RankMonitorConfig).filter_by(channel_id=str(CHANNEL))):
+            s.add(RankMonitorConfig(guild_id="1", channel_id=str(CHANNEL), limit_per_clan=100))
+    bot = SimpleNamespace(router=FakeRouter(), user=SimpleNamespace(id=1), get_channel=lambda i: None)
+    cog = RanksCog(bot)
+    await cog.cog_load()
+    return cog
+
+
+def test_alerta_do_proprio_bot_nao_e_ranking():
+    cog = asyncio.run(_cog())
+    assert cog._from_ranking_bot(_msg(42))
+    assert not cog._from_ranking_bot(_msg(1))          # o próprio bot
+    assert not cog._from_ranking_bot(_msg(42, bot=False))
+
+
+def test_mensagem_sem_ranking_nao_desfaz_o_digest():
+    async def main():
+        cog = await _cog()
+        monitor, channel = cog.monitors[CHANNEL], FakeChannel()
+        ranking = "1 Alpha 150\n2 Beta 50"
+        await cog._process(monitor, ranking, channel)
+        digest = monitor.last_digest
+        await cog._process(monitor, "", channel)          # ex.: embed sem conteúdo
+        assert monitor.last_digest == digest
+        parses = cog.parses
+        await cog._process(monitor, ranking, channel)     # mesmo ranking: pulado
+        return cog, parses, channel
+
+    cog, parses, channel = asyncio.run(main())
+    assert cog.parses == parses and cog.parses_skipped == 1
+    assert channel.sent == 1
+
+
+def test_monitor_padrao_so_e_semeado_uma_vez(monkeypatch):
+    seeds = []
+
+    async def fake_seed(self):
+        seeds.append(True)
+        await self._mark_seeded()
+
+    monkeypatch.setattr(RanksCog, "_seed_default", fake_seed)
+
+    async def load():
+        cog = RanksCog(SimpleNamespace(router=FakeRouter(), user=SimpleNamespace(id=1)))
+        await cog.cog_load()
+        await asyncio.sleep(0)                            # deixa a task de seed rodar
+        return cog
+
+    async def main():
+        async with adb() as s:
+            await s.execute(delete(RankMonitorConfig))
+            await s.execute(delete(RankSeed))
+        await load()                                      # primeira execução: semeia
+        await load()                                      # tabela vazia de propósito: não semeia de novo
+        async with adb() as s:
+            return await s.scalar(select(RankSeed.channel_id))
+
+    assert asyncio.run(main()) == str(ranks.CHANNEL_ID)
+    assert seeds == [True]
+
+
+def test_instalacao_antiga_com_monitores_so_ganha_a_marca(monkeypatch):
+    monkeypatch.setattr(RanksCog, "_seed_default", lambda self: pytest.fail("não deveria semear"))
+
+    async def main():
+        async with adb() as s:
+            await s.execute(delete(RankSeed))
+        await _cog()                                      # já há um monitor configurado
+        async with adb() as s:
+            return await s.scalar(select(RankSeed.channel_id))
+
+    assert asyncio.run(main()) == str(ranks.CHANNEL_ID)
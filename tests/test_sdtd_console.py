@@ -0,0 +1,87 @@
+# tests/test_sdtd_console.py
+import asyncio
+
+import pytest
+
+from utils.fake_sdtd_console import FakeConsole
+from utils.sdtd_console import ConsoleError, ConsolePool, TelnetConsole
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 10))
+
+
+def test_pipeline_numa_conexao_so():
+    async def main():
+        server = await FakeConsole(players=["Ana", "Beto"], log_interval=0.001, delay=0.005).start()
+        console = TelnetConsole(server.host, server.port, "segredo", timeout=5)
+        try:
+            results = await asyncio.gather(*(
+                console.list_players() if i % 2 == 0 else console.execute("gettime")
+                for i in range(20)
+            ))
+            return server, console, results
+        finally:
+            await console.close()
+            await server.close()
+
+    server, console, results = run(main())
+    assert server.connections == 1 and console.connects == 1
+    for i, result in enumerate(results):
+        assert result == ((2, ["Ana", "Beto"]) if i % 2 == 0 else ["Day 7, 21:00"])
+
+
+def test_senha_errada():
+    async def main():
+        server = await FakeConsole(password="segredo").start()
+        console = TelnetConsole(server.host, server.port, "errada", timeout=5)
+        try:
+            with pytest.raises(ConsoleError, match="senha"):
+                await console.execute("gettime")
+            # backoff: a próxima tentativa nem abre conexão
+            with pytest.raises(ConsoleError, match="indisponível"):
+                await console.execute("gettime")
+            return server.connections
+        finally:
+            await server.close()
+
+    assert run(main()) == 1
+
+
+def test_reconecta_depois_de_reiniciar_o_servidor():
+    async def main():
+        server = await FakeConsole(players=["Ana"]).start()
+        console = TelnetConsole(server.host, server.port, "segredo", timeout=5)
+        try:
+            assert await console.list_players() == (1, ["Ana"])
+            await server.close()
+            server.players = ["Ana", "Beto"]
+            await server.start()                     # mesma porta
+            for _ in range(50):                      # o read loop percebe o EOF
+                if not console.connected:
+                    break
+                await asyncio.sleep(0.01)
+            assert await console.list_players() == (2, ["Ana", "Beto"])
+            return console.connects, server.connections
+        finally:
+            await console.close()
+            await server.close()
+
+    assert run(main()) == (2, 2)
+
+
+def test_sem_senha_e_pool():
+    async def main():
+        server = await FakeConsole(password=None, players=["Caio"]).start()
+        pool = ConsolePool(timeout=5)
+        try:
+            console = pool.get(server.host, server.port, None)
+            assert pool.get(server.host, server.port, None) is console
+            assert await console.list_players() == (1, ["Caio"])
+            assert await console.execute("xyz") == ["*** ERROR: unknown command 'xyz'"]
+            return pool.stats()
+        finally:
+            await pool.close()
+            await server.close()
+
+    assert run(main()) == {"servers": 1, "connected": 1, "connects": 1, "commands": 2}
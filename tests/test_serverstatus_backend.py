@@ -0,0 +1,88 @@
+# tests/test_serverstatus_backend.py
+import asyncio
+
+import pytest
+
+from cogs.serverstatus import ServerStatusCog
+from utils import crypto
+
+
+def _cog(listed_ip, dns):
+    cog = ServerStatusCog.__new__(ServerStatusCog)
+
+    async def fetch_data(server_key):
+        return {"ip": listed_ip}
+
+    async def resolve(host, port):
+        if host not in dns:
+            raise OSError("não resolve")
+        return set(dns[host])
+
+    cog.fetch_data = fetch_data
+    cog._resolve = resolve
+    return cog
+
+
+DNS = {
+    "8.8.8.8": ["8.8.8.8"],
+    "1.1.1.1": ["1.1.1.1"],
+    "localhost": ["127.0.0.1"],
+    "10.0.0.5": ["10.0.0.5"],
+    "misto.exemplo.com": ["8.8.8.8", "192.168.0.2"],
+    "dns.exemplo.com": ["8.8.8.8"],
+}
+
+
+def check(cog, host):
+    return asyncio.run(cog._check_console_host("key", host, 8081))
+
+
+@pytest.mark.parametrize("ip,public", [
+    ("8.8.8.8", True), ("127.0.0.1", False), ("10.1.2.3", False), ("192.168.0.1", False),
+    ("169.254.169.254", False), ("0.0.0.0", False), ("::1", False), ("fe80::1%eth0", False),
+    ("2001:4860:4860::8888", True),
+])
+def test_is_public(ip, public):
+    assert ServerStatusCog._is_public(ip) is public
+
+
+def test_aceita_so_o_ip_da_listagem():
+    cog = _cog("8.8.8.8", DNS)
+    assert check(cog, "8.8.8.8") == "8.8.8.8"
+    assert check(cog, "dns.exemplo.com") == "8.8.8.8"          # nome que resolve para o IP listado
+    with pytest.raises(ValueError, match="listagem"):
+        check(cog, "1.1.1.1")
+
+
+@pytest.mark.parametrize("host", ["localhost", "10.0.0.5", "misto.exemplo.com"])
+def test_recusa_enderecos_internos(host):
+    with pytest.raises(ValueError, match="privados"):
+        check(_cog("8.8.8.8", DNS), host)
+
+
+def test_recusa_sem_ip_na_listagem_ou_host_invalido():
+    with pytest.raises(ValueError, match="não informou"):
+        check(_cog("N/A", DNS), "8.8.8.8")
+    with pytest.raises(ValueError, match="resolver"):
+        check(_cog("8.8.8.8", DNS), "nao.existe")
+
+
+def test_senha_sem_chave_nao_cifra(monkeypatch):
+    monkeypatch.delenv("BOT_SECRET_KEY", raising=False)
+    assert not crypto.available()
+    with pytest.raises(crypto.SecretError):
+        crypto.encrypt("segredo")
+    assert crypto.decrypt("legado") == "legado"                # texto puro antigo
+    assert crypto.encrypt(None) is None and crypto.decrypt(None) is None
+
+
+def test_senha_cifrada_ida_e_volta(monkeypatch):
+    pytest.importorskip("nacl")
+    monkeypatch.setenv("BOT_SECRET_KEY", "chave de teste")
+    sealed = crypto.encrypt("segredo")
+    assert sealed.startswith(crypto.PREFIX) and "segredo" not in sealed
+    assert crypto.encrypt("segredo") != sealed                 # nonce aleatório
+    assert crypto.decrypt(sealed) == "segredo"
+    monkeypatch.setenv("BOT_SECRET_KEY", "outra chave")
+    with pytest.raises(crypto.SecretError):
+        crypto.decrypt(sealed)
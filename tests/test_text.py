@@ -0,0 +1,27 @@
+# tests/test_text.py
+from utils.matcher import WordMatcher
+from utils.text import ACCENT_TABLE, fold
+
+
+def test_fold_preserva_comprimento_e_offsets():
+    texto = "Ｐｏｒｒａ, ÇÃO é ÓTIMO — раu 4ç0"
+    dobrado = fold(texto)
+    assert len(dobrado) == len(texto)
+    assert dobrado == "porra, cao e otimo — pau aco"
+
+
+def test_fold_leet_e_confusaveis():
+    assert fold("p0rr@") == "porra"
+    assert fold("$3nh4") == "senha"
+    assert fold("ѕоса") == "soca"          # cirílico
+
+
+def test_accent_table_nao_aplica_leet():
+    assert "p0rra".translate(ACCENT_TABLE) == "p0rra"
+    assert "Ação".translate(ACCENT_TABLE) == "acao"
+
+
+def test_offsets_do_texto_dobrado_valem_no_original():
+    texto = "Ô BURRO, você é um bürro"
+    achados = list(WordMatcher(["burro"]).finditer(fold(texto)))
+    assert [texto[a.start:a.end] for a in achados] == ["BURRO", "bürro"]
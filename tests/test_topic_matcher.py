@@ -0,0 +1,24 @@
+# tests/test_topic_matcher.py
+from utils.matcher import TopicMatcher, WordMatcher
+
+
+def test_word_matcher_prefixo():
+    m = WordMatcher(["veiculo", "forja"], prefix=True)
+    assert m.search("meus veiculos sumiram").text == "veiculo"
+    assert m.search("como forjar") is not None
+    assert m.search("aforja") is None
+
+
+def test_topic_matcher_escolhe_o_topico_com_mais_texto_casado():
+    t = TopicMatcher({
+        "armaduras": ["armadura", "colete"],
+        "veiculos": ["moto", "bicicleta", "gasolina"],
+    })
+    assert t.best("onde acho gasolina pra moto?") == "veiculos"
+    assert t.scores("armaduras e coletes") == {"armaduras": len("armadura") + len("colete")}
+    assert t.best("nada a ver") is None
+
+
+def test_topic_matcher_empate_fica_com_o_primeiro_encontrado():
+    t = TopicMatcher({"a": ["moto"], "b": ["bota"]})
+    assert t.best("bota e moto") == "b"
@@ -0,0 +1,120 @@
+# tests/test_translate_cache.py
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from utils.translate_cache import TranslationCache, make_key
+
+
+class FakeTranslator:
+    """Tradutor síncrono que registra as chamadas (no lugar do GoogleTranslator)."""
+    calls = []
+
+    def __init__(self, lang):
+        self.lang = lang
+
+    def translate(self, text):
+        time.sleep(0.02)
+        FakeTranslator.calls.append((self.lang, text))
+        if text == "boom":
+            raise RuntimeError("falha na rede")
+        return f"[{self.lang}] {text.upper()}"
+
+
+@pytest.fixture(autouse=True)
+def _zera_chamadas():
+    FakeTranslator.calls = []
+
+
+def _cache(tmp_path, **kw):
+    kw.setdefault("max_bytes", 1_000_000)
+    return TranslationCache(FakeTranslator, str(tmp_path / "t.sqlite3"), **kw)
+
+
+def test_chave_ignora_espacos_mas_nao_o_idioma():
+    assert make_key("olá  mundo ", "en") == make_key(" olá mundo", "en")
+    assert make_key("olá mundo", "en") != make_key("olá mundo", "es")
+    assert make_key("a\nb", "en") != make_key("a b", "en")
+
+
+def test_pedidos_simultaneos_viram_uma_traducao(tmp_path):
+    async def main():
+        cache = _cache(tmp_path)
+        results = await asyncio.gather(*(cache.translate("olá  mundo", "en") for _ in range(5)))
+        again = await cache.translate(" olá mundo ", "en")      # memória
+        cache.close()
+        return results, again, cache.stats()
+
+    results, again, st = asyncio.run(main())
+    assert set(results) == {again} == {"[en] OLÁ  MUNDO"}
+    assert len(FakeTranslator.calls) == 1
+    assert (st["misses"], st["coalesced"], st["memory_hits"]) == (1, 4, 1)
+    assert st["hit_rate"] == pytest.approx(5 / 6)
+
+
+def test_lru_em_memoria_e_disco_apos_reabrir(tmp_path):
+    async def main():
+        cache = _cache(tmp_path, memory_size=2)
+        for i in range(4):
+            await cache.translate(f"t{i}", "es")
+        await cache.translate("t0", "es")           # saiu da LRU: vem do disco
+        first = cache.stats()
+        cache.close()
+
+        reopened = _cache(tmp_path, memory_size=2)
+        value = await reopened.translate("t3", "es")
+        second = reopened.stats()
+        reopened.close()
+        return first, value, second
+
+    first, value, second = asyncio.run(main())
+    assert len(FakeTranslator.calls) == 4
+    assert (first["disk_hits"], first["memory_size"], first["disk_rows"]) == (1, 2, 4)
+    assert value == "[es] T3"
+    assert (second["disk_hits"], second["misses"]) == (1, 0)
+
+
+def test_disco_descarta_os_menos_usados_ao_passar_do_limite(tmp_path):
+    async def main():
+        cache = _cache(tmp_path, max_bytes=2000, memory_size=1)
+        for i in range(30):
+            await cache.translate(f"x{i}" * 20, "en")
+        st = cache.stats()
+        cache.close()
+        return st
+
+    st = asyncio.run(main())
+    assert st["disk_bytes"] <= 2000 and st["disk_evicted"] > 0
+    assert st["disk_rows"] + st["disk_evicted"] == 30
+    with sqlite3.connect(tmp_path / "t.sqlite3") as db:
+        rows, total = db.execute("SELECT COUNT(*), SUM(size) FROM translations").fetchone()
+    assert (rows, total) == (st["disk_rows"], st["disk_bytes"])
+
+
+def test_erro_propaga_e_nao_fica_em_cache(tmp_path):
+    async def main():
+        cache = _cache(tmp_path)
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await cache.translate("boom", "pt")
+        st = cache.stats()
+        cache.close()
+        return st
+
+    st = asyncio.run(main())
+    assert len(FakeTranslator.calls) == 2
+    assert (st["errors"], st["disk_rows"]) == (2, 0)
+
+
+def test_tradutores_reaproveitados_por_idioma(tmp_path):
+    async def main():
+        cache = _cache(tmp_path, per_lang=2)
+        await asyncio.gather(*(cache.translate(f"frase {i}", "en") for i in range(6)))
+        await cache.translate("outra", "es")
+        st = cache.stats()
+        cache.close()
+        return st
+
+    assert asyncio.run(main())["translators"] == 3
@@ -0,0 +1,157 @@
+# utils/bancache.py
+"""
+Cache compacto de IDs banidos globalmente.
+
+Em vez de um ``set`` de ints (~70 bytes por ID), a base fica num vetor ordenado
+de uint64 (8 bytes por ID) com busca binária, opcionalmente precedido de um
+Bloom filter para responder "não banido" sem tocar no vetor.
+
+A base é persistida num snapshot que é aberto com ``mmap`` no startup (nada é
+copiado para a heap); adições/remoções posteriores ficam em pequenos conjuntos
+de overlay até o próximo snapshot.
+
+Formato do arquivo (inteiros nativos, o snapshot é local à máquina):
+    cabeçalho  <8s Q Q Q Q I I>  magic, n_ids, high_water, rows, bloom_bytes, bloom_k, reservado
+    n_ids * uint64               IDs ordenados
+    bloom_bytes                  bits do Bloom filter (opcional)
+"""
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator, Optional, Sequence
+
+MAGIC = b"GBANSNP1"
+HEADER = struct.Struct("<8sQQQQII")   # 48 bytes: mantém o vetor alinhado em 8
+_MASK = (1 << 64) - 1
+
+
+class BloomFilter:
+    """Bloom filter sobre ints de 64 bits (hash duplo multiplicativo)."""
+
+    def __init__(self, bits, k: int):
+        self.bits = bits                 # bytearray ou memoryview (mmap)
+        self.m = len(bits) * 8
+        self.k = k
+
+    @classmethod
+    def build(cls, ids: Sequence[int], bits_per_id: int = 10, k: int = 7) -> "BloomFilter":
+        size = max(8, (len(ids) * bits_per_id + 7) // 8)
+        bloom = cls(bytearray(size), k)
+        for uid in ids:
+            for pos in bloom._positions(uid):
+                bloom.bits[pos >> 3] |= 1 << (pos & 7)
+        return bloom
+
+    def _positions(self, uid: int) -> Iterator[int]:
+        h1 = (uid * 0x9E3779B97F4A7C15) & _MASK
+        h2 = ((uid ^ (uid >> 31)) * 0xBF58476D1CE4E5B9) & _MASK | 1
+        for i in range(self.k):
+            yield ((h1 + i * h2) & _MASK) % self.m
+
+    def might_contain(self, uid: int) -> bool:
+        # laço explícito: sai no primeiro bit zerado (o caso comum para não banidos)
+        bits, m = self.bits, self.m
+        h1 = (uid * 0x9E3779B97F4A7C15) & _MASK
+        h2 = ((uid ^ (uid >> 31)) * 0xBF58476D1CE4E5B9) & _MASK | 1
+        for i in range(self.k):
+            pos = ((h1 + i * h2) & _MASK) % m
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+
+class BanSet:
+    """Conjunto de IDs: base ordenada imutável + overlays de adição/remoção."""
+
+    def __init__(self, base: Optional[Sequence[int]] = None, bloom: Optional[BloomFilter] = None):
+        self._base = base if base is not None else array("Q")
+        self._bloom = bloom
+        self._added = set()
+        self._removed = set()
+
+    @classmethod
+    def from_ids(cls, ids: Iterable[int], bloom: bool = False) -> "BanSet":
+        base = array("Q", sorted(set(ids)))
+        return cls(base, BloomFilter.build(base) if bloom else None)
+
+    def _in_base(self, uid: int) -> bool:
+        if self._bloom is not None and not self._bloom.might_contain(uid):
+            return False
+        base = self._base
+        i = bisect_left(base, uid)
+        return i < len(base) and base[i] == uid
+
+    def __contains__(self, uid: int) -> bool:
+        if uid in self._added:
+            return True
+        return uid not in self._removed and self._in_base(uid)
+
+    def add(self, uid: int):
+        self._removed.discard(uid)
+        if not self._in_base(uid):
+            self._added.add(uid)
+
+    def discard(self, uid: int):
+        self._added.discard(uid)
+        if self._in_base(uid):
+            self._removed.add(uid)
+
+    def __len__(self) -> int:
+        return len(self._base) - len(self._removed) + len(self._added)
+
+    def __iter__(self) -> Iterator[int]:
+        removed = self._removed
+        for uid in self._base:
+            if uid not in removed:
+                yield uid
+        yield from self._added
+
+    @property
+    def dirty(self) -> bool:
+        """Há mudanças fora da base (vale gravar um snapshot novo)."""
+        return bool(self._added or self._removed)
+
+    def compact(self) -> array:
+        return array("Q", sorted(self))
+
+
+# ───────────────────────── snapshot ─────────────────────────
+class Snapshot:
+    """Snapshot aberto via mmap. Mantenha a referência viva enquanto usar ``ban_set``."""
+
+    def __init__(self, path: str, mm: mmap.mmap, ban_set: BanSet, high_water: int, rows: int):
+        self.path = path
+        self._mm = mm
+        self.ban_set = ban_set
+        self.high_water = high_water   # maior GlobalBan.id incluído
+        self.rows = rows               # nº de linhas de GlobalBan com id <= high_water
+
+
+def load_snapshot(path: str) -> Optional[Snapshot]:
+    """Abre o snapshot sem copiar os IDs para a heap; None se ausente/inválido."""
+    if not os.path.isfile(path) or os.path.getsize(path) < HEADER.size:
+        return None
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, n_ids, high_water, rows, bloom_bytes, bloom_k, _ = HEADER.unpack_from(mm, 0)
+    ids_end = HEADER.size + n_ids * 8
+    if magic != MAGIC or len(mm) != ids_end + bloom_bytes:
+        mm.close()
+        return None
+    view = memoryview(mm)
+    base = view[HEADER.size:ids_end].cast("Q")
+    bloom = BloomFilter(view[ids_end:], bloom_k) if bloom_bytes else None
+    return Snapshot(path, mm, BanSet(base, bloom), high_water, rows)
+
+
+def write_snapshot(path: str, ids: array, high_water: int, rows: int, bloom: bool = False):
+    """Grava atomicamente (tmp + os.replace); mmaps antigos continuam válidos."""
+    bits = BloomFilter.build(ids).bits if bloom and len(ids) else b""
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(ids), high_water, rows, len(bits), 7 if bits else 0, 0))
+        f.write(ids.tobytes())
+        f.write(bits)
+    os.replace(tmp, path)
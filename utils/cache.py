@@ -0,0 +1,127 @@
+# utils/cache.py
+"""Caches em memória compartilhados pelos cogs."""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class LRUCache:
+    """Dicionário limitado que descarta o item usado há mais tempo."""
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+class TTLCache:
+    """
+    Cache assíncrono com validade (TTL) e single-flight.
+
+    Chamadas simultâneas para a mesma chave expirada compartilham UMA carga em
+    voo. Se a carga falhar e houver um valor com menos de ``ttl + stale_ttl``,
+    ele é devolvido (stale) em vez do erro.
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float = 0.0):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._data: Dict[Hashable, Tuple[Any, float]] = {}   # chave -> (valor, monotonic da carga)
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0       # cargas de fato (chamadas ao upstream)
+        self.coalesced = 0    # chamadas que pegaram carona numa carga em voo
+        self.stale = 0        # erros respondidos com valor vencido
+        self.errors = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def age(self, key: Hashable) -> float:
+        """Segundos desde a última carga bem-sucedida (inf se nunca)."""
+        entry = self._data.get(key)
+        return time.monotonic() - entry[1] if entry else float("inf")
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._data.get(key)
+        if entry is not None and time.monotonic() - entry[1] < self.ttl:
+            self.hits += 1
+            return entry[0]
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = self._inflight[key] = asyncio.create_task(self._load(key, loader))
+        else:
+            self.coalesced += 1
+        # shield: um chamador cancelado não cancela a carga dos outros
+        return await asyncio.shield(task)
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await loader()
+        except Exception:
+            self.errors += 1
+            entry = self._data.get(key)
+            if entry is not None and time.monotonic() - entry[1] < self.ttl + self.stale_ttl:
+                self.stale += 1
+                return entry[0]
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        self._data[key] = (value, time.monotonic())
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses + self.coalesced
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "stale": self.stale,
+            "errors": self.errors,
+            "hit_rate": (self.hits + self.coalesced) / total if total else 0.0,
+        }
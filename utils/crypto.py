@@ -0,0 +1,59 @@
+# utils/crypto.py
+"""
+Segredos guardados no banco (ex.: senha do console telnet).
+
+Cifrados com ``SecretBox`` (XSalsa20-Poly1305) do PyNaCl, que já vem com o
+discord.py para voz. A chave vem de ``BOT_SECRET_KEY`` (qualquer texto; é
+derivada para 32 bytes com BLAKE2b). O valor gravado fica como
+``enc1:<base64>``; sem o prefixo é um valor antigo em texto puro, devolvido
+como está (e cifrado na próxima gravação).
+"""
+import base64
+import hashlib
+import os
+from typing import Optional
+
+try:
+    import nacl.exceptions
+    import nacl.secret
+except ImportError:          # PyNaCl ausente: sem como cifrar
+    nacl = None
+
+PREFIX = "enc1:"
+
+
+class SecretError(Exception):
+    """Sem chave/PyNaCl para cifrar, ou valor cifrado com outra chave."""
+
+
+def _box():
+    key = os.getenv("BOT_SECRET_KEY")
+    if not key:
+        raise SecretError("defina BOT_SECRET_KEY para guardar senhas")
+    if nacl is None:
+        raise SecretError("PyNaCl não instalado")
+    return nacl.secret.SecretBox(hashlib.blake2b(key.encode(), digest_size=32).digest())
+
+
+def available() -> bool:
+    try:
+        _box()
+    except SecretError:
+        return False
+    return True
+
+
+def encrypt(text: Optional[str]) -> Optional[str]:
+    if not text:
+        return text
+    return PREFIX + base64.b64encode(bytes(_box().encrypt(text.encode()))).decode()
+
+
+def decrypt(value: Optional[str]) -> Optional[str]:
+    if not value or not value.startswith(PREFIX):
+        return value
+    box = _box()
+    try:
+        return box.decrypt(base64.b64decode(value[len(PREFIX):])).decode()
+    except (ValueError, nacl.exceptions.CryptoError) as e:
+        raise SecretError("senha cifrada com outra chave (BOT_SECRET_KEY mudou?)") from e
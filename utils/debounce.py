@@ -0,0 +1,77 @@
+# utils/debounce.py
+"""
+Debouncer por chave: junta rajadas de eventos num único processamento.
+
+Cada ``push(chave, valor)`` guarda só o valor mais recente e empurra o prazo
+para ``delay`` segundos depois. Quando a chave fica quieta por ``delay``
+(ou a rajada passa de ``max_delay``), o callback roda UMA vez com o último
+valor. Há no máximo uma task por chave: novos eventos só mudam o prazo, sem
+criar nem cancelar tasks.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Debouncer:
+    def __init__(self, delay: float, callback: Callable[[Hashable, Any], Awaitable[None]],
+                 max_delay: Optional[float] = None):
+        self.delay = delay
+        self.max_delay = max_delay
+        self.callback = callback
+        self._pending: Dict[Hashable, list] = {}       # chave -> [valor, prazo, início]
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        self.pushed = 0
+        self.fired = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def push(self, key: Hashable, value: Any):
+        now = time.monotonic()
+        self.pushed += 1
+        entry = self._pending.get(key)
+        if entry is None:
+            self._pending[key] = [value, now + self.delay, now]
+        else:
+            entry[0] = value
+            entry[1] = now + self.delay
+        if key not in self._tasks:
+            self._tasks[key] = asyncio.create_task(self._run(key))
+
+    def _deadline(self, entry: list) -> float:
+        if self.max_delay is None:
+            return entry[1]
+        return min(entry[1], entry[2] + self.max_delay)
+
+    async def _run(self, key: Hashable):
+        try:
+            while True:
+                wait = self._deadline(self._pending[key]) - time.monotonic()
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            value = self._pending.pop(key)[0]
+            self.fired += 1
+            await self.callback(key, value)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Erro no callback do debouncer (chave %r)", key)
+        finally:
+            self._tasks.pop(key, None)
+            # chegou evento durante o callback: agenda de novo
+            if key in self._pending and key not in self._tasks:
+                self._tasks[key] = asyncio.create_task(self._run(key))
+
+    def cancel(self):
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+        self._pending.clear()
+
+    def stats(self) -> dict:
+        return {"pending": len(self._pending), "pushed": self.pushed, "fired": self.fired}
@@ -0,0 +1,178 @@
+# utils/deleter.py
+"""
+Agendador central de exclusões de mensagens (``bot.deleter``).
+
+Substitui o padrão "manda a mensagem, dorme N segundos, apaga" que deixava
+uma coroutine viva por mensagem. Aqui há um heap único de (vencimento,
+canal, mensagem) e uma task que acorda no próximo vencimento:
+
+* o que vence dentro de ``batch_window`` segundos sai junto, agrupado por
+  canal, em ``delete_messages`` (bulk, até 100 por chamada) quando o bot
+  tem Gerenciar Mensagens; senão, uma a uma;
+* cada agendamento é gravado em ``pending_deletions``: após um reinício,
+  ``start()`` recarrega o que ficou pendente (o vencido sai na hora).
+"""
+import asyncio
+import heapq
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+import discord
+from sqlalchemy import delete, select
+
+from db import adb, upsert, PendingDeletion
+
+logger = logging.getLogger(__name__)
+
+BULK_MAX = 100                      # limite do endpoint de bulk delete
+BULK_MAX_AGE = timedelta(days=14)   # o Discord recusa bulk de mensagens mais velhas
+
+
+class DeletionScheduler:
+    def __init__(self, bot: discord.Client, batch_window: float = 1.0):
+        self.bot = bot
+        self.batch_window = batch_window
+        self._heap: List[tuple] = []            # (vencimento unix, channel_id, message_id)
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.scheduled = 0
+        self.deleted = 0
+        self.bulk_calls = 0
+        self.single_calls = 0
+        self.failed = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    # ───── ciclo de vida ─────
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        # o que não venceu continua no banco e volta no próximo start()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    # ───── API ─────
+    async def schedule(self, channel_id: int, message_id: int, delay: float = None, due: float = None):
+        """Apaga a mensagem em ``delay`` segundos (ou no instante unix ``due``)."""
+        due = due if due is not None else time.time() + (delay or 0)
+        try:
+            async with adb() as s:
+                await s.run_sync(upsert, PendingDeletion, [{
+                    "channel_id": str(channel_id), "message_id": str(message_id),
+                    "due_at": datetime.fromtimestamp(due, timezone.utc).replace(tzinfo=None),
+                }], ["message_id"], ["channel_id", "due_at"])
+        except Exception:
+            # sem banco a exclusão ainda acontece; só não sobrevive a um reinício
+            logger.exception("[Deleter] falha ao persistir exclusão agendada")
+        self._push(due, int(channel_id), int(message_id))
+
+    async def delete_later(self, message: discord.abc.Snowflake, delay: float):
+        """Atalho para uma mensagem já enviada (Message, InteractionMessage…)."""
+        await self.schedule(message.channel.id, message.id, delay)
+
+    def _push(self, due: float, channel_id: int, message_id: int):
+        heapq.heappush(self._heap, (due, channel_id, message_id))
+        self.scheduled += 1
+        self._wakeup.set()
+
+    # ───── laço ─────
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        await self._load()
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+            wait = self._heap[0][0] - time.time()
+            if wait > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            horizon = time.time() + self.batch_window
+            batch: Dict[int, List[int]] = defaultdict(list)
+            while self._heap and self._heap[0][0] <= horizon:
+                _, channel_id, message_id = heapq.heappop(self._heap)
+                if message_id not in batch[channel_id]:
+                    batch[channel_id].append(message_id)
+            for channel_id, ids in batch.items():
+                try:
+                    await self._delete_channel(channel_id, ids)
+                except Exception:
+                    self.failed += len(ids)
+                    logger.exception(f"[Deleter] erro apagando {len(ids)} mensagens em {channel_id}")
+            await self._forget(mid for ids in batch.values() for mid in ids)
+
+    async def _load(self):
+        try:
+            async with adb() as s:
+                rows = list(await s.scalars(select(PendingDeletion)))
+        except Exception:
+            logger.exception("[Deleter] falha ao carregar exclusões pendentes")
+            return
+        # o que foi agendado antes do start() já está no heap e também no banco
+        queued = {message_id for _, _, message_id in self._heap}
+        rows = [row for row in rows if int(row.message_id) not in queued]
+        for row in rows:
+            due = row.due_at.replace(tzinfo=timezone.utc).timestamp()
+            self._push(due, int(row.channel_id), int(row.message_id))
+        if rows:
+            logger.info(f"[Deleter] {len(rows)} exclusões pendentes recarregadas")
+
+    async def _forget(self, message_ids: Iterable[int]):
+        ids = [str(m) for m in message_ids]
+        if not ids:
+            return
+        try:
+            async with adb() as s:
+                await s.execute(delete(PendingDeletion).where(PendingDeletion.message_id.in_(ids)))
+        except Exception:
+            logger.exception("[Deleter] falha ao limpar exclusões concluídas")
+
+    async def _delete_channel(self, channel_id: int, ids: List[int]):
+        channel = self.bot.get_channel(channel_id)
+        if channel is None or not hasattr(channel, "get_partial_message"):
+            return                              # canal apagado/inacessível: nada a fazer
+        can_bulk = (
+            hasattr(channel, "delete_messages")
+            and getattr(channel, "guild", None) is not None
+            and channel.permissions_for(channel.guild.me).manage_messages
+        )
+        cutoff = discord.utils.utcnow() - BULK_MAX_AGE + timedelta(minutes=1)
+        recent = [i for i in ids if discord.utils.snowflake_time(i) > cutoff] if can_bulk else []
+        singles = [i for i in ids if i not in recent]
+        for start in range(0, len(recent), BULK_MAX):
+            chunk = recent[start:start + BULK_MAX]
+            if len(chunk) == 1:
+                singles += chunk
+                continue
+            try:
+                await channel.delete_messages([discord.Object(id=i) for i in chunk])
+                self.bulk_calls += 1
+                self.deleted += len(chunk)
+            except discord.HTTPException:
+                singles += chunk                # ex.: permissão mudou no meio; tenta uma a uma
+        for message_id in singles:
+            try:
+                await channel.get_partial_message(message_id).delete()
+                self.single_calls += 1
+                self.deleted += 1
+            except discord.NotFound:
+                pass                            # já apagada por alguém
+            except discord.HTTPException:
+                self.failed += 1
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._heap), "scheduled": self.scheduled, "deleted": self.deleted,
+            "bulk_calls": self.bulk_calls, "single_calls": self.single_calls, "failed": self.failed,
+        }
@@ -0,0 +1,131 @@
+# utils/fake_sdtd_console.py
+"""
+Console telnet falso do 7 Days to Die, para testar o backend telnet sem jogo.
+
+Imita o que o cliente usa: prompt de senha, ``lp``/``listplayers``,
+``gettime``, ``*** ERROR: unknown command`` e linhas de log intercaladas
+(uma a cada ``log_interval`` segundos em cada conexão, como o jogo faz).
+
+    python -m utils.fake_sdtd_console --port 8081 --password segredo --players "Ana,Beto"
+
+Em código: ``server = await FakeConsole(...).start()``; ``server.players`` pode
+ser alterado com o servidor rodando. ``close()`` derruba também as conexões
+abertas e ``start()`` de novo reabre na mesma porta (simula um reinício).
+"""
+import argparse
+import asyncio
+import random
+from datetime import datetime
+from typing import List, Optional, Set
+
+
+class FakeConsole:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, password: Optional[str] = "segredo",
+                 players: Optional[List[str]] = None, log_interval: float = 0.0, delay: float = 0.0):
+        self.host = host
+        self.port = port
+        self.password = password
+        self.players = list(players or [])
+        self.log_interval = log_interval    # >0: uma linha de log a cada N segundos por conexão
+        self.delay = delay                  # atraso artificial por comando
+        self.connections = 0
+        self.commands = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: Set[asyncio.StreamWriter] = set()
+
+    async def start(self) -> "FakeConsole":
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def _log(self, text: str) -> str:
+        now = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+        return f"{now} {random.uniform(1, 9999):.3f} INF {text}\r\n"
+
+    def _run(self, command: str) -> str:
+        name = command.split(" ", 1)[0].lower()
+        if name in ("lp", "listplayers"):
+            lines = [
+                f"{i}. id={171 + i}, {p}, pos=({i}.0, 61.0, -{i}.5), rot=(0.0, 90.0, 0.0), remote=True, "
+                f"health=100, deaths=0, zombies=0, players=0, score=0, level=1, "
+                f"pltfmid=Steam_7656119800000000{i}, ip=127.0.0.1, ping=30"
+                for i, p in enumerate(self.players)
+            ]
+            lines.append(f"Total of {len(self.players)} in the game")
+            return "".join(line + "\r\n" for line in lines)
+        if name == "gettime":
+            return "Day 7, 21:00\r\n"
+        return f"*** ERROR: unknown command '{command}'\r\n"
+
+    async def _spam_logs(self, writer: asyncio.StreamWriter):
+        while not writer.is_closing():
+            await asyncio.sleep(self.log_interval)
+            writer.write(self._log("Time: 123.45m FPS: 38.21 Heap: 2500.1MB Zom: 12 Ply: 2").encode())
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        self._writers.add(writer)
+        spam = None
+        try:
+            writer.write(b"*** Connected with 7DTD server.\r\n*** Server version: Alpha 21.2 (b30) Compatibility Version: Alpha 21.2\r\n\r\n")
+            if self.password:
+                writer.write(b"Please enter password:")
+                await writer.drain()
+                attempt = (await reader.readline()).decode().strip()
+                if attempt != self.password:
+                    writer.write(b"Password incorrect, please enter password:\r\n")
+                    await writer.drain()
+                    return
+                writer.write(b"Logon successful.\r\n\r\n")
+            writer.write(b"Press 'help' to get a list of all commands. Press 'exit' to end session.\r\n\r\n")
+            await writer.drain()
+            if self.log_interval > 0:
+                spam = asyncio.create_task(self._spam_logs(writer))
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                command = raw.decode().strip()
+                if not command:
+                    continue
+                if command == "exit":
+                    break
+                self.commands += 1
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                out = self._log(f"Executing command '{command}' by Telnet from 127.0.0.1:{self.port}")
+                out += self._run(command)
+                writer.write(out.encode())
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if spam is not None:
+                spam.cancel()
+            self._writers.discard(writer)
+            writer.close()
+
+
+async def _main(args):
+    server = await FakeConsole(args.host, args.port, args.password,
+                               [p for p in args.players.split(",") if p], args.log_interval).start()
+    print(f"Console 7DTD falso em {server.host}:{server.port} (senha: {server.password or '-'})")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Console telnet falso do 7DTD")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--password", default="segredo")
+    parser.add_argument("--players", default="Ana,Beto,Caio")
+    parser.add_argument("--log-interval", type=float, default=1.0)
+    asyncio.run(_main(parser.parse_args()))
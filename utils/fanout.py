@@ -0,0 +1,119 @@
+# utils/fanout.py
+"""
+Executor de fan-out limitado e ciente de rate limit.
+
+Substitui ``asyncio.gather`` sem limite quando a mesma chamada REST precisa ir
+para centenas de guildas/canais:
+
+* no máximo ``concurrency`` chamadas em voo;
+* um token bucket global (Discord: ~50 req/s por bot);
+* um token bucket por rota (ex.: ``("ban", guild_id)``), como os buckets do Discord,
+  guardados numa LRU de ``max_routes`` entradas (rotas esquecidas voltam cheias);
+* 429 que escapar do discord.py pausa a rota (ou tudo, se for global) e tenta de novo.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional
+
+import discord
+
+from utils.cache import LRUCache
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float):
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class FanoutExecutor:
+    MAX_RETRIES = 3
+
+    def __init__(self, concurrency: int = 8, global_rate: float = 40.0, route_rate: float = 5.0,
+                 max_routes: int = 4096):
+        self.concurrency = concurrency
+        self.route_rate = route_rate
+        self._sem = asyncio.Semaphore(concurrency)
+        self._global = TokenBucket(global_rate)
+        self._routes = LRUCache(max_routes)   # rota -> TokenBucket
+        self.calls = 0
+        self.rate_limited = 0
+
+    def _route(self, key: Hashable) -> TokenBucket:
+        bucket = self._routes.get(key)
+        if bucket is None:
+            bucket = TokenBucket(self.route_rate)
+            self._routes.put(key, bucket)
+        return bucket
+
+    async def call(self, route: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Executa ``fn()`` respeitando concorrência, bucket global e bucket da rota."""
+        bucket = self._route(route)
+        async with self._sem:
+            for attempt in range(self.MAX_RETRIES + 1):
+                await bucket.acquire()
+                await self._global.acquire()
+                self.calls += 1
+                try:
+                    return await fn()
+                except discord.HTTPException as e:
+                    if e.status != 429 or attempt == self.MAX_RETRIES:
+                        raise
+                    self.rate_limited += 1
+                    headers = getattr(e.response, "headers", None) or {}
+                    retry_after = float(headers.get("Retry-After", 1.0))
+                    is_global = headers.get("X-RateLimit-Global", "").lower() == "true"
+                    (self._global if is_global else bucket).pause(retry_after)
+
+    async def map(
+        self,
+        items: Iterable[Any],
+        fn: Callable[[Any], Awaitable[Any]],
+        route: Optional[Callable[[Any], Hashable]] = None,
+        on_progress: Optional[Callable[[int, int], Awaitable[None]]] = None,
+    ) -> Dict[Any, Any]:
+        """
+        Roda ``fn(item)`` para cada item; devolve {item: resultado ou exceção}.
+        Sem ``route``, ``fn`` é quem chama ``self.call`` (útil quando um item faz
+        mais de uma requisição). ``on_progress(feitos, total)`` roda a cada item.
+        """
+        items = list(items)
+        results: Dict[Any, Any] = {}
+        done = 0
+
+        async def one(item):
+            nonlocal done
+            try:
+                if route is None:
+                    results[item] = await fn(item)
+                else:
+                    results[item] = await self.call(route(item), lambda: fn(item))
+            except Exception as e:
+                results[item] = e
+            done += 1
+            if on_progress:
+                await on_progress(done, len(items))
+
+        await asyncio.gather(*(one(i) for i in items))
+        return results
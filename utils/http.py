@@ -0,0 +1,52 @@
+# utils/http.py
+"""
+Cliente HTTP compartilhado pelo bot (``bot.http_client``).
+
+Uma única ``aiohttp.ClientSession`` com keep-alive: o TCPConnector limita as
+conexões por host e guarda o DNS em cache, em vez de abrir sessão, resolver
+nome e fazer handshake TLS a cada consulta. Fechado em main.py no shutdown.
+"""
+import asyncio
+from typing import Any, Optional
+
+import aiohttp
+
+
+class HTTPClient:
+    def __init__(self, limit: int = 100, limit_per_host: int = 8, dns_ttl: int = 300,
+                 timeout: float = 10.0):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.requests = 0
+        self.errors = 0
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        # criada sob demanda: precisa de um event loop rodando
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_ttl,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self._session
+
+    async def get_json(self, url: str, **kwargs) -> Any:
+        """GET e decodifica JSON (ignora o content-type, como as APIs de servidores exigem)."""
+        self.requests += 1
+        try:
+            async with self.session.get(url, **kwargs) as resp:
+                resp.raise_for_status()
+                return await resp.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self.errors += 1
+            raise
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
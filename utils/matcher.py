@@ -0,0 +1,153 @@
+# utils/matcher.py
+"""
+Matcher de várias palavras/frases numa única varredura do texto.
+
+As palavras são montadas numa trie e convertidas em UMA regex de alternância
+(prefixos comuns viram um único ramo), envolvida em ``\\b…\\b``.  O custo por
+mensagem deixa de crescer linearmente com o tamanho da lista.
+
+No modo ``fuzzy`` cada letra aceita repetições coladas ("poooorra") e até 3
+separadores entre uma letra da palavra e a seguinte ("p o r r a", "p.o.r.r.a").
+Letras dobradas da palavra continuam obrigatórias ("porra" exige dois "r", então
+"por a" não casa) e repetições nunca engolem separadores ("porra 4" casa só
+"porra"). O texto deve chegar já dobrado por ``utils.text.fold``, que preserva
+os offsets.
+"""
+import re
+from itertools import groupby
+from typing import Callable, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+# separadores tolerados entre letras no modo fuzzy
+FUZZY_SEP = r"[\W_]{0,3}"
+
+
+class Match(NamedTuple):
+    start: int   # offset inicial no texto original
+    end: int     # offset final (exclusivo)
+    text: str    # trecho encontrado, como aparece no texto
+
+
+def _build_trie(words: Iterable) -> Dict[str, dict]:
+    trie: Dict = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}                             # marca fim de palavra
+    return trie
+
+
+def _runs(word: str) -> Tuple[Tuple[str, int], ...]:
+    """'porra' -> (('p', 1), ('o', 1), ('r', 2), ('a', 1))"""
+    return tuple((ch, len(list(g))) for ch, g in groupby(word))
+
+
+def _fuzzy_unit(run: Tuple[str, int]) -> str:
+    # cada letra da palavra é obrigatória (separadores só entre posições);
+    # a última do grupo aceita repetições coladas, sem separador
+    ch, n = run
+    c = re.escape(ch)
+    return f"{c}{FUZZY_SEP}" * (n - 1) + f"{c}+"
+
+
+def _node_pattern(node: Dict, unit: Callable = re.escape, sep: str = "") -> str:
+    """Converte um nó da trie em regex (ramos ordenados, sem backtracking inútil)."""
+    terminal = "" in node
+    branches, singles = [], []
+    for ch in sorted(k for k in node if k):
+        rest = _node_pattern(node[ch], unit, sep)
+        if rest:
+            branches.append(unit(ch) + sep + rest)
+        elif unit is re.escape:
+            singles.append(re.escape(ch))
+        else:
+            branches.append(unit(ch))
+
+    if singles:
+        branches.append(singles[0] if len(singles) == 1 else f"[{''.join(singles)}]")
+    if not branches:
+        return ""
+
+    body = branches[0] if len(branches) == 1 else "|".join(branches)
+    if len(branches) > 1 or terminal:
+        body = f"(?:{body})"
+    return body + "?" if terminal else body
+
+
+def trie_regex(words: Iterable[str], fuzzy: bool = False) -> str:
+    """Regex (sem âncoras) que casa qualquer uma das palavras, preferindo a mais longa."""
+    if not fuzzy:
+        return _node_pattern(_build_trie(words))
+    # só as letras contam; a trie é montada sobre grupos de letras iguais
+    letters = {"".join(ch for ch in w if ch.isalnum()) for w in words}
+    return _node_pattern(_build_trie(_runs(w) for w in letters if w), _fuzzy_unit, FUZZY_SEP)
+
+
+class WordMatcher:
+    """
+    Casa uma lista de palavras/frases respeitando limite de palavra (``\\b``),
+    sem diferenciar maiúsculas/minúsculas, em uma só passada.
+
+    Com ``prefix=True`` só o início precisa ser limite de palavra: "veiculo"
+    casa "veiculos", "forja" casa "forjar".
+    """
+
+    def __init__(self, words: Iterable[str], fuzzy: bool = False, prefix: bool = False):
+        self.words = tuple(sorted({w.strip().lower() for w in words if w and w.strip()}))
+        self.fuzzy = fuzzy
+        self.prefix = prefix
+        self._regex: Optional[re.Pattern] = None
+        if self.words:
+            end = "" if prefix else r"\b"
+            self._regex = re.compile(rf"\b(?:{trie_regex(self.words, fuzzy)}){end}", re.IGNORECASE)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def finditer(self, text: str) -> Iterator[Match]:
+        """Todas as ocorrências (não sobrepostas), com posição, numa única varredura."""
+        if self._regex is None:
+            return
+        for m in self._regex.finditer(text):
+            yield Match(m.start(), m.end(), m.group(0))
+
+    def search(self, text: str) -> Optional[Match]:
+        """Primeira ocorrência ou None."""
+        if self._regex is None:
+            return None
+        m = self._regex.search(text)
+        return Match(m.start(), m.end(), m.group(0)) if m else None
+
+
+class TopicMatcher:
+    """
+    Várias listas de palavras-chave (uma por tópico) num único ``WordMatcher``.
+
+    ``best`` varre o texto uma vez e devolve o tópico com mais texto casado
+    (frases longas pesam mais que palavras soltas); empate fica com o
+    tópico cuja palavra apareceu primeiro.
+    """
+
+    def __init__(self, topics: Dict[str, Iterable[str]], prefix: bool = True):
+        self._topic_of: Dict[str, str] = {}
+        for topic, words in topics.items():
+            for w in words:
+                if w and w.strip():
+                    self._topic_of[w.strip().lower()] = topic
+        self._matcher = WordMatcher(self._topic_of, prefix=prefix)
+
+    def __len__(self) -> int:
+        return len(self._topic_of)
+
+    def scores(self, text: str) -> Dict[str, int]:
+        scores: Dict[str, int] = {}
+        for m in self._matcher.finditer(text):
+            topic = self._topic_of.get(m.text.lower())
+            if topic is not None:
+                scores[topic] = scores.get(topic, 0) + len(m.text)
+        return scores
+
+    def best(self, text: str) -> Optional[str]:
+        scores = self.scores(text)
+        # dict preserva a ordem de inserção: max() mantém o primeiro em caso de empate
+        return max(scores, key=scores.get) if scores else None
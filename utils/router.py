@@ -0,0 +1,130 @@
+# utils/router.py
+"""
+Roteador central de mensagens.
+
+Em vez de cada cog registrar o próprio ``on_message`` (e todos olharem todas
+as mensagens), os cogs registram interesse por (guild, canal, predicado).
+O roteador indexa as rotas por canal e por guild: cada mensagem só toca os
+handlers que se importam com ela, e ``process_commands`` roda uma única vez
+(em main.py).
+"""
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[discord.Message], Awaitable[None]]
+Predicate = Callable[[discord.Message], bool]
+
+
+class Route:
+    """Uma inscrição no roteador, com contadores de tempo do handler."""
+    __slots__ = ("handler", "guild_id", "channel_id", "predicate", "name",
+                 "calls", "errors", "total_time", "max_time")
+
+    def __init__(self, handler: Handler, guild_id: Optional[int], channel_id: Optional[int],
+                 predicate: Optional[Predicate], name: str):
+        self.handler = handler
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.predicate = predicate
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+
+class MessageRouter:
+    def __init__(self):
+        self._by_channel: Dict[int, List[Route]] = {}   # channel_id -> rotas
+        self._by_guild: Dict[int, List[Route]] = {}     # guild_id -> rotas (qualquer canal)
+        self._global: List[Route] = []                  # todas as mensagens
+        self.dispatched = 0
+
+    # ───── registro ─────
+    def register(self, handler: Handler, *, guild_id: Optional[int] = None,
+                 channel_id: Optional[int] = None, predicate: Optional[Predicate] = None,
+                 name: Optional[str] = None) -> Route:
+        """Inscreve ``handler``. Com ``channel_id`` a rota só vê aquele canal."""
+        route = Route(handler, guild_id, channel_id, predicate, name or handler.__qualname__)
+        self._bucket(route, create=True).append(route)
+        return route
+
+    def unregister(self, route: Optional[Route]):
+        if route is None:
+            return
+        bucket = self._bucket(route, create=False)
+        if bucket is not None and route in bucket:
+            bucket.remove(route)
+            if not bucket and bucket is not self._global:
+                index = self._by_channel if route.channel_id is not None else self._by_guild
+                index.pop(route.channel_id if route.channel_id is not None else route.guild_id, None)
+
+    def _bucket(self, route: Route, create: bool) -> Optional[List[Route]]:
+        if route.channel_id is not None:
+            index, key = self._by_channel, route.channel_id
+        elif route.guild_id is not None:
+            index, key = self._by_guild, route.guild_id
+        else:
+            return self._global
+        return index.setdefault(key, []) if create else index.get(key)
+
+    # ───── despacho ─────
+    def routes_for(self, message: discord.Message) -> List[Route]:
+        routes = list(self._global)
+        if message.guild is not None:
+            routes += self._by_guild.get(message.guild.id, ())
+        for route in self._by_channel.get(message.channel.id, ()):
+            if route.guild_id is None or (message.guild and route.guild_id == message.guild.id):
+                routes.append(route)
+        return routes
+
+    async def dispatch(self, message: discord.Message):
+        """Agenda cada handler interessado numa task própria (como os listeners do discord.py)."""
+        self.dispatched += 1
+        for route in self.routes_for(message):
+            try:
+                if route.predicate is not None and not route.predicate(message):
+                    continue
+            except Exception:
+                logger.exception(f"[Router] predicado de {route.name} falhou")
+                continue
+            asyncio.create_task(self._run(route, message), name=f"router:{route.name}")
+
+    @staticmethod
+    async def _run(route: Route, message: discord.Message):
+        start = time.perf_counter()
+        try:
+            await route.handler(message)
+        except Exception:
+            route.errors += 1
+            logger.exception(f"[Router] erro em {route.name}")
+        finally:
+            elapsed = time.perf_counter() - start
+            route.calls += 1
+            route.total_time += elapsed
+            route.max_time = max(route.max_time, elapsed)
+
+    # ───── métricas ─────
+    def stats(self) -> List[dict]:
+        """Contadores agregados por nome de handler."""
+        agg: Dict[str, dict] = {}
+        routes = list(self._global)
+        for bucket in (*self._by_guild.values(), *self._by_channel.values()):
+            routes += bucket
+        for r in routes:
+            s = agg.setdefault(r.name, {"name": r.name, "routes": 0, "calls": 0, "errors": 0,
+                                        "total_time": 0.0, "max_time": 0.0})
+            s["routes"] += 1
+            s["calls"] += r.calls
+            s["errors"] += r.errors
+            s["total_time"] += r.total_time
+            s["max_time"] = max(s["max_time"], r.max_time)
+        for s in agg.values():
+            s["avg_ms"] = (s["total_time"] / s["calls"] * 1000) if s["calls"] else 0.0
+        return sorted(agg.values(), key=lambda s: -s["total_time"])
@@ -0,0 +1,215 @@
+# utils/sdtd_console.py
+"""
+Cliente do console telnet do 7 Days to Die, com conexão persistente.
+
+O console não delimita respostas. Cada comando é seguido de um comando
+sentinela inexistente (``__fimN``): o servidor responde
+``*** ERROR: unknown command '__fimN'`` e isso fecha a resposta anterior.
+Assim vários comandos podem ser enviados sem esperar os anteriores
+(pipeline): as respostas chegam na mesma ordem da fila de pendentes.
+
+Linhas de log (``2024-01-01T12:00:00 123.456 INF ...``) são ignoradas.
+Se a conexão cair, os pendentes falham e a próxima chamada reconecta,
+com backoff exponencial entre tentativas falhas.
+"""
+import asyncio
+import itertools
+import re
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+LOG_LINE = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2} \d+\.\d+ [A-Z]{3} ")
+PLAYER_LINE = re.compile(r"^\d+\. id=\d+, (.+?), pos=")
+TOTAL_LINE = re.compile(r"^Total of (\d+) in the game")
+
+
+class ConsoleError(Exception):
+    """Falha de conexão, login ou tempo esgotado no console."""
+
+
+class TelnetConsole:
+    RETRY_MIN = 1.0
+    RETRY_MAX = 60.0
+
+    def __init__(self, host: str, port: int, password: Optional[str], timeout: float = 10.0):
+        self.host = host
+        self.port = port
+        self.password = password
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._read_task: Optional[asyncio.Task] = None
+        self._pending: deque = deque()          # (sentinela, future, linhas)
+        self._tokens = itertools.count(1)
+        self._connect_lock = asyncio.Lock()
+        self.failures = 0
+        self.retry_at = 0.0
+        self.connects = 0
+        self.commands = 0
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def connect(self):
+        async with self._connect_lock:
+            if self.connected:
+                return
+            wait = self.retry_at - time.monotonic()
+            if wait > 0:
+                raise ConsoleError(f"{self.host}:{self.port} indisponível; nova tentativa em {wait:.0f}s")
+            writer = None
+            try:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port), self.timeout)
+                await asyncio.wait_for(self._login(reader, writer), self.timeout)
+            except (OSError, asyncio.TimeoutError, ConsoleError) as e:
+                if writer is not None:
+                    writer.close()
+                self.failures += 1
+                self.retry_at = time.monotonic() + min(self.RETRY_MIN * 2 ** (self.failures - 1), self.RETRY_MAX)
+                raise ConsoleError(f"falha ao conectar em {self.host}:{self.port}: {e!r}") from e
+            self.failures = 0
+            self.retry_at = 0.0
+            self.connects += 1
+            self._reader, self._writer = reader, writer
+            self._read_task = asyncio.create_task(self._read_loop(reader, writer))
+
+    async def _login(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        if not self.password:
+            return
+        buf = ""
+        while "password:" not in buf.lower():          # o prompt não termina em \n
+            chunk = await reader.read(1024)
+            if not chunk:
+                raise ConsoleError("conexão fechada antes do login")
+            buf += chunk.decode("utf-8", "replace")
+        writer.write(f"{self.password}\r\n".encode())
+        await writer.drain()
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise ConsoleError("conexão fechada durante o login")
+            text = line.decode("utf-8", "replace").lower()
+            if "logon successful" in text:
+                return
+            if "password incorrect" in text or "incorrect password" in text:
+                raise ConsoleError("senha do console incorreta")
+
+    async def _read_loop(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                line = raw.decode("utf-8", "replace").rstrip("\r\n")
+                if not self._pending or not line or LOG_LINE.match(line):
+                    continue
+                token, fut, lines = self._pending[0]
+                if f"'{token}'" in line:
+                    self._pending.popleft()
+                    if not fut.done():
+                        fut.set_result(lines)
+                else:
+                    lines.append(line)
+        except (OSError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if self._writer is writer:
+                self._drop(ConsoleError("conexão com o console perdida"))
+
+    def _drop(self, exc: Exception):
+        """Fecha a conexão e falha tudo que estava pendente (o fluxo fica dessincronizado)."""
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+        if self._read_task is not None and self._read_task is not asyncio.current_task():
+            self._read_task.cancel()
+        self._read_task = None
+        while self._pending:
+            _, fut, _ = self._pending.popleft()
+            if not fut.done():
+                fut.set_exception(exc)
+
+    async def execute(self, command: str) -> List[str]:
+        """Executa um comando e devolve as linhas da resposta (sem logs)."""
+        await self.connect()
+        token = f"__fim{next(self._tokens)}"
+        fut = asyncio.get_running_loop().create_future()
+        # fila e escrita sem await no meio: a ordem da fila é a ordem no socket
+        writer = self._writer
+        self._pending.append((token, fut, []))
+        writer.write(f"{command}\r\n{token}\r\n".encode())
+        self.commands += 1
+        try:
+            await writer.drain()
+            return await asyncio.wait_for(fut, self.timeout)
+        except asyncio.TimeoutError:
+            if self._writer is writer:
+                self._drop(ConsoleError(f"tempo esgotado em '{command}'"))
+            raise ConsoleError(f"tempo esgotado em '{command}'")
+        except OSError as e:
+            if self._writer is writer:
+                self._drop(ConsoleError(repr(e)))
+            raise ConsoleError(f"falha ao enviar '{command}': {e!r}") from e
+
+    async def list_players(self) -> Tuple[int, List[str]]:
+        """``lp``: (total de jogadores, nomes)."""
+        names, total = [], None
+        for line in await self.execute("lp"):
+            m = PLAYER_LINE.match(line)
+            if m:
+                names.append(m.group(1))
+                continue
+            m = TOTAL_LINE.match(line)
+            if m:
+                total = int(m.group(1))
+        return (total if total is not None else len(names)), names
+
+    async def close(self):
+        if self.connected:
+            try:
+                self._writer.write(b"exit\r\n")
+            except OSError:
+                pass
+        self._drop(ConsoleError("console fechado"))
+
+
+class ConsolePool:
+    """Uma ``TelnetConsole`` persistente por (host, porta), reaproveitada entre consultas."""
+
+    def __init__(self, timeout: float = 10.0):
+        self.timeout = timeout
+        self._consoles: Dict[Tuple[str, int], TelnetConsole] = {}
+
+    def __len__(self) -> int:
+        return len(self._consoles)
+
+    def get(self, host: str, port: int, password: Optional[str]) -> TelnetConsole:
+        key = (host, port)
+        console = self._consoles.get(key)
+        if console is None or console.password != password:
+            if console is not None:
+                asyncio.create_task(console.close())
+            console = self._consoles[key] = TelnetConsole(host, port, password, self.timeout)
+        return console
+
+    async def discard(self, host: str, port: int):
+        console = self._consoles.pop((host, port), None)
+        if console is not None:
+            await console.close()
+
+    async def close(self):
+        for console in self._consoles.values():
+            await console.close()
+        self._consoles.clear()
+
+    def stats(self) -> dict:
+        consoles = self._consoles.values()
+        return {
+            "servers": len(self._consoles),
+            "connected": sum(1 for c in consoles if c.connected),
+            "connects": sum(c.connects for c in consoles),
+            "commands": sum(c.commands for c in consoles),
+        }
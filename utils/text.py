@@ -0,0 +1,63 @@
+# utils/text.py
+"""
+Tabelas de "dobra" de texto, pré-calculadas no import.
+
+Todas as entradas mapeiam 1 caractere para exatamente 1 caractere, então
+``texto.translate(TABELA)`` preserva o comprimento: um offset no texto dobrado
+vale também no texto original.
+"""
+import unicodedata
+from itertools import chain
+
+# letras de outros alfabetos que se passam por latinas
+CONFUSABLES = {
+    # cirílico
+    "а": "a", "в": "b", "е": "e", "і": "i", "ј": "j", "к": "k", "м": "m", "н": "h",
+    "о": "o", "р": "p", "с": "c", "ѕ": "s", "т": "t", "у": "y", "х": "x",
+    # grego
+    "α": "a", "β": "b", "ε": "e", "ι": "i", "κ": "k", "ν": "v", "ο": "o",
+    "ρ": "p", "τ": "t", "υ": "u", "χ": "x",
+}
+
+# leetspeak – só caracteres que não costumam fechar palavra (nada de "!")
+LEET = {
+    "0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "8": "b",
+    "@": "a", "$": "s",
+}
+
+
+def _build_accent_table() -> dict[int, str]:
+    table = {}
+    ranges = chain(
+        range(0x41, 0x5B),        # A-Z
+        range(0xC0, 0x250),       # Latin-1 / Latin Extended A e B
+        range(0x1E00, 0x1F00),    # Latin Extended Additional
+        range(0xFF01, 0xFF5F),    # formas fullwidth
+    )
+    for cp in ranges:
+        ch = chr(cp)
+        base = "".join(c for c in unicodedata.normalize("NFKD", ch) if not unicodedata.combining(c))
+        base = base.lower()
+        if len(base) == 1 and base != ch:
+            table[cp] = base
+    for src, dst in CONFUSABLES.items():
+        for c in (src, src.upper()):
+            if len(c) == 1:
+                table[ord(c)] = dst
+    return table
+
+
+# acentos, maiúsculas e confusáveis -> ascii minúsculo
+ACCENT_TABLE = _build_accent_table()
+
+# ACCENT_TABLE + leetspeak (usado pelo filtro de palavrões)
+FOLD_TABLE = {
+    **{cp: LEET.get(v, v) for cp, v in ACCENT_TABLE.items()},
+    **{ord(k): v for k, v in LEET.items()},
+}
+
+
+def fold(text: str) -> str:
+    """Dobra acentos/confusáveis/leet em uma única passada, mantendo os offsets."""
+    return text.translate(FOLD_TABLE)
+
@@ -0,0 +1,93 @@
+# utils/timeseries.py
+"""
+Agregação de séries temporais em baldes (hora/dia) e renderização em texto.
+
+As amostras brutas são só anexadas; cada amostra também atualiza o balde
+corrente de cada período em memória (``Bucket``), que é gravado por upsert.
+Consultas de histórico leem apenas os baldes: no máximo 24 × dias linhas,
+independente de quantas amostras brutas existirem.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence
+
+PERIODS = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+SPARK = "▁▂▃▄▅▆▇█"
+
+
+def bucket_start(ts: datetime, period: str) -> datetime:
+    """Início do balde que contém ``ts`` (hora cheia ou meia-noite UTC)."""
+    if period == "hour":
+        return ts.replace(minute=0, second=0, microsecond=0)
+    if period == "day":
+        return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"período desconhecido: {period}")
+
+
+class Bucket:
+    """Agregado de um balde: contagem, soma/máximo de jogadores, disponibilidade."""
+    __slots__ = ("start", "samples", "online_samples", "players_sum", "players_max", "votes")
+
+    def __init__(self, start: datetime, samples: int = 0, online_samples: int = 0,
+                 players_sum: int = 0, players_max: int = 0, votes: Optional[int] = None):
+        self.start = start
+        self.samples = samples
+        self.online_samples = online_samples
+        self.players_sum = players_sum
+        self.players_max = players_max
+        self.votes = votes
+
+    def add(self, online: bool, players: Optional[int], votes: Optional[int]):
+        self.samples += 1
+        if online:
+            self.online_samples += 1
+        if players is not None:
+            self.players_sum += players
+            self.players_max = max(self.players_max, players)
+        if votes is not None:
+            self.votes = votes
+
+    @property
+    def avg_players(self) -> float:
+        return self.players_sum / self.samples if self.samples else 0.0
+
+    def row(self, server_key: str, period: str) -> dict:
+        return {
+            "server_key": server_key, "period": period, "bucket_start": self.start,
+            "samples": self.samples, "online_samples": self.online_samples,
+            "players_sum": self.players_sum, "players_max": self.players_max,
+            "votes": self.votes,
+        }
+
+
+def sparkline(values: Sequence[Optional[float]], top: Optional[float] = None) -> str:
+    """Uma barra por valor; ``None`` (sem dados) vira espaço."""
+    known = [v for v in values if v is not None]
+    top = top if top else max(known, default=0)
+    if not top:
+        return "".join(" " if v is None else SPARK[0] for v in values)
+    out = []
+    for v in values:
+        if v is None:
+            out.append(" ")
+        else:
+            out.append(SPARK[min(int(v / top * (len(SPARK) - 1) + 0.5), len(SPARK) - 1)])
+    return "".join(out)
+
+
+def series(buckets: Iterable[Bucket], start: datetime, period: str, count: int) -> List[Optional[Bucket]]:
+    """Coloca os baldes em ``count`` posições a partir de ``start`` (faltantes = None)."""
+    step = PERIODS[period]
+    by_start: Dict[datetime, Bucket] = {b.start: b for b in buckets}
+    return [by_start.get(start + step * i) for i in range(count)]
+
+
+def peak_hours(buckets: Iterable[Bucket], utc_offset: int = 0, top: int = 3) -> List[tuple]:
+    """As ``top`` horas do dia (no fuso ``utc_offset``) com mais jogadores em média."""
+    total = [0] * 24
+    samples = [0] * 24
+    for b in buckets:
+        hour = (b.start.hour + utc_offset) % 24
+        total[hour] += b.players_sum
+        samples[hour] += b.samples
+    avgs = [(hour, total[hour] / samples[hour]) for hour in range(24) if samples[hour]]
+    return sorted(avgs, key=lambda h: h[1], reverse=True)[:top]
@@ -0,0 +1,234 @@
+# utils/translate_cache.py
+"""
+Cache de traduções em dois níveis, chaveado por (hash do texto normalizado, idioma).
+
+* memória: ``LRUCache`` com as traduções mais pedidas — resposta sem I/O;
+* disco: tabela SQLite local que sobrevive a reinícios, limitada por tamanho
+  (``max_bytes``). Passou do limite, as linhas usadas há mais tempo saem até
+  sobrar ~90% do espaço.
+
+Só o que falta nos dois níveis vai para a rede. Pedidos simultâneos do mesmo
+texto compartilham UMA tradução em voo, e os tradutores são reaproveitados:
+até ``per_lang`` instâncias por idioma destino, criadas sob demanda (a
+instância guarda estado da requisição, então cada uma atende um pedido por vez).
+"""
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.cache import LRUCache
+
+ROW_OVERHEAD = 64     # estimativa de bytes por linha além do texto (chave, índices)
+EVICT_TARGET = 0.9    # a limpeza para ao chegar nesta fração do limite
+
+Key = Tuple[str, str]   # (hash do texto normalizado, idioma)
+
+
+def normalize(text: str) -> str:
+    """NFC, sem espaços sobrando nas pontas e sem espaços repetidos; mantém as quebras de linha."""
+    text = unicodedata.normalize("NFC", text).strip()
+    return "\n".join(" ".join(line.split()) for line in text.splitlines())
+
+
+def make_key(text: str, lang: str) -> Key:
+    digest = hashlib.blake2b(normalize(text).encode("utf-8"), digest_size=16).hexdigest()
+    return digest, lang
+
+
+class TranslationStore:
+    """Nível em disco. Síncrono: chame de um executor."""
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._rows = 0
+        self.evicted = 0
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            folder = os.path.dirname(self.path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                " hash TEXT NOT NULL, lang TEXT NOT NULL, translated TEXT NOT NULL,"
+                " size INTEGER NOT NULL, last_used REAL NOT NULL,"
+                " PRIMARY KEY (hash, lang))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_translations_last_used ON translations (last_used)")
+            self._rows, self._bytes = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM translations"
+            ).fetchone()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: Key) -> Optional[str]:
+        with self._lock:
+            db = self._db()
+            row = db.execute(
+                "SELECT translated FROM translations WHERE hash = ? AND lang = ?", key
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE translations SET last_used = ? WHERE hash = ? AND lang = ?",
+                (time.time(), *key),
+            )
+            return row[0]
+
+    def put(self, key: Key, translated: str):
+        size = len(translated.encode("utf-8")) + ROW_OVERHEAD
+        with self._lock:
+            db = self._db()
+            old = db.execute(
+                "SELECT size FROM translations WHERE hash = ? AND lang = ?", key
+            ).fetchone()
+            db.execute(
+                "INSERT OR REPLACE INTO translations (hash, lang, translated, size, last_used)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (*key, translated, size, time.time()),
+            )
+            if old is None:
+                self._rows += 1
+                self._bytes += size
+            else:
+                self._bytes += size - old[0]
+            if self._bytes > self.max_bytes:
+                self._evict(db)
+
+    def _evict(self, db: sqlite3.Connection):
+        target = self.max_bytes * EVICT_TARGET
+        while self._bytes > target and self._rows:
+            rows = db.execute(
+                "SELECT hash, lang, size FROM translations ORDER BY last_used LIMIT 256"
+            ).fetchall()
+            victims: List[Key] = []
+            for h, lang, size in rows:
+                if self._bytes <= target:
+                    break
+                victims.append((h, lang))
+                self._bytes -= size
+                self._rows -= 1
+            db.executemany("DELETE FROM translations WHERE hash = ? AND lang = ?", victims)
+            self.evicted += len(victims)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> dict:
+        return {"rows": self._rows, "bytes": self._bytes, "max_bytes": self.max_bytes,
+                "evicted": self.evicted}
+
+
+class TranslationCache:
+    """
+    ``factory(lang)`` cria um tradutor com ``.translate(texto)`` síncrono
+    (ex.: ``GoogleTranslator(source="auto", target=lang)``).
+    """
+
+    def __init__(self, factory: Callable[[str], Any], path: str, max_bytes: int,
+                 memory_size: int = 512, per_lang: int = 2):
+        self.factory = factory
+        self.per_lang = per_lang
+        self.memory = LRUCache(memory_size)
+        self.store = TranslationStore(path, max_bytes)
+        self._idle: Dict[str, List[Any]] = {}               # idioma -> tradutores livres
+        self._slots: Dict[str, asyncio.Semaphore] = {}      # idioma -> vagas de uso simultâneo
+        self._inflight: Dict[Key, asyncio.Task] = {}
+        self.disk_hits = 0
+        self.misses = 0        # traduções de fato (rede)
+        self.coalesced = 0     # pedidos que pegaram carona numa tradução em voo
+        self.errors = 0
+        self.created = 0       # instâncias de tradutor criadas
+
+    async def translate(self, text: str, lang: str) -> str:
+        key = make_key(text, lang)
+        cached = self.memory.get(key)
+        if cached is not None:
+            return cached
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.create_task(self._load(key, text, lang))
+        else:
+            self.coalesced += 1
+        # shield: um chamador cancelado não cancela a tradução dos outros
+        return await asyncio.shield(task)
+
+    async def _load(self, key: Key, text: str, lang: str) -> str:
+        loop = asyncio.get_running_loop()
+        try:
+            try:
+                cached = await loop.run_in_executor(None, self.store.get, key)
+            except sqlite3.Error as e:
+                print(f"[translate] cache em disco indisponível: {e}")
+                cached = None
+            if cached is not None:
+                self.disk_hits += 1
+                self.memory.put(key, cached)
+                return cached
+
+            self.misses += 1
+            try:
+                translated = await self._remote(text, lang)
+            except Exception:
+                self.errors += 1
+                raise
+            if translated:
+                self.memory.put(key, translated)
+                try:
+                    await loop.run_in_executor(None, self.store.put, key, translated)
+                except sqlite3.Error as e:
+                    print(f"[translate] falha ao gravar no cache em disco: {e}")
+            return translated
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _remote(self, text: str, lang: str) -> str:
+        slots = self._slots.get(lang)
+        if slots is None:
+            slots = self._slots[lang] = asyncio.Semaphore(self.per_lang)
+        async with slots:
+            idle = self._idle.setdefault(lang, [])
+            if idle:
+                translator = idle.pop()
+            else:
+                translator = self.factory(lang)
+                self.created += 1
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(None, translator.translate, text)
+            finally:
+                idle.append(translator)
+
+    def close(self):
+        self.store.close()
+
+    def stats(self) -> dict:
+        memory_hits = self.memory.hits
+        total = memory_hits + self.disk_hits + self.coalesced + self.misses
+        return {
+            "memory_hits": memory_hits,
+            "disk_hits": self.disk_hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": (memory_hits + self.disk_hits + self.coalesced) / total if total else 0.0,
+            "memory_size": len(self.memory),
+            "memory_maxsize": self.memory.maxsize,
+            "translators": self.created,
+            **{f"disk_{k}": v for k, v in self.store.stats().items()},
+        }